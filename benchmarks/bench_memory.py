@@ -0,0 +1,85 @@
+"""
+Measure the memory held per transaction and per block, comparing the
+slotted Transaction (interned addresses, binary signature) with the
+previous dict-backed layout.
+
+Usage:
+    python -m benchmarks.bench_memory [--count N] [--senders N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+from blockchain.core.block import Block
+from blockchain.core.transaction import Transaction
+from blockchain.crypto.wallet import Wallet
+
+class DictTransaction:
+    """Transaction layout before slots: a per-instance __dict__ and hex signature."""
+    
+    def __init__(self, sender: str, recipient: str, amount: float, timestamp: float):
+        self.sender = sender
+        self.recipient = recipient
+        self.amount = amount
+        self.timestamp = timestamp
+        self.signature = None
+
+def measure(build: Callable[[], List]) -> int:
+    """
+    Measure the memory retained by the objects a callable builds.
+    
+    Args:
+        build: Callable returning the objects to keep alive
+    
+    Returns:
+        int: Bytes allocated and still held after building
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return retained
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=20000, help='transactions to build')
+    parser.add_argument('--senders', type=int, default=10, help='distinct senders')
+    args = parser.parse_args()
+    
+    # Every decoded transaction carries its own copy of the sender's key, as
+    # transactions received from peers or loaded from storage do
+    keys = [Wallet().get_public_key().encode() for _ in range(args.senders)]
+    recipients = [Wallet().get_address().encode() for _ in range(args.senders)]
+    def fields(i: int):
+        return keys[i % len(keys)].decode(), recipients[i % len(recipients)].decode(), float(i), 1700000000.0 + i
+    
+    def build_dict() -> List[DictTransaction]:
+        transactions = []
+        for i in range(args.count):
+            transaction = DictTransaction(*fields(i))
+            transaction.signature = f'{i:0512x}'
+            transactions.append(transaction)
+        return transactions
+    
+    def build_slotted() -> List[Transaction]:
+        transactions = []
+        for i in range(args.count):
+            transaction = Transaction(*fields(i))
+            transaction.signature = f'{i:0512x}'
+            transactions.append(transaction)
+        return transactions
+    
+    def build_blocks() -> List[Block]:
+        return [Block(i, [], '0' * 64, timestamp=1700000000.0 + i) for i in range(args.count)]
+    
+    before = measure(build_dict) / args.count
+    after = measure(build_slotted) / args.count
+    print(f"bytes per transaction, dict-backed:        {before:8.0f}")
+    print(f"bytes per transaction, slotted:            {after:8.0f}  ({before / after:.1f}x smaller)")
+    print(f"bytes per empty block:                     {measure(build_blocks) / args.count:8.0f}")
+
+if __name__ == '__main__':
+    main() 
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Compare key generation, signing and verification throughput of the
+signature backends.
+
+Usage:
+    python -m benchmarks.bench_signatures [--count N] [--algorithms A B ...]
+"""
+
+import argparse
+import time
+from blockchain.core.transaction import Transaction
+from blockchain.crypto.backends import BACKENDS, get_backend
+
+def bench(name: str, count: int) -> dict:
+    """
+    Time a signature backend on transaction-sized messages.
+    
+    Args:
+        name: Backend name
+        count: Number of signatures to create and verify
+    
+    Returns:
+        dict: Timings and sizes
+    """
+    backend = get_backend(name)
+    
+    started = time.perf_counter()
+    private_key = backend.generate_private_key()
+    keygen = time.perf_counter() - started
+    
+    public_key = backend.public_key(private_key)
+    pem = backend.export_public_key(public_key)
+    messages = [
+        Transaction(pem, "recipient", float(i), timestamp=1700000000.0).signing_bytes()
+        for i in range(count)
+    ]
+    
+    started = time.perf_counter()
+    signatures = [backend.sign(private_key, message) for message in messages]
+    sign_elapsed = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    valid = all(backend.verify(public_key, m, s) for m, s in zip(messages, signatures))
+    verify_elapsed = time.perf_counter() - started
+    assert valid
+    
+    return {
+        'algorithm': name,
+        'keygen_ms': keygen * 1000,
+        'sign_per_s': count / sign_elapsed,
+        'verify_per_s': count / verify_elapsed,
+        'public_key_bytes': len(pem),
+        'signature_bytes': len(signatures[0])
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=500, help='signatures per backend')
+    parser.add_argument('--algorithms', nargs='+', default=list(BACKENDS), help='backends to compare')
+    args = parser.parse_args()
+    
+    print(f"{'algorithm':<12} {'keygen ms':>10} {'sign/s':>10} {'verify/s':>10} {'pubkey B':>9} {'sig B':>6}")
+    for name in args.algorithms:
+        result = bench(name, args.count)
+        print(
+            f"{result['algorithm']:<12} {result['keygen_ms']:>10.1f} {result['sign_per_s']:>10.0f} "
+            f"{result['verify_per_s']:>10.0f} {result['public_key_bytes']:>9} {result['signature_bytes']:>6}"
+        )
+
+if __name__ == '__main__':
+    main() 
\ No newline at end of file
@@ -1,18 +1,110 @@
 from flask import Flask, request, jsonify
 from ..core.blockchain import Blockchain
 from ..core.transaction import Transaction
-from ..core.transaction_pool import TransactionPool
+from ..core.mining_service import MiningService
+from ..core.admission import AdmissionQueue
 from ..crypto.wallet import Wallet
-from ..config import API_CONFIG
+from ..crypto.cache import cache_stats
+from ..utils.storage import Storage
+from ..utils.snapshot import SnapshotManager, load_snapshot
+from ..config import API_CONFIG, API_PAGE_LIMIT, CHAIN_WINDOW_SIZE
 
 app = Flask(__name__)
-blockchain = Blockchain()
-transaction_pool = TransactionPool()
+if CHAIN_WINDOW_SIZE:
+    # Blocks outside the window are loaded from the database on demand, and
+    # the state is restored from the latest snapshot instead of replayed
+    Storage.initialize()
+    snapshot = load_snapshot()
+    blockchain = Blockchain(store=Storage, snapshot=snapshot)
+    if snapshot:
+        snapshot.close()
+    snapshot_manager = SnapshotManager(blockchain)
+else:
+    blockchain = Blockchain()
+transaction_pool = blockchain.transaction_pool
+mining_service = MiningService(blockchain)
+admission_queue = AdmissionQueue(blockchain)
 
 @app.route('/chain', methods=['GET'])
 def get_chain():
-    """Get the full blockchain."""
-    return jsonify(blockchain.to_dict()), 200
+    """Get the blockchain, or the range given by from and limit, streamed block by block."""
+    start = request.args.get('from', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    if start < 0 or (limit is not None and limit < 1):
+        return jsonify({'error': 'Invalid range'}), 400
+    
+    stop = start + limit if limit is not None else None
+    response = app.response_class(blockchain.iter_json(start, stop), status=200, mimetype='application/json')
+    response.headers['X-Chain-Length'] = str(len(blockchain.chain))
+    return response
+
+@app.route('/blocks/<int:height>', methods=['GET'])
+def get_block_by_height(height):
+    """Get a block by height."""
+    block = blockchain.get_block_by_height(height)
+    if block is None:
+        return jsonify({'error': 'Block not found'}), 404
+    return app.response_class(block.to_json(), status=200, mimetype='application/json')
+
+@app.route('/blocks/hash/<block_hash>', methods=['GET'])
+def get_block_by_hash(block_hash):
+    """Get a block by hash."""
+    block = blockchain.get_block_by_hash(block_hash)
+    if block is None:
+        return jsonify({'error': 'Block not found'}), 404
+    return app.response_class(block.to_json(), status=200, mimetype='application/json')
+
+@app.route('/blocks/<int:index>/transactions/<int:tx_index>/proof', methods=['GET'])
+def get_transaction_proof(index, tx_index):
+    """Get a Merkle inclusion proof for a transaction in a block."""
+    block = blockchain.get_block_by_height(index)
+    if block is None:
+        return jsonify({'error': 'Block not found'}), 404
+    
+    if tx_index >= len(block.transactions):
+        return jsonify({'error': 'Transaction not found'}), 404
+    
+    transaction = block.transactions[tx_index]
+    return jsonify({
+        'block_index': block.index,
+        'block_hash': block.hash,
+        'header': block.header_bytes().hex(),
+        'merkle_root': block.merkle_root,
+        'transaction': transaction.to_dict(),
+        'transaction_hash': transaction.calculate_hash(),
+        'proof': block.get_merkle_proof(tx_index)
+    }), 200
+
+@app.route('/address/<address>/transactions', methods=['GET'])
+def get_address_transactions(address):
+    """Get the confirmed transactions involving an address, newest first."""
+    limit = request.args.get('limit', 50, type=int)
+    if not 1 <= limit <= API_PAGE_LIMIT:
+        return jsonify({'error': f'Limit must be between 1 and {API_PAGE_LIMIT}'}), 400
+    
+    before = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            height, position = cursor.split(':')
+            before = (int(height), int(position))
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+    
+    transactions = blockchain.get_address_history(address, before, limit)
+    
+    # History older than the in-memory window comes from the block store,
+    # which only nodes running with a chain window have
+    min_height = blockchain.history.min_height
+    if len(transactions) < limit and min_height and blockchain.store is not None:
+        older = min(before, (min_height, 0)) if before else (min_height, 0)
+        transactions += blockchain.store.get_address_history(address, older, limit - len(transactions))
+    
+    next_cursor = None
+    if len(transactions) == limit:
+        last = transactions[-1]
+        next_cursor = f"{last['block_height']}:{last['tx_index']}"
+    return jsonify({'transactions': transactions, 'next_cursor': next_cursor}), 200
 
 @app.route('/transactions/pending', methods=['GET'])
 def get_pending_transactions():
@@ -23,7 +115,7 @@ def get_pending_transactions():
 
 @app.route('/transactions/new', methods=['POST'])
 def new_transaction():
-    """Create a new transaction."""
+    """Queue a new transaction; its signature is checked in the background."""
     data = request.get_json()
     
     # Check required fields
@@ -35,15 +127,55 @@ def new_transaction():
     transaction = Transaction(
         sender=data['sender'],
         recipient=data['recipient'],
-        amount=data['amount']
+        amount=data['amount'],
+        timestamp=data.get('timestamp'),
+        fee=data.get('fee', 0.0)
     )
     transaction.signature = data['signature']
     
-    # Add transaction to pool
-    if blockchain.add_transaction(transaction):
-        return jsonify({'message': 'Transaction added to pool'}), 201
-    else:
+    # Only malformed fields are rejected here; verification happens on admission
+    try:
+        txid = transaction.txid
+    except (ValueError, TypeError, AttributeError):
         return jsonify({'error': 'Invalid transaction'}), 400
+    
+    if not admission_queue.submit(transaction):
+        return jsonify({'error': 'Transaction queue is full, retry later'}), 503
+    return jsonify({
+        'message': 'Transaction accepted for processing',
+        'txid': txid
+    }), 202
+
+@app.route('/transactions/batch', methods=['POST'])
+def new_transactions():
+    """Add many transactions at once, reporting which were accepted."""
+    data = request.get_json(silent=True) or {}
+    entries = data.get('transactions')
+    if not isinstance(entries, list):
+        return jsonify({'error': 'Expected a list of transactions'}), 400
+    
+    required_fields = ['sender', 'recipient', 'amount', 'signature']
+    results = [None] * len(entries)
+    transactions, positions = [], []
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not all(field in entry for field in required_fields):
+            results[position] = {'accepted': False, 'error': 'Missing required fields'}
+            continue
+        try:
+            transaction = Transaction.from_dict(entry)
+        except (ValueError, TypeError):
+            results[position] = {'accepted': False, 'error': 'Invalid transaction'}
+            continue
+        transactions.append(transaction)
+        positions.append(position)
+    
+    for position, added in zip(positions, blockchain.add_transactions(transactions)):
+        results[position] = {'accepted': True} if added else {'accepted': False, 'error': 'Invalid transaction'}
+    
+    return jsonify({
+        'accepted': sum(1 for result in results if result['accepted']),
+        'results': results
+    }), 200
 
 @app.route('/mine', methods=['GET'])
 def mine():
@@ -63,6 +195,42 @@ def mine():
     else:
         return jsonify({'error': 'Mining failed'}), 400
 
+@app.route('/mine/jobs', methods=['POST'])
+def submit_mining_job():
+    """Queue a block to be mined in the background."""
+    data = request.get_json(silent=True) or {}
+    miner_address = data.get('address') or request.args.get('address')
+    if not miner_address:
+        return jsonify({'error': 'Miner address required'}), 400
+    
+    job = mining_service.submit(miner_address)
+    return jsonify({
+        'message': 'Mining job submitted',
+        'job': job.to_dict()
+    }), 202
+
+@app.route('/mine/jobs/<job_id>', methods=['GET'])
+def get_mining_job(job_id):
+    """Get the status of a mining job."""
+    job = mining_service.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Mining job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/mine/jobs/<job_id>', methods=['DELETE'])
+def cancel_mining_job(job_id):
+    """Cancel a queued or running mining job."""
+    job = mining_service.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Mining job not found'}), 404
+    
+    if not mining_service.cancel(job_id):
+        return jsonify({'error': 'Mining job already finished'}), 409
+    return jsonify({
+        'message': 'Mining job cancelled',
+        'job': job.to_dict()
+    }), 200
+
 @app.route('/nodes/register', methods=['POST'])
 def register_node():
     """Register a new node."""
@@ -96,25 +264,15 @@ def get_balance():
     if not address:
         return jsonify({'error': 'Address required'}), 400
     
-    balance = 0.0
-    
-    # Calculate balance from blockchain
-    for block in blockchain.chain:
-        for transaction in block.transactions:
-            if transaction.sender == address:
-                balance -= transaction.amount
-            if transaction.recipient == address:
-                balance += transaction.amount
-    
-    # Add pending transactions
-    for transaction in transaction_pool.get_transactions():
-        if transaction.sender == address:
-            balance -= transaction.amount
-        if transaction.recipient == address:
-            balance += transaction.amount
+    balance = blockchain.get_balance(address)
     
     return jsonify({'balance': balance}), 200
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Get node metrics for monitoring."""
+    return jsonify({**cache_stats(), 'admission': admission_queue.stats()}), 200
+
 if __name__ == '__main__':
     app.run(
         host=API_CONFIG['host'],
@@ -2,6 +2,7 @@
 Configuration settings for the blockchain system.
 """
 
+import multiprocessing
 import os
 from dotenv import load_dotenv
 
@@ -12,7 +13,38 @@ load_dotenv()
 INITIAL_DIFFICULTY = int(os.getenv('INITIAL_DIFFICULTY', 4))
 TARGET_BLOCK_TIME = int(os.getenv('TARGET_BLOCK_TIME', 10))
 DIFFICULTY_ADJUSTMENT_INTERVAL = 10
+MAX_REORG_DEPTH = int(os.getenv('MAX_REORG_DEPTH', 100))  # Deepest fork that can be reorganized to
+MAX_ORPHAN_BLOCKS = 100  # Blocks kept while waiting for their parent
 MINING_REWARD = float(os.getenv('MINING_REWARD', 10.0))
+# Assumed-valid checkpoints, given as "height:hash,height:hash"
+CHECKPOINTS = {
+    int(height): block_hash
+    for height, block_hash in (
+        entry.split(':') for entry in os.getenv('CHECKPOINTS', '').split(',') if entry
+    )
+}
+CHAIN_WINDOW_SIZE = int(os.getenv('CHAIN_WINDOW_SIZE', 0))  # Recent blocks kept in memory when a store is used (0 keeps all)
+BLOCK_CACHE_SIZE = 256  # Older blocks cached after being loaded from storage
+HISTORY_WINDOW = int(os.getenv('HISTORY_WINDOW', 1000))  # Recent blocks in the in-memory address history of nodes with a store
+TXID_FILTER_SEGMENT = 1000  # Blocks per segment of the confirmed-txid Bloom filter
+TXID_FILTER_CAPACITY = 10000  # Initial txids per segment before the filter grows
+TXID_FILTER_ERROR_RATE = 0.001  # Target false positive rate of the confirmed-txid filter
+
+# Mining settings
+MINING_WORKERS = int(os.getenv('MINING_WORKERS', 1))  # Processes used for the nonce search
+MINING_CHECK_INTERVAL = 1000  # Nonces tried between checks for a stop signal
+MINING_JOB_HISTORY = int(os.getenv('MINING_JOB_HISTORY', 100))  # Finished mining jobs kept for polling
+
+# Validation settings
+VALIDATION_WORKERS = int(os.getenv('VALIDATION_WORKERS', os.cpu_count() or 1))  # Processes used to validate chains
+VALIDATION_CHUNK_SIZE = 64  # Blocks per validation task
+VERIFICATION_WORKERS = int(os.getenv('VERIFICATION_WORKERS', os.cpu_count() or 1))  # Processes used for batch signature checks
+VERIFICATION_CHUNK_SIZE = 256  # Signatures per verification task
+# Worker processes never start as forks of the threaded node, which could copy locks held by other threads
+POOL_START_METHOD = os.getenv(
+    'POOL_START_METHOD',
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
 
 # Network settings
 DEFAULT_HOST = os.getenv('DEFAULT_HOST', 'localhost')
@@ -28,20 +60,29 @@ BOOTSTRAP_NODES = [
 # Transaction settings
 MAX_TRANSACTION_POOL_SIZE = 1000
 MIN_TRANSACTION_FEE = 0.0001
+MAX_BLOCK_TRANSACTIONS = int(os.getenv('MAX_BLOCK_TRANSACTIONS', 1000))  # Pending transactions per block template
 MAX_TRANSACTION_SIZE = 1024
+ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 10000))  # Submitted transactions waiting for admission
+ADMISSION_WORKERS = int(os.getenv('ADMISSION_WORKERS', 1))  # Threads admitting queued transactions
+ADMISSION_BATCH_SIZE = 64  # Queued transactions verified together
+ADMISSION_LATENCY_WINDOW = 1000  # Recent admissions the latency metrics cover
 
 # Security settings
 KEY_SIZE = int(os.getenv('KEY_SIZE', 2048))
 HASH_ALGORITHM = os.getenv('HASH_ALGORITHM', 'SHA-256')
-SIGNATURE_ALGORITHM = os.getenv('SIGNATURE_ALGORITHM', 'RSA-PSS')
+SIGNATURE_ALGORITHM = os.getenv('SIGNATURE_ALGORITHM', 'PKCS1_v1_5')  # Key type of new wallets: PKCS1_v1_5 (RSA) or Ed25519
 ENCRYPTION_ALGORITHM = "AES-256-CBC"
 PBKDF2_ITERATIONS = 100000
+SIGNATURE_CACHE_SIZE = int(os.getenv('SIGNATURE_CACHE_SIZE', 100000))  # Verified signatures remembered
+PUBLIC_KEY_CACHE_SIZE = int(os.getenv('PUBLIC_KEY_CACHE_SIZE', 10000))  # Parsed sender keys remembered
 
 # Storage settings
 DATA_DIR = 'data'
 WALLET_FILE = 'wallet.json'
 BLOCKCHAIN_FILE = 'blockchain.json'
 PEERS_FILE = 'peers.json'
+SNAPSHOT_FILE = os.getenv('SNAPSHOT_FILE', os.path.join(DATA_DIR, 'snapshot.bin'))
+SNAPSHOT_INTERVAL = int(os.getenv('SNAPSHOT_INTERVAL', 100))  # Blocks between state snapshots (0 disables them)
 
 # Database settings
 DATABASE_CONFIG = {
@@ -58,6 +99,7 @@ API_PORT = int(os.getenv('API_PORT', 5000))
 API_DEBUG = os.getenv('API_DEBUG', 'True').lower() == 'true'
 API_THREADED = True
 API_RATE_LIMIT = 100
+API_PAGE_LIMIT = 100  # Maximum items per page of paginated endpoints
 
 # API configuration dictionary
 API_CONFIG = {
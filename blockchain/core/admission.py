@@ -0,0 +1,184 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from .transaction import Transaction
+from ..config import ADMISSION_QUEUE_SIZE, ADMISSION_WORKERS, ADMISSION_BATCH_SIZE, ADMISSION_LATENCY_WINDOW
+
+logger = logging.getLogger(__name__)
+
+class AdmissionQueue:
+    """
+    Admits submitted transactions to the pool on background threads, so API
+    handlers return as soon as a transaction is queued instead of waiting
+    for its signature check.
+    
+    The queue is bounded: when it is full, submit refuses the transaction
+    and the caller can report backpressure. Each worker drains up to
+    batch_size queued transactions at a time and adds them with
+    Blockchain.add_transactions, so their signatures are verified as a batch.
+    """
+    
+    def __init__(self, blockchain: Any, workers: int = ADMISSION_WORKERS,
+                 max_size: int = ADMISSION_QUEUE_SIZE, batch_size: int = ADMISSION_BATCH_SIZE):
+        """
+        Initialize the admission queue.
+        
+        Args:
+            blockchain: Blockchain whose pool the transactions are added to
+            workers: Number of worker threads
+            max_size: Maximum number of queued transactions
+            batch_size: Maximum number of transactions admitted together
+        """
+        self.blockchain = blockchain
+        self.workers = max(1, workers)
+        self.max_size = max_size
+        self.batch_size = max(1, batch_size)
+        self.submitted = 0
+        self.refused = 0  # Turned away because the queue was full
+        self.accepted = 0
+        self.rejected = 0  # Refused by the pool, e.g. invalid or duplicate
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(max_size)  # (transaction, submit time)
+        self._latencies: deque = deque(maxlen=ADMISSION_LATENCY_WINDOW)  # Seconds from submit to admission
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+    
+    @property
+    def depth(self) -> int:
+        """Number of transactions waiting to be admitted."""
+        return self._queue.qsize()
+    
+    def start(self) -> None:
+        """Start the worker threads if they are not running."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._run, name=f'admission-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+    
+    def stop(self) -> None:
+        """Stop the worker threads once the transactions already queued are admitted."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join()
+    
+    def submit(self, transaction: Transaction) -> bool:
+        """
+        Queue a transaction for admission.
+        
+        Args:
+            transaction: Transaction to add to the pool
+        
+        Returns:
+            bool: True if it was queued, False if the queue is full
+        """
+        self.start()
+        try:
+            self._queue.put_nowait((transaction, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self.refused += 1
+            return False
+        with self._lock:
+            self.submitted += 1
+        return True
+    
+    def join(self) -> None:
+        """Block until every queued transaction has been processed."""
+        self._queue.join()
+    
+    def _run(self) -> None:
+        """Admit queued transactions in batches until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            
+            batch: List[Tuple[Transaction, float]] = [item]
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                self._admit(batch)
+            finally:
+                for _ in range(len(batch) + stopping):
+                    self._queue.task_done()
+            if stopping:
+                return
+    
+    def _admit(self, batch: List[Tuple[Transaction, float]]) -> None:
+        """
+        Add a batch of queued transactions to the pool and record the outcome.
+        
+        Args:
+            batch: (transaction, submit time) pairs
+        """
+        try:
+            added = self.blockchain.add_transactions([transaction for transaction, _ in batch])
+        except Exception as e:
+            logger.error(f"Failed to admit {len(batch)} transactions: {e}")
+            with self._lock:
+                self.failed += len(batch)
+            return
+        
+        finished = time.monotonic()
+        with self._lock:
+            for (_, submitted_at), accepted in zip(batch, added):
+                self._latencies.append(finished - submitted_at)
+                if accepted:
+                    self.accepted += 1
+                else:
+                    self.rejected += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, outcome counters and admission latency, for monitoring."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counters = {
+                'submitted': self.submitted,
+                'refused': self.refused,
+                'accepted': self.accepted,
+                'rejected': self.rejected,
+                'failed': self.failed
+            }
+        
+        def percentile(fraction: float) -> Optional[float]:
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] if latencies else None
+        
+        return {
+            'queue_depth': self.depth,
+            'max_size': self.max_size,
+            'workers': self.workers,
+            **counters,
+            'latency': {
+                'samples': len(latencies),
+                'average': sum(latencies) / len(latencies) if latencies else None,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': latencies[-1] if latencies else None
+            }
+        } 
\ No newline at end of file
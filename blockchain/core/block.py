@@ -1,17 +1,48 @@
 import hashlib
 import json
+import struct
 import time
 from typing import List, Dict, Any
 from .transaction import Transaction
+from .merkle import MerkleTree
 
 class Block:
     """
     Represents a single block in the blockchain.
     Each block contains a list of transactions, timestamp, previous block's hash,
     and a proof of work (nonce).
+    
+    Once mined (or decoded from a peer) a block is sealed: its fields and
+    transactions become read-only and its hash, header bytes and dict/JSON forms are cached the
+    first time they are computed. Instances are slotted.
+    
+    Peers exchange blocks in a binary encoding: the header followed by the
+    number of transactions and each transaction's length-prefixed canonical
+    encoding.
     """
     
-    def __init__(self, index: int, transactions: List[Transaction], previous_hash: str, timestamp: float = None):
+    __slots__ = (
+        'version', 'index', 'transactions', 'timestamp', 'previous_hash',
+        'difficulty', 'nonce', '_hash', '_merkle_tree', '_sealed', '_cache'
+    )
+    
+    VERSION = 1
+    
+    # Fixed-layout binary header: version, index, previous hash, transaction
+    # commitment, timestamp and difficulty, followed by the nonce
+    HEADER_STRUCT = struct.Struct('>IQ32s32sdI')
+    NONCE_STRUCT = struct.Struct('>Q')
+    HEADER_SIZE = HEADER_STRUCT.size + NONCE_STRUCT.size
+    LENGTH_STRUCT = struct.Struct('>I')
+    
+    # Fields that can no longer be assigned once the block is sealed
+    SEALED_FIELDS = frozenset({
+        'version', 'index', 'transactions', 'timestamp',
+        'previous_hash', 'difficulty', 'nonce', 'hash'
+    })
+    
+    def __init__(self, index: int, transactions: List[Transaction], previous_hash: str,
+                 timestamp: float = None, difficulty: int = 0):
         """
         Initialize a new block.
         
@@ -20,45 +51,187 @@ class Block:
             transactions: List of transactions to be included in the block
             previous_hash: Hash of the previous block in the chain
             timestamp: Block creation timestamp (defaults to current time)
+            difficulty: Number of leading zeros the block hash is mined to
         """
+        self.version = self.VERSION
         self.index = index
         self.transactions = transactions
         self.timestamp = timestamp or time.time()
         self.previous_hash = previous_hash
+        self.difficulty = difficulty
         self.nonce = 0
-        self.hash = self.calculate_hash()
+        self._hash = None
+        self._merkle_tree = None
+        self._sealed = False
+        self._cache: Dict[str, Any] = {}
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject changes to the block's content once it is sealed."""
+        if name in self.SEALED_FIELDS and getattr(self, '_sealed', False):
+            raise AttributeError(f"Cannot modify '{name}' of sealed block {self.index}")
+        super().__setattr__(name, value)
+    
+    @property
+    def hash(self) -> str:
+        """
+        The block's hash. Until a hash is assigned (by mining or decoding)
+        it is calculated from the current header on every access.
+        """
+        if self._hash is None:
+            return self.calculate_hash()
+        return self._hash
+    
+    @hash.setter
+    def hash(self, value: str) -> None:
+        self._hash = value
+    
+    @property
+    def sealed(self) -> bool:
+        """Whether the block is sealed."""
+        return self._sealed
+    
+    def seal(self) -> 'Block':
+        """
+        Make the block immutable so its derived forms can be cached.
+        
+        Returns:
+            Block: The block itself
+        """
+        if not self._sealed:
+            if self._hash is None:
+                self._hash = self.calculate_hash()
+            self.transactions = tuple(tx.freeze() for tx in self.transactions)
+            self._sealed = True
+        return self
+    
+    def _cached(self, key: str, compute: Any) -> Any:
+        """
+        Return a derived value, computing it at most once for sealed blocks.
+        
+        Args:
+            key: Cache key
+            compute: Callable producing the value
+        
+        Returns:
+            The cached or freshly computed value
+        """
+        if not self._sealed:
+            return compute()
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+    
+    @property
+    def merkle_tree(self) -> MerkleTree:
+        """
+        Merkle tree over the hashes of the block's transactions.
+        The tree is cached and only rebuilt when the transactions change.
+        """
+        if self._sealed and self._merkle_tree is not None:
+            return self._merkle_tree
+        leaves = [tx.calculate_hash() for tx in self.transactions]
+        if self._merkle_tree is None or self._merkle_tree.leaves != leaves:
+            self._merkle_tree = MerkleTree(leaves)
+        return self._merkle_tree
+    
+    @property
+    def merkle_root(self) -> str:
+        """Merkle root committing to the block's transactions."""
+        return self.merkle_tree.root
+    
+    def get_merkle_proof(self, tx_index: int) -> List[Dict[str, str]]:
+        """
+        Get the inclusion proof for one of the block's transactions.
+        
+        Args:
+            tx_index: Position of the transaction in the block
+        
+        Returns:
+            List[Dict[str, str]]: Sibling hashes from the transaction up to the
+            Merkle root (see MerkleTree.get_proof)
+        """
+        return self.merkle_tree.get_proof(tx_index)
+    
+    def header_prefix(self) -> bytes:
+        """
+        Serialize every header field except the nonce.
+        
+        Returns:
+            bytes: Binary header without the trailing nonce
+        """
+        return self.HEADER_STRUCT.pack(
+            self.version,
+            self.index,
+            bytes.fromhex(self.previous_hash),
+            bytes.fromhex(self.merkle_root),
+            self.timestamp,
+            self.difficulty
+        )
+    
+    def header_bytes(self) -> bytes:
+        """
+        Serialize the full binary block header.
+        
+        Returns:
+            bytes: Binary header including the nonce
+        """
+        return self._cached(
+            'header',
+            lambda: self.header_prefix() + self.NONCE_STRUCT.pack(self.nonce)
+        )
     
     def calculate_hash(self) -> str:
         """
         Calculate the hash of the block using SHA-256.
-        The hash includes all block data except the current hash.
+        The hash covers the binary block header, which commits to the
+        transactions through their Merkle root.
         
         Returns:
             str: The calculated hash of the block
         """
-        block_string = json.dumps({
-            'index': self.index,
-            'transactions': [tx.to_dict() for tx in self.transactions],
-            'timestamp': self.timestamp,
-            'previous_hash': self.previous_hash,
-            'nonce': self.nonce
-        }, sort_keys=True)
-        
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        return self._cached('hash', lambda: hashlib.sha256(self.header_bytes()).hexdigest())
     
-    def mine_block(self, difficulty: int) -> None:
+    def mine_block(self, difficulty: int, stop_event: Any = None,
+                   check_interval: int = 1000) -> bool:
         """
         Mine the block by finding a nonce that produces a hash with the required
         number of leading zeros (difficulty).
         
+        The constant part of the header is hashed once and each attempt only
+        feeds the nonce into a copy of that SHA-256 state, so the cost per
+        attempt does not depend on the number of transactions. The block is
+        sealed once a valid nonce is found.
+        
         Args:
             difficulty: Number of leading zeros required in the hash
+            stop_event: Optional event that aborts the search when set
+            check_interval: Nonces tried between checks of the stop event
+        
+        Returns:
+            bool: True if the block was mined, False if the search was stopped
         """
+        self.difficulty = difficulty
         target = '0' * difficulty
+        midstate = hashlib.sha256(self.header_prefix())
+        pack_nonce = self.NONCE_STRUCT.pack
+        nonce = self.nonce
         
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        while True:
+            for _ in range(check_interval):
+                attempt = midstate.copy()
+                attempt.update(pack_nonce(nonce))
+                block_hash = attempt.hexdigest()
+                if block_hash[:difficulty] == target:
+                    self.nonce = nonce
+                    self.hash = block_hash
+                    self.seal()
+                    return True
+                nonce += 1
+            
+            if stop_event is not None and stop_event.is_set():
+                # Keep the progress so a later call resumes where this one stopped
+                self.nonce = nonce
+                return False
     
     def is_valid(self, difficulty: int) -> bool:
         """
@@ -66,7 +239,7 @@ class Block:
         
         Args:
             difficulty: Number of leading zeros required in the hash
-            
+        
         Returns:
             bool: True if the block is valid, False otherwise
         """
@@ -78,36 +251,164 @@ class Block:
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the block to a dictionary for serialization.
+        For sealed blocks the same dictionary is returned on every call, so
+        callers must not modify it.
         
         Returns:
             Dict[str, Any]: Dictionary representation of the block
         """
-        return {
+        return self._cached('dict', lambda: {
+            'version': self.version,
             'index': self.index,
             'transactions': [tx.to_dict() for tx in self.transactions],
             'timestamp': self.timestamp,
             'previous_hash': self.previous_hash,
+            'merkle_root': self.merkle_root,
+            'difficulty': self.difficulty,
             'nonce': self.nonce,
             'hash': self.hash
-        }
+        })
+    
+    def to_json(self) -> str:
+        """
+        Serialize the block to JSON.
+        
+        Returns:
+            str: JSON representation of the block
+        """
+        return self._cached('json', lambda: json.dumps(self.to_dict(), sort_keys=True))
+    
+    def encode(self) -> bytes:
+        """
+        Serialize the block for peers.
+        
+        Returns:
+            bytes: Binary header followed by the transaction count and the
+            length-prefixed transaction encodings
+        """
+        def compute() -> bytes:
+            parts = [self.header_bytes(), self.LENGTH_STRUCT.pack(len(self.transactions))]
+            for transaction in self.transactions:
+                encoded = transaction.encode()
+                parts.append(self.LENGTH_STRUCT.pack(len(encoded)))
+                parts.append(encoded)
+            return b''.join(parts)
+        
+        return self._cached('encoded', compute)
+    
+    @classmethod
+    def encoded_hash(cls, data: bytes) -> str:
+        """
+        Hash of an encoded block, read from its header without decoding the
+        transactions.
+        
+        Args:
+            data: Encoded block
+        
+        Returns:
+            str: Hash of the encoded header
+        
+        Raises:
+            ValueError: If the data is shorter than a header
+        """
+        if len(data) < cls.HEADER_SIZE:
+            raise ValueError("Encoded block is truncated")
+        return hashlib.sha256(data[:cls.HEADER_SIZE]).hexdigest()
+    
+    @classmethod
+    def encoded_difficulty(cls, data: bytes) -> int:
+        """
+        Claimed difficulty of an encoded block, read from its header.
+        
+        Args:
+            data: Encoded block
+        
+        Returns:
+            int: Difficulty field of the header
+        
+        Raises:
+            ValueError: If the data is shorter than a header
+        """
+        if len(data) < cls.HEADER_SIZE:
+            raise ValueError("Encoded block is truncated")
+        return cls.HEADER_STRUCT.unpack_from(data)[5]
+    
+    @classmethod
+    def decode(cls, data: bytes) -> 'Block':
+        """
+        Create a sealed Block from its binary encoding.
+        The block keeps the hash of the received header, so a header whose
+        Merkle root does not match the transactions fails validation.
+        
+        Args:
+            data: Encoded block
+        
+        Returns:
+            Block: Decoded block
+        
+        Raises:
+            ValueError: If the data is not a valid encoding
+        """
+        view = memoryview(data)
+        block_hash = cls.encoded_hash(view)
+        version, index, previous_hash, _, timestamp, difficulty = cls.HEADER_STRUCT.unpack_from(view)
+        nonce, = cls.NONCE_STRUCT.unpack_from(view, cls.HEADER_STRUCT.size)
+        offset = cls.HEADER_SIZE
+        
+        def read_length() -> int:
+            nonlocal offset
+            if offset + cls.LENGTH_STRUCT.size > len(view):
+                raise ValueError("Encoded block is truncated")
+            length, = cls.LENGTH_STRUCT.unpack_from(view, offset)
+            offset += cls.LENGTH_STRUCT.size
+            return length
+        
+        transactions = []
+        for _ in range(read_length()):
+            size = read_length()
+            if offset + size > len(view):
+                raise ValueError("Encoded block is truncated")
+            transactions.append(Transaction.decode(view[offset:offset + size]))
+            offset += size
+        if offset != len(view):
+            raise ValueError("Unexpected data after encoded block")
+        
+        block = cls(index, transactions, previous_hash.hex(), timestamp, difficulty)
+        block.version = version
+        block.nonce = nonce
+        block.hash = block_hash
+        return block.seal()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Block':
         """
-        Create a Block instance from a dictionary.
+        Create a sealed Block instance from a dictionary.
+        The stored hash is kept as-is; use calculate_hash to check it.
         
         Args:
             data: Dictionary containing block data
-            
+        
         Returns:
             Block: New Block instance
+        
+        Raises:
+            ValueError: If a header field cannot be serialized
         """
         block = cls(
             index=data['index'],
             transactions=[Transaction.from_dict(tx) for tx in data['transactions']],
             previous_hash=data['previous_hash'],
-            timestamp=data['timestamp']
+            timestamp=data['timestamp'],
+            difficulty=data.get('difficulty', 0)
         )
+        block.version = data.get('version', cls.VERSION)
         block.nonce = data['nonce']
         block.hash = data['hash']
+        block.seal()
+        
+        # Reject header fields the binary header cannot represent up front
+        try:
+            block.header_bytes()
+        except (struct.error, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid block header field: {e}")
         return block 
\ No newline at end of file
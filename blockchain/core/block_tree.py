@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+from .block import Block
+from ..config import MAX_ORPHAN_BLOCKS
+
+def block_work(block: Block) -> int:
+    """
+    Expected number of hashes needed to mine a block.
+    
+    Args:
+        block: Mined block
+    
+    Returns:
+        int: Work represented by the block's difficulty
+    """
+    return 16 ** block.difficulty
+
+class BlockTree:
+    """
+    Recent blocks indexed by hash, covering the main chain and any side
+    branches, together with their cumulative work. Blocks whose parent has
+    not arrived yet wait in a bounded orphan pool.
+    """
+    
+    def __init__(self, max_orphans: int = MAX_ORPHAN_BLOCKS):
+        """
+        Initialize an empty block tree.
+        
+        Args:
+            max_orphans: Maximum number of orphan blocks kept
+        """
+        self.blocks: Dict[str, Block] = {}
+        self.work: Dict[str, int] = {}
+        self._heights: Dict[int, Set[str]] = {}
+        self.orphans: 'OrderedDict[str, Block]' = OrderedDict()
+        self._orphans_by_parent: Dict[str, Set[str]] = {}
+        self.max_orphans = max_orphans
+    
+    def __contains__(self, block_hash: str) -> bool:
+        """Whether a block with this hash is in the tree."""
+        return block_hash in self.blocks
+    
+    def __len__(self) -> int:
+        """Number of blocks in the tree, excluding orphans."""
+        return len(self.blocks)
+    
+    def get(self, block_hash: str) -> Optional[Block]:
+        """
+        Get a block by hash.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            Optional[Block]: The block if it is in the tree
+        """
+        return self.blocks.get(block_hash)
+    
+    def add(self, block: Block, work: int) -> None:
+        """
+        Add a block whose parent is already known.
+        
+        Args:
+            block: Block to add
+            work: Cumulative work of the chain ending in this block
+        """
+        self.blocks[block.hash] = block
+        self.work[block.hash] = work
+        self._heights.setdefault(block.index, set()).add(block.hash)
+    
+    def add_orphan(self, block: Block) -> None:
+        """
+        Keep a block until its parent arrives, evicting the oldest orphan
+        when the pool is full.
+        
+        Args:
+            block: Block whose parent is unknown
+        """
+        if block.hash in self.orphans:
+            return
+        if len(self.orphans) >= self.max_orphans:
+            _, evicted = self.orphans.popitem(last=False)
+            self._forget_orphan(evicted)
+        self.orphans[block.hash] = block
+        self._orphans_by_parent.setdefault(block.previous_hash, set()).add(block.hash)
+    
+    def pop_orphans(self, parent_hash: str) -> List[Block]:
+        """
+        Remove and return the orphans waiting for a parent.
+        
+        Args:
+            parent_hash: Hash of the parent that arrived
+        
+        Returns:
+            List[Block]: Orphan blocks that build on the parent
+        """
+        children = [self.orphans.pop(h) for h in self._orphans_by_parent.pop(parent_hash, ())]
+        return sorted(children, key=lambda block: block.index)
+    
+    def _forget_orphan(self, block: Block) -> None:
+        """Drop an evicted orphan from the parent index."""
+        siblings = self._orphans_by_parent.get(block.previous_hash)
+        if siblings:
+            siblings.discard(block.hash)
+            if not siblings:
+                del self._orphans_by_parent[block.previous_hash]
+    
+    def prune(self, min_height: int) -> None:
+        """
+        Forget blocks and orphans below a height; forks deeper than this can
+        no longer be reorganized to.
+        
+        Args:
+            min_height: Lowest height to keep
+        """
+        for height in [h for h in self._heights if h < min_height]:
+            for block_hash in self._heights.pop(height):
+                del self.blocks[block_hash]
+                del self.work[block_hash]
+        
+        for block in [b for b in self.orphans.values() if b.index < min_height]:
+            del self.orphans[block.hash]
+            self._forget_orphan(block)
+    
+    def clear(self) -> None:
+        """Remove every block and orphan."""
+        self.blocks.clear()
+        self.work.clear()
+        self._heights.clear()
+        self.orphans.clear()
+        self._orphans_by_parent.clear() 
\ No newline at end of file
@@ -1,10 +1,24 @@
 import json
+import logging
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from .block import Block
 from .transaction import Transaction
 from .transaction_pool import TransactionPool
-from ..config import INITIAL_DIFFICULTY, MINING_REWARD
+from .miner import ParallelMiner
+from .validation import ChainValidator, ValidationReport, check_block
+from .block_tree import BlockTree, block_work
+from .state import AccountState
+from .history import AddressHistory, TxLocation
+from .bloom import ConfirmedTxFilter
+from .chain_window import ChainWindow
+from ..config import (
+    INITIAL_DIFFICULTY, MINING_REWARD, MINING_WORKERS, MINING_CHECK_INTERVAL,
+    MAX_REORG_DEPTH, CHAIN_WINDOW_SIZE, MAX_BLOCK_TRANSACTIONS
+)
+
+logger = logging.getLogger(__name__)
 
 class Blockchain:
     """
@@ -12,19 +26,55 @@ class Blockchain:
     methods for adding new blocks, validating the chain, and managing consensus.
     """
     
-    def __init__(self, difficulty: int = INITIAL_DIFFICULTY):
+    def __init__(self, difficulty: int = INITIAL_DIFFICULTY, mining_workers: int = MINING_WORKERS,
+                 store: Any = None, chain_window: int = CHAIN_WINDOW_SIZE, snapshot: Any = None):
         """
         Initialize a new blockchain.
         
         Args:
             difficulty: Mining difficulty (number of leading zeros required)
+            mining_workers: Number of processes used to mine blocks
+            store: Optional block storage (e.g. utils.storage.Storage); with a
+                non-zero chain_window, the chain is loaded from it and only
+                the most recent blocks are kept in memory
+            chain_window: Number of recent blocks kept in memory (0 keeps all)
+            snapshot: Optional utils.snapshot.Snapshot of the stored chain; the
+                indexes are restored from it instead of replaying every block
         """
-        self.chain: List[Block] = [self._create_genesis_block()]
+        if store is not None and chain_window > 0:
+            self.chain: List[Block] | ChainWindow = ChainWindow(store, chain_window)
+            self.store = store
+            if not self.chain:
+                self.chain.append(self._create_genesis_block())
+        else:
+            self.chain = [self._create_genesis_block()]
+            self.store = None
         self.difficulty = difficulty
-        self.transaction_pool = TransactionPool()
+        self.lock = threading.RLock()  # Guards changes to the chain
+        # The pool checks replays and balances under the chain lock
+        self.transaction_pool = TransactionPool(
+            is_confirmed=self.is_confirmed,
+            balance_of=lambda address: self.get_balance(address, include_pending=False),
+            lock=self.lock
+        )
         self.mining_reward = MINING_REWARD
         self.block_time = 10  # Target time between blocks in seconds
         self.difficulty_adjustment_interval = 10  # Adjust difficulty every N blocks
+        self.miner = (
+            ParallelMiner(mining_workers, MINING_CHECK_INTERVAL)
+            if mining_workers > 1 else None
+        )
+        self.validator = ChainValidator()
+        self.block_tree = BlockTree()
+        self.block_heights: Dict[str, int] = {}  # Hash -> height of main chain blocks
+        self.hash_indexed_from = 0  # Lowest height in block_heights; older blocks are looked up in the store
+        self.state = AccountState()
+        # Without a store to serve older history from, every block is indexed
+        self.history = AddressHistory() if self.store is not None else AddressHistory(window=None)
+        self.confirmed_txids = ConfirmedTxFilter()
+        self._tip_listeners: List[Callable[[Block], None]] = []
+        if snapshot is None or not self._restore_snapshot(snapshot):
+            self._rebuild_indexes()
     
     def _create_genesis_block(self) -> Block:
         """Create the first block in the chain."""
@@ -32,117 +82,712 @@ class Blockchain:
             index=0,
             transactions=[],
             previous_hash="0" * 64
-        )
+        ).seal()
     
     def get_latest_block(self) -> Block:
         """Get the most recent block in the chain."""
         return self.chain[-1]
     
+    def get_block_by_height(self, height: int) -> Optional[Block]:
+        """
+        Get a main chain block by height.
+        
+        Args:
+            height: Index of the block
+        
+        Returns:
+            The block, or None if the chain is not that long
+        """
+        if 0 <= height < len(self.chain):
+            return self.chain[height]
+        return None
+    
+    def get_block_by_hash(self, block_hash: str) -> Optional[Block]:
+        """
+        Get a main chain block by hash.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            The block, or None if it is not on the main chain
+        """
+        height = self.block_heights.get(block_hash)
+        if height is None:
+            height = self._stored_height(block_hash)
+        return self.chain[height] if height is not None else None
+    
+    def has_block(self, block_hash: str) -> bool:
+        """
+        Check whether a block is known, on the main chain or a side branch.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            True if the block is known, False otherwise
+        """
+        return (
+            block_hash in self.block_heights or block_hash in self.block_tree
+            or self._stored_height(block_hash) is not None
+        )
+    
+    def _stored_height(self, block_hash: str) -> Optional[int]:
+        """
+        Look up the height of a main chain block that is too old to be in
+        block_heights, which only happens after starting from a snapshot.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            Optional[int]: Height of the block, None if it is not a stored
+            main chain block below the indexed heights
+        """
+        if self.store is None or not self.hash_indexed_from or not isinstance(block_hash, str):
+            return None
+        height = self.store.get_block_height(block_hash)
+        if height is None or not 0 <= height < self.hash_indexed_from:
+            return None
+        return height
+    
+    def get_balance(self, address: str, include_pending: bool = True) -> float:
+        """
+        Get the balance of an address from the state index.
+        
+        Args:
+            address: Address to look up
+            include_pending: Whether to include transactions in the pool
+        
+        Returns:
+            Confirmed balance, plus pending changes if requested
+        """
+        balance = self.state.get_balance(address)
+        if include_pending:
+            balance += self.transaction_pool.get_pending_delta(address)
+        return balance
+    
+    def create_vm(self) -> Any:
+        """
+        Create a contract VM whose BALANCE instruction reads the confirmed
+        balances of this chain.
+        
+        Returns:
+            VM: New virtual machine bound to the account state
+        """
+        # The VM depends on pydantic, which nodes without contracts do not need
+        from ..vm.vm import VM
+        return VM(state=self.state)
+    
+    def is_confirmed(self, transaction: Transaction) -> bool:
+        """
+        Check whether a transaction is already on the main chain.
+        
+        The confirmed-txid Bloom filter answers "no" for almost every new
+        transaction in constant time. Only when it answers "maybe" are the
+        sender's recent transactions in the history index compared, then
+        stored blocks or, without a store, the older part of the chain.
+        
+        Args:
+            transaction: Transaction to look up
+        
+        Returns:
+            True if the main chain contains the transaction
+        """
+        txid = transaction.txid
+        if txid not in self.confirmed_txids:
+            return False
+        
+        for height, position in self.history.locations.get(transaction.sender_address, []):
+            if self.chain[height].transactions[position].txid == txid:
+                return True
+        
+        indexed_from = self.history.min_height or 0
+        if indexed_from == 0:
+            return False
+        if self.store is not None:
+            return self.store.has_transaction(txid)
+        return any(
+            tx.txid == txid for block in self.chain[:indexed_from] for tx in block.transactions
+        )
+    
+    def get_address_history(self, address: str, before: Optional[TxLocation] = None,
+                            limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get recent confirmed transactions involving an address, newest first.
+        Only the blocks covered by the in-memory history index are searched,
+        which is the whole chain on nodes without a store.
+        
+        Args:
+            address: Address to look up
+            before: Only return transactions strictly before this
+                (block height, transaction index) location
+            limit: Maximum number of transactions
+        
+        Returns:
+            Transactions with their location and block hash
+        """
+        with self.lock:
+            entries = []
+            for height, position in self.history.get_locations(address, before, limit):
+                block = self.chain[height]
+                entries.append({
+                    'block_height': height,
+                    'tx_index': position,
+                    'block_hash': block.hash,
+                    'transaction': block.transactions[position].to_dict()
+                })
+            return entries
+    
     def add_transaction(self, transaction: Dict[str, Any] | Transaction) -> bool:
         """
         Add a new transaction to the pool.
         
         Args:
             transaction: Transaction to add (can be dict or Transaction object)
-            
+        
         Returns:
             True if transaction was added, False otherwise
         """
+        # The pool shares the chain lock, so signatures are verified without it
         return self.transaction_pool.add_transaction(transaction)
     
-    def mine_pending_transactions(self, miner_address: str) -> Optional[Block]:
+    def add_transactions(self, transactions: List[Dict[str, Any] | Transaction]) -> List[bool]:
         """
-        Mine a new block with pending transactions.
+        Add many transactions to the pool, verifying their signatures in a batch.
+        
+        Args:
+            transactions: Transactions to add (dicts or Transaction objects)
+        
+        Returns:
+            List[bool]: Whether each transaction was added, in input order
+        """
+        return self.transaction_pool.add_transactions(transactions)
+    
+    def add_tip_listener(self, listener: Callable[[Block], None]) -> None:
+        """
+        Register a callback invoked with the new tip whenever it changes.
+        
+        Args:
+            listener: Callback taking the new latest block
+        """
+        self._tip_listeners.append(listener)
+    
+    def _notify_tip_changed(self) -> None:
+        """Tell every tip listener about the current latest block."""
+        tip = self.get_latest_block()
+        for listener in self._tip_listeners:
+            listener(tip)
+    
+    def create_block_template(self, miner_address: str) -> Block:
+        """
+        Build an unmined block on top of the current tip with the
+        best-paying pending transactions and a mining reward that includes
+        their fees.
         
         Args:
             miner_address: Address of the miner
-            
+        
         Returns:
-            New block if mining successful, None otherwise
+            Block template ready to be mined
         """
+        # Get pending transactions, highest fee rate first
+        transactions = self.transaction_pool.select_transactions(MAX_BLOCK_TRANSACTIONS)
+        
         # Create mining reward transaction
         reward_tx = Transaction(
             sender="system",
             recipient=miner_address,
-            amount=MINING_REWARD
+            amount=MINING_REWARD + sum(tx.fee for tx in transactions)
         )
-        
-        # Get pending transactions
-        transactions = self.transaction_pool.get_transactions()
         transactions.insert(0, reward_tx)
         
-        # Create new block
-        new_block = Block(
+        return Block(
             index=len(self.chain),
             transactions=transactions,
-            previous_hash=self.get_latest_block().hash
+            previous_hash=self.get_latest_block().hash,
+            difficulty=self.difficulty
         )
+    
+    def solve_block(self, block: Block, stop_event: Any = None) -> bool:
+        """
+        Run the proof-of-work search for a block and seal it.
+        
+        Args:
+            block: Block template to mine
+            stop_event: Optional event that aborts the search when set
+        
+        Returns:
+            True if the block was mined, False if the search was stopped
+        """
+        # Spread the nonce search over several cores if configured
+        if self.miner:
+            result = self.miner.mine(block, self.difficulty, stop_event)
+            if result is None:
+                return False
+            block.nonce = result.nonce
+            block.hash = result.hash
+            block.seal()
+            return True
+        return block.mine_block(self.difficulty, stop_event, MINING_CHECK_INTERVAL)
+    
+    def mine_pending_transactions(self, miner_address: str) -> Optional[Block]:
+        """
+        Mine a new block with pending transactions.
+        
+        Args:
+            miner_address: Address of the miner
+        
+        Returns:
+            New block if mining successful, None otherwise
+        """
+        new_block = self.create_block_template(miner_address)
         
         # Mine the block
-        new_block.mine_block(self.difficulty)
+        self.solve_block(new_block)
         
         # Add block to chain
-        self.chain.append(new_block)
+        if not self.add_mined_block(new_block):
+            return None
+        return new_block
+    
+    def add_mined_block(self, block: Block) -> bool:
+        """
+        Add a block mined locally, as long as it still extends the tip.
         
-        # Clear transaction pool
-        self.transaction_pool.clear_transactions()
+        Args:
+            block: Mined block
         
-        return new_block
+        Returns:
+            True if the block became the new tip, False otherwise
+        """
+        with self.lock:
+            # Another block may have been added while mining
+            if block.previous_hash != self.get_latest_block().hash:
+                return False
+            return self.add_block(block)
     
     def add_block(self, block: Block) -> bool:
         """
-        Add a new block to the chain.
+        Add a new block to the block tree.
+        
+        A block that extends the tip is appended to the chain. A block on a
+        side branch is kept and triggers a reorganization once its branch has
+        more cumulative work than the main chain. A block whose parent is
+        unknown waits in the orphan pool until the parent arrives.
         
         Args:
             block: Block to add
+        
+        Returns:
+            True if block was added to the chain or a side branch, False if it
+            is invalid, already known or orphaned
+        """
+        with self.lock:
+            tip = self.get_latest_block()
+            if not self._accept_block(block):
+                return False
+            
+            # Attach orphans that were waiting for this block, keeping track
+            # of the heaviest block that is now connected
+            best = block
+            waiting = self.block_tree.pop_orphans(block.hash)
+            while waiting:
+                orphan = waiting.pop(0)
+                if self._accept_block(orphan):
+                    if self.block_tree.work[orphan.hash] > self.block_tree.work[best.hash]:
+                        best = orphan
+                    waiting.extend(self.block_tree.pop_orphans(orphan.hash))
             
+            # Fork choice: follow the branch with the most cumulative work
+            if self.block_tree.work[best.hash] > self.get_chain_work():
+                branch = self._branch_to(best)
+                if branch:
+                    self._reorganize(branch)
+            
+            tip_changed = self.get_latest_block() is not tip
+        
+        if tip_changed:
+            self._notify_tip_changed()
+        return True
+    
+    def _accept_block(self, block: Block) -> bool:
+        """
+        Validate a block and store it in the block tree or orphan pool.
+        
+        Args:
+            block: Block to store
+        
         Returns:
-            True if block was added, False otherwise
+            True if the block was added to the tree, False otherwise
         """
-        # Verify block
-        if not self._is_valid_block(block):
+        if block.hash in self.block_tree or block.hash in self.block_tree.orphans:
             return False
         
-        # Add block to chain
+        if self.validator.conflicts_with_checkpoint(block.index, block.hash):
+            return False
+        
+        # Check block hash, proof of work and signatures
+        if check_block(block, self.difficulty) is not None:
+            return False
+        block.seal()
+        
+        parent = self.block_tree.get(block.previous_hash)
+        if parent is None:
+            self.block_tree.add_orphan(block)
+            return False
+        
+        # Check block index
+        if block.index != parent.index + 1:
+            return False
+        
+        self.block_tree.add(block, self.block_tree.work[parent.hash] + block_work(block))
+        return True
+    
+    def _branch_to(self, block: Block) -> List[Block]:
+        """
+        Collect the blocks between the main chain and a block in the tree.
+        
+        Args:
+            block: Block at the end of the branch
+        
+        Returns:
+            Blocks to connect, oldest first, or an empty list if the branch
+            forks off deeper than the tree reaches
+        """
+        branch = []
+        while not self._is_on_main_chain(block):
+            branch.append(block)
+            block = self.block_tree.get(block.previous_hash)
+            if block is None:
+                return []
+        branch.reverse()
+        return branch
+    
+    def _is_on_main_chain(self, block: Block) -> bool:
+        """Whether a block is part of the main chain."""
+        return block.hash in self.block_heights
+    
+    def _reorganize(self, branch: List[Block]) -> None:
+        """
+        Make a branch part of the main chain. Only the blocks above the fork
+        point are disconnected; transactions from them that the new branch
+        does not include go back to the pool.
+        
+        Args:
+            branch: Consecutive blocks to connect, oldest first; the first
+                block's parent must be on the main chain
+        """
+        disconnected = []
+        while len(self.chain) > branch[0].index:
+            disconnected.append(self._disconnect_tip())
+        
+        for block in branch:
+            self._connect_block(block)
+        
+        if disconnected:
+            confirmed = {tx.txid for block in branch for tx in block.transactions}
+            self.transaction_pool.readmit_transactions([
+                tx
+                for block in reversed(disconnected)
+                for tx in block.transactions
+                if tx.sender != "system" and tx.txid not in confirmed
+            ])
+        
+        self.block_tree.prune(len(self.chain) - MAX_REORG_DEPTH)
+        self.state.prune(len(self.chain) - MAX_REORG_DEPTH)
+    
+    def _connect_block(self, block: Block) -> None:
+        """
+        Append a block to the main chain.
+        
+        Args:
+            block: Block that extends the tip
+        """
         self.chain.append(block)
+        self.block_heights[block.hash] = block.index
+        self.state.apply_block(block)
+        self.history.add_block(block)
+        self.confirmed_txids.add_block(block)
         
         # Remove transactions from pool
         self.transaction_pool.remove_transactions(block.transactions)
+    
+    def _disconnect_tip(self) -> Block:
+        """
+        Remove the tip from the main chain. The block stays in the tree.
         
+        Returns:
+            Block: The removed block
+        """
+        block = self.chain.pop()
+        del self.block_heights[block.hash]
+        self.state.revert_block(block)
+        self.history.remove_block(block)
+        self.confirmed_txids.remove_block(block, self.chain)
+        return block
+    
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the block tree and the hash, state, history and txid indexes from the main chain."""
+        self.block_heights = {block.hash: block.index for block in self.chain}
+        self.hash_indexed_from = 0
+        self.block_tree.clear()
+        self.state.clear()
+        self.history.clear()
+        self.confirmed_txids.clear()
+        for block in self.chain[self.history.indexed_from(len(self.chain)):]:
+            self.history.add_block(block)
+        min_height = len(self.chain) - MAX_REORG_DEPTH
+        work = 0
+        for block in self.chain:
+            work += block_work(block)
+            self.state.apply_block(block)
+            self.confirmed_txids.add_block(block)
+            if block.index >= min_height:
+                self.block_tree.add(block, work)
+        self.state.prune(min_height)
+    
+    def _restore_snapshot(self, snapshot: Any) -> bool:
+        """
+        Restore the settings, state and mempool from a snapshot, replaying
+        only the blocks stored after it was taken. Only recent blocks are
+        indexed by hash, so startup does not depend on the chain length;
+        older ones are looked up by hash in the store.
+        
+        Args:
+            snapshot: Snapshot written by utils.snapshot.SnapshotManager
+        
+        Returns:
+            True if the snapshot was restored, False if it does not match the chain
+        """
+        tip = snapshot.load('tip')
+        height = tip['index'] if tip else -1
+        if not 0 <= height < len(self.chain) or self.chain[height].hash != tip['hash']:
+            logger.warning("Snapshot does not match the stored chain, rebuilding indexes")
+            return False
+        
+        settings = snapshot.load('settings')
+        self.difficulty = settings['difficulty']
+        self.mining_reward = settings['mining_reward']
+        self.block_time = settings['block_time']
+        self.difficulty_adjustment_interval = settings['difficulty_adjustment_interval']
+        
+        # Apply the blocks stored after the snapshot was taken
+        self.state = AccountState.from_dict(snapshot.load('state'))
+        for block in self.chain[height + 1:]:
+            self.state.apply_block(block)
+        self.state.prune(len(self.chain) - MAX_REORG_DEPTH)
+        
+        history_from = self.history.indexed_from(len(self.chain))
+        recent_from = max(0, min(len(self.chain) - MAX_REORG_DEPTH, history_from))
+        self.block_heights = {block.hash: block.index for block in self.chain[recent_from:]}
+        self.hash_indexed_from = recent_from
+        self.history.clear()
+        for block in self.chain[history_from:]:
+            self.history.add_block(block)
+        
+        # The txid filter is only replayed in full for snapshots taken without it
+        txfilter = snapshot.load('txfilter')
+        if txfilter is not None and txfilter['height'] == height:
+            self.confirmed_txids = ConfirmedTxFilter.from_dict(txfilter)
+            replay_from = height + 1
+        else:
+            self.confirmed_txids.clear()
+            replay_from = 0
+        for block in self.chain[replay_from:]:
+            self.confirmed_txids.add_block(block)
+        
+        # Derive the cumulative work of recent blocks from the work at the snapshot tip
+        min_height = max(0, len(self.chain) - MAX_REORG_DEPTH)
+        work = tip['work']
+        if min_height > height:
+            work += sum(block_work(self.chain[h]) for h in range(height + 1, min_height))
+        else:
+            work -= sum(block_work(self.chain[h]) for h in range(min_height, height + 1))
+        self.block_tree.clear()
+        for block in self.chain[min_height:]:
+            work += block_work(block)
+            self.block_tree.add(block, work)
+        
+        self.transaction_pool.add_transactions(snapshot.load('mempool', []))
+        
+        logger.info(f"Restored snapshot taken at height {height}")
         return True
     
+    def snapshot_sections(self) -> Dict[str, Any]:
+        """
+        Capture the chain tip, settings, account state and mempool.
+        
+        Returns:
+            Snapshot sections by name
+        """
+        with self.lock:
+            tip = self.get_latest_block()
+            return {
+                'tip': {'index': tip.index, 'hash': tip.hash, 'work': self.get_chain_work()},
+                'settings': {
+                    'difficulty': self.difficulty,
+                    'mining_reward': self.mining_reward,
+                    'block_time': self.block_time,
+                    'difficulty_adjustment_interval': self.difficulty_adjustment_interval
+                },
+                'state': self.state.to_dict(),
+                'txfilter': self.confirmed_txids.to_dict(),
+                'mempool': [tx.to_dict() for tx in self.transaction_pool.get_transactions()]
+            }
+    
+    def get_chain_work(self) -> int:
+        """Cumulative work of the main chain."""
+        return self.block_tree.work[self.get_latest_block().hash]
+    
     def replace_chain(self, new_chain: List[Dict[str, Any]]) -> bool:
         """
-        Replace the current chain with a new one if it's valid and longer.
+        Replace the current chain with a new one if it's valid and has more
+        cumulative work.
+        
+        Only the blocks after the last block both chains share are decoded
+        and validated; the shared prefix is kept from the current chain.
         
         Args:
             new_chain: List of block dictionaries
-            
+        
         Returns:
             True if chain was replaced, False otherwise
         """
-        # Convert dictionary chain to Block objects
-        new_blocks = [Block.from_dict(block_data) for block_data in new_chain]
+        if not isinstance(new_chain, list) or not all(isinstance(block_data, dict) for block_data in new_chain):
+            return False
+        return self._replace_chain(
+            [block_data.get('hash') for block_data in new_chain],
+            [block_data.get('difficulty', 0) for block_data in new_chain],
+            lambda start: [Block.from_dict(block_data) for block_data in new_chain[start:]]
+        )
+    
+    def replace_chain_encoded(self, new_chain: List[bytes]) -> bool:
+        """
+        Replace the current chain with one received in the binary block
+        encoding, if it's valid and has more cumulative work.
+        
+        Only the block headers are read to compare work and find the fork
+        point; just the blocks after it are decoded.
+        
+        Args:
+            new_chain: List of encoded blocks
+        
+        Returns:
+            True if chain was replaced, False otherwise
+        """
+        try:
+            hashes = [Block.encoded_hash(encoded) for encoded in new_chain]
+            difficulties = [Block.encoded_difficulty(encoded) for encoded in new_chain]
+        except (TypeError, ValueError):
+            return False
+        return self._replace_chain(
+            hashes,
+            difficulties,
+            lambda start: [Block.decode(encoded) for encoded in new_chain[start:]]
+        )
+    
+    def _replace_chain(self, hashes: List[Any], difficulties: List[Any],
+                       decode_from: Callable[[int], List[Block]]) -> bool:
+        """
+        Replace the current chain with a candidate described by its block
+        hashes and claimed difficulties, decoding only the divergent suffix.
+        
+        Args:
+            hashes: Claimed hash of each candidate block
+            difficulties: Claimed difficulty of each candidate block
+            decode_from: Decodes the candidate blocks from a height onwards
         
-        # Verify new chain
-        if not self._is_valid_chain(new_blocks):
+        Returns:
+            True if chain was replaced, False otherwise
+        """
+        # Only replace if new chain has more work, before doing any decoding
+        if not all(isinstance(d, int) and 0 <= d <= 64 for d in difficulties):
+            return False
+        if sum(16 ** d for d in difficulties) <= self.get_chain_work():
             return False
         
-        # Only replace if new chain is longer
-        if len(new_blocks) <= len(self.chain):
+        # Chains that contradict a checkpoint are rejected before any decoding
+        if any(
+            self.validator.conflicts_with_checkpoint(height, hashes[height])
+            for height in self.validator.checkpoints if height < len(hashes)
+        ):
             return False
         
-        # Replace chain
-        self.chain = new_blocks
+        with self.lock:
+            fork_point = self._find_fork_point(hashes)
+            parent = self.chain[fork_point] if fork_point >= 0 else None
+            
+            # Convert the divergent suffix to Block objects
+            try:
+                new_blocks = decode_from(fork_point + 1)
+            except (KeyError, TypeError, ValueError):
+                return False
+            
+            # Verify the suffix against the block it builds on
+            if not self._is_valid_segment(new_blocks, parent):
+                return False
+            
+            # The claimed difficulties above are only a cheap precheck; the
+            # real work counts the shared prefix from our own blocks and the
+            # suffix from the validated ones
+            work = 0
+            if parent is not None:
+                work = self.block_tree.work.get(parent.hash) or sum(
+                    block_work(self.chain[height]) for height in range(fork_point + 1)
+                )
+            block_works = [block_work(block) for block in new_blocks]
+            if parent is None:
+                # A genesis block has no proof of work to back its difficulty
+                block_works[0] = min(block_works[0], block_work(self.chain[0]))
+            if work + sum(block_works) <= self.get_chain_work():
+                return False
+            
+            # Forks deeper than the undo data cannot be rolled back block by
+            # block, so the indexes are rebuilt from the shared prefix instead
+            if len(self.chain) - (fork_point + 1) > self.state.undo_depth:
+                del self.chain[fork_point + 1:]
+                self._rebuild_indexes()
+            
+            # Replace chain
+            for block, added_work in zip(new_blocks, block_works):
+                work += added_work
+                self.block_tree.add(block, work)
+            self._reorganize(new_blocks)
+        
+        self._notify_tip_changed()
         return True
     
+    def _find_fork_point(self, hashes: List[Any]) -> int:
+        """
+        Find the height of the last block shared with a candidate chain.
+        Block hashes commit to all earlier blocks, so once the chains diverge
+        they never match again and the fork point can be binary searched.
+        
+        Args:
+            hashes: Claimed hash of each candidate block
+        
+        Returns:
+            Height of the last common block, or -1 if even the genesis differs
+        """
+        fork_point = -1
+        low, high = 0, min(len(hashes), len(self.chain)) - 1
+        while low <= high:
+            middle = (low + high) // 2
+            if hashes[middle] == self.chain[middle].hash:
+                fork_point = middle
+                low = middle + 1
+            else:
+                high = middle - 1
+        return fork_point
+    
     def _is_valid_block(self, block: Block) -> bool:
         """
         Check if a block is valid.
         
         Args:
             block: Block to validate
-            
+        
         Returns:
             True if block is valid, False otherwise
         """
@@ -154,15 +799,8 @@ class Blockchain:
         if block.previous_hash != self.get_latest_block().hash:
             return False
         
-        # Check block hash
-        if block.hash != block.calculate_hash():
-            return False
-        
-        # Check proof of work
-        if block.hash[:self.difficulty] != "0" * self.difficulty:
-            return False
-        
-        return True
+        # Check block hash, proof of work and signatures
+        return check_block(block, self.difficulty) is None
     
     def _is_valid_chain(self, chain: List[Block]) -> bool:
         """
@@ -170,36 +808,57 @@ class Blockchain:
         
         Args:
             chain: Chain to validate
-            
+        
         Returns:
             True if chain is valid, False otherwise
         """
-        # Check genesis block
-        if chain[0].index != 0 or chain[0].previous_hash != "0" * 64:
-            return False
+        return self._is_valid_segment(chain, None)
+    
+    def _is_valid_segment(self, blocks: List[Block], parent: Optional[Block]) -> bool:
+        """
+        Check if a run of consecutive blocks is valid on top of a parent block.
         
-        # Check each block
-        for i in range(1, len(chain)):
-            current = chain[i]
-            previous = chain[i-1]
-            
-            # Check block index
-            if current.index != i:
-                return False
-            
-            # Check previous hash
-            if current.previous_hash != previous.hash:
-                return False
-            
-            # Check block hash
-            if current.hash != current.calculate_hash():
-                return False
-            
-            # Check proof of work
-            if current.hash[:self.difficulty] != "0" * self.difficulty:
-                return False
+        Args:
+            blocks: Blocks to validate, in order
+            parent: Block the segment builds on, or None if the segment starts
+                with the genesis block
         
-        return True
+        Returns:
+            True if the segment is valid, False otherwise
+        """
+        return self.validator.validate(blocks, parent, self.difficulty).valid
+    
+    def validate(self, progress: Optional[Callable[[int, int], None]] = None) -> ValidationReport:
+        """
+        Validate the whole local chain, e.g. after loading it at start-up.
+        
+        Args:
+            progress: Optional callback invoked with (blocks checked, total)
+        
+        Returns:
+            ValidationReport: Result with throughput statistics
+        """
+        validator = ChainValidator(
+            self.validator.workers, self.validator.chunk_size, progress, self.validator.checkpoints
+        )
+        if not isinstance(self.chain, ChainWindow):
+            return validator.validate(list(self.chain), None, self.difficulty)
+        
+        # Validate a windowed chain one window at a time so it never has to
+        # be in memory all at once
+        validator.progress = None
+        started = time.perf_counter()
+        parent = None
+        step = self.chain.window_size
+        for start in range(0, len(self.chain), step):
+            segment = self.chain[start:start + step]
+            report = validator.validate(segment, parent, self.difficulty)
+            if not report.valid:
+                return report
+            parent = segment[-1]
+            if progress:
+                progress(start + len(segment), len(self.chain))
+        return ValidationReport(True, len(self.chain), time.perf_counter() - started)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert blockchain to dictionary."""
@@ -211,11 +870,50 @@ class Blockchain:
             'difficulty_adjustment_interval': self.difficulty_adjustment_interval
         }
     
+    def to_json(self) -> str:
+        """
+        Serialize the blockchain to JSON, reusing each block's cached JSON.
+        
+        Returns:
+            str: JSON document with the same content as to_dict
+        """
+        return ''.join(self.iter_json())
+    
+    def iter_json(self, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+        """
+        Serialize a range of the chain to JSON piece by piece, one cached block
+        at a time, so a large range never has to be built in memory.
+        
+        Args:
+            start: Height of the first block
+            stop: Height after the last block (defaults to the chain length)
+        
+        Yields:
+            str: Consecutive pieces of a document shaped like to_json
+        """
+        settings = json.dumps({
+            'difficulty': self.difficulty,
+            'mining_reward': self.mining_reward,
+            'block_time': self.block_time,
+            'difficulty_adjustment_interval': self.difficulty_adjustment_interval
+        }, sort_keys=True)
+        stop = len(self.chain) if stop is None else min(stop, len(self.chain))
+        
+        yield '{"chain": ['
+        for height in range(start, stop):
+            try:
+                block = self.chain[height]
+            except IndexError:
+                break  # The chain got shorter during a reorganization
+            yield (', ' if height > start else '') + block.to_json()
+        yield '], ' + settings[1:]
+    
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Blockchain':
         """Create a blockchain from dictionary data."""
         blockchain = cls(difficulty=data['difficulty'])
         blockchain.chain = [Block.from_dict(block_data) for block_data in data['chain']]
+        blockchain._rebuild_indexes()
         blockchain.mining_reward = data['mining_reward']
         blockchain.block_time = data['block_time']
         blockchain.difficulty_adjustment_interval = data['difficulty_adjustment_interval']
@@ -0,0 +1,224 @@
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+from .block import Block
+from ..config import TXID_FILTER_CAPACITY, TXID_FILTER_ERROR_RATE, TXID_FILTER_SEGMENT
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over hex SHA-256 digests such as txids.
+    The digests are already uniformly distributed, so the bit positions are
+    derived from the digest itself by double hashing instead of rehashing.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Initialize an empty filter.
+        
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False positive rate at full capacity
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+    
+    @property
+    def full(self) -> bool:
+        """Whether the filter holds as many items as it is sized for."""
+        return self.count >= self.capacity
+    
+    def _positions(self, digest: str) -> List[int]:
+        """Bit positions of a digest."""
+        raw = bytes.fromhex(digest)
+        first = int.from_bytes(raw[:8], 'big')
+        second = int.from_bytes(raw[8:16], 'big') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+    
+    def add(self, digest: str) -> None:
+        """
+        Add a digest.
+        
+        Args:
+            digest: Hex digest to add
+        """
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, digest: str) -> bool:
+        """Whether a digest may have been added (False means it definitely was not)."""
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the filter to a dictionary."""
+        return {
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'count': self.count,
+            'bits': self.bits.hex()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'BloomFilter':
+        """Create a filter from dictionary data."""
+        bloom = cls(data['capacity'], data['error_rate'])
+        bloom.bits = bytearray.fromhex(data['bits'])
+        bloom.count = data['count']
+        return bloom
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows with its contents: when the current filter is
+    full a new one is added with `growth` times the capacity and
+    `tightening` times the error rate, which keeps the combined false
+    positive rate below the target however many items are added.
+    """
+    
+    def __init__(self, initial_capacity: int = TXID_FILTER_CAPACITY,
+                 error_rate: float = TXID_FILTER_ERROR_RATE,
+                 growth: int = 2, tightening: float = 0.5):
+        """
+        Initialize an empty filter.
+        
+        Args:
+            initial_capacity: Capacity of the first filter
+            error_rate: Target false positive rate
+            growth: Capacity factor between consecutive filters
+            tightening: Error rate factor between consecutive filters
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+    
+    def __len__(self) -> int:
+        """Number of items added."""
+        return sum(bloom.count for bloom in self.filters)
+    
+    def add(self, digest: str) -> None:
+        """
+        Add a digest, starting a larger filter if the current one is full.
+        
+        Args:
+            digest: Hex digest to add
+        """
+        if not self.filters or self.filters[-1].full:
+            n = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity * self.growth ** n,
+                self.error_rate * (1 - self.tightening) * self.tightening ** n
+            ))
+        self.filters[-1].add(digest)
+    
+    def __contains__(self, digest: str) -> bool:
+        """Whether a digest may have been added (False means it definitely was not)."""
+        return any(digest in bloom for bloom in self.filters)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the filter to a dictionary."""
+        return {
+            'initial_capacity': self.initial_capacity,
+            'error_rate': self.error_rate,
+            'growth': self.growth,
+            'tightening': self.tightening,
+            'filters': [bloom.to_dict() for bloom in self.filters]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScalableBloomFilter':
+        """Create a filter from dictionary data."""
+        scalable = cls(data['initial_capacity'], data['error_rate'], data['growth'], data['tightening'])
+        scalable.filters = [BloomFilter.from_dict(bloom) for bloom in data['filters']]
+        return scalable
+
+class ConfirmedTxFilter:
+    """
+    Rolling Bloom filter of the txids on the main chain, used to reject
+    replays of confirmed transactions without an exact index of every txid.
+    
+    The chain is split into segments of a fixed number of heights, each with
+    its own scalable filter. Connecting a block adds to the last segment;
+    disconnecting the tip rebuilds only the segment it was in, since Bloom
+    filters cannot forget items.
+    """
+    
+    def __init__(self, segment_blocks: int = TXID_FILTER_SEGMENT,
+                 capacity: int = TXID_FILTER_CAPACITY, error_rate: float = TXID_FILTER_ERROR_RATE):
+        """
+        Initialize an empty filter.
+        
+        Args:
+            segment_blocks: Number of heights per segment
+            capacity: Initial capacity of each segment's filter
+            error_rate: Target false positive rate of each segment
+        """
+        self.segment_blocks = segment_blocks
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.segments: List[Tuple[int, ScalableBloomFilter]] = []  # (first height, filter), oldest first
+        self.height = -1  # Height of the last block added
+    
+    def add_block(self, block: Block) -> None:
+        """
+        Add the txids of a block that extends the main chain.
+        
+        Args:
+            block: Block appended to the main chain
+        """
+        start = block.index - block.index % self.segment_blocks
+        if not self.segments or self.segments[-1][0] != start:
+            self.segments.append((start, ScalableBloomFilter(self.capacity, self.error_rate)))
+        segment = self.segments[-1][1]
+        for transaction in block.transactions:
+            segment.add(transaction.txid)
+        self.height = block.index
+    
+    def remove_block(self, block: Block, chain: Sequence[Block]) -> None:
+        """
+        Remove the tip block by rebuilding its segment from the chain.
+        
+        Args:
+            block: Block removed from the main chain
+            chain: Main chain after the block was removed
+        """
+        if block.index != self.height:
+            return
+        start = block.index - block.index % self.segment_blocks
+        if self.segments and self.segments[-1][0] == start:
+            self.segments.pop()
+        self.height = start - 1
+        for remaining in chain[start:block.index]:
+            self.add_block(remaining)
+    
+    def __contains__(self, txid: str) -> bool:
+        """Whether a txid may be confirmed (False means it definitely is not)."""
+        return any(txid in segment for _, segment in reversed(self.segments))
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.segments = []
+        self.height = -1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the filter to a dictionary."""
+        return {
+            'height': self.height,
+            'segment_blocks': self.segment_blocks,
+            'capacity': self.capacity,
+            'error_rate': self.error_rate,
+            'segments': [[start, segment.to_dict()] for start, segment in self.segments]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConfirmedTxFilter':
+        """Create a filter from dictionary data."""
+        confirmed = cls(data['segment_blocks'], data['capacity'], data['error_rate'])
+        confirmed.segments = [
+            (start, ScalableBloomFilter.from_dict(segment)) for start, segment in data['segments']
+        ]
+        confirmed.height = data['height']
+        return confirmed 
\ No newline at end of file
@@ -0,0 +1,168 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Iterator, List, Union
+from .block import Block
+from ..config import CHAIN_WINDOW_SIZE, BLOCK_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+class ChainStorageError(Exception):
+    """Raised when a block cannot be written to the store."""
+    pass
+
+class ChainWindow:
+    """
+    List-like view of the main chain that keeps only the most recent blocks
+    in memory. Every block is written to the store when appended; older
+    blocks are read back on demand through a small LRU cache. Supports the
+    list operations the blockchain uses: len, indexing, slicing, iteration,
+    append, pop and truncation with del chain[height:].
+    
+    The window is thread-safe, so API threads can read blocks without the
+    blockchain lock while blocks are appended. Old blocks are loaded from
+    the store without holding the lock.
+    """
+    
+    def __init__(self, store: Any, window_size: int = CHAIN_WINDOW_SIZE,
+                 cache_size: int = BLOCK_CACHE_SIZE):
+        """
+        Open a window over the blocks already in the store.
+        
+        Args:
+            store: Block storage with load_block, save_block, get_block_count
+                and delete_blocks_from (e.g. utils.storage.Storage)
+            window_size: Number of recent blocks kept in memory
+            cache_size: Number of older blocks cached after being loaded
+        """
+        self.store = store
+        self.window_size = window_size
+        self.cache_size = cache_size
+        self._length = store.get_block_count()
+        self._offset = max(0, self._length - window_size)  # Height of the first resident block
+        self._resident: List[Block] = [self._load(height) for height in range(self._offset, self._length)]
+        self._cache: 'OrderedDict[int, Block]' = OrderedDict()
+        self._truncations = 0  # Bumped on truncation, so a block loaded meanwhile is not cached
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        """Number of blocks in the chain."""
+        return self._length
+    
+    def __getitem__(self, key: Union[int, slice]) -> Union[Block, List[Block]]:
+        """
+        Get a block by height, or a list of blocks for a slice.
+        
+        Raises:
+            IndexError: If the height is out of range
+        """
+        if isinstance(key, slice):
+            with self._lock:
+                return [self[height] for height in range(*key.indices(self._length))]
+        
+        with self._lock:
+            height = key + self._length if key < 0 else key
+            if not 0 <= height < self._length:
+                raise IndexError("chain index out of range")
+            if height >= self._offset:
+                return self._resident[height - self._offset]
+            
+            block = self._cache.get(height)
+            if block is not None:
+                self._cache.move_to_end(height)
+                return block
+            truncations = self._truncations
+        
+        block = self._load(height)
+        with self._lock:
+            if self._truncations == truncations:
+                self._cache[height] = block
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return block
+    
+    def __iter__(self) -> Iterator[Block]:
+        """Iterate over the chain from genesis, loading old blocks as needed."""
+        for height in range(self._length):
+            yield self[height]
+    
+    def __delitem__(self, key: slice) -> None:
+        """
+        Truncate the chain with del chain[height:].
+        
+        Raises:
+            TypeError: For anything other than a slice to the end
+        """
+        if not isinstance(key, slice) or key.stop is not None or key.step is not None:
+            raise TypeError("ChainWindow only supports deleting a suffix")
+        self.truncate(key.indices(self._length)[0])
+    
+    def append(self, block: Block) -> None:
+        """
+        Add a block at the tip and persist it.
+        
+        Args:
+            block: Block that extends the chain
+        
+        Raises:
+            ChainStorageError: If the store does not accept the block, which
+                would otherwise be lost once evicted from the window
+        """
+        if not self.store.save_block(block.to_dict()):
+            raise ChainStorageError(f"Block {block.index} could not be stored")
+        
+        # Readers hold the lock too, so they never see the resident blocks
+        # and their offset disagree
+        with self._lock:
+            self._resident.append(block)
+            self._length += 1
+            
+            excess = len(self._resident) - self.window_size
+            if excess > 0:
+                del self._resident[:excess]
+                self._offset += excess
+    
+    def pop(self) -> Block:
+        """
+        Remove and return the tip.
+        
+        Returns:
+            Block: The removed block
+        """
+        with self._lock:
+            block = self[-1]
+            self.truncate(self._length - 1)
+            return block
+    
+    def truncate(self, height: int) -> None:
+        """
+        Remove every block at and above a height, in memory and in the store.
+        
+        Args:
+            height: New chain length
+        """
+        with self._lock:
+            if height >= self._length:
+                return
+            self.store.delete_blocks_from(height)
+            if height <= self._offset:
+                self._resident = []
+                self._offset = height
+            else:
+                del self._resident[height - self._offset:]
+            for cached in [h for h in self._cache if h >= height]:
+                del self._cache[cached]
+            self._length = height
+            self._truncations += 1
+    
+    def _load(self, height: int) -> Block:
+        """
+        Load a block from the store.
+        
+        Raises:
+            IndexError: If the store does not have the block
+        """
+        data = self.store.load_block(height)
+        if data is None:
+            raise IndexError(f"Block {height} not found in storage")
+        return Block.from_dict(data) 
\ No newline at end of file
@@ -0,0 +1,109 @@
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from .block import Block
+from ..config import HISTORY_WINDOW
+
+# Position of a transaction in the chain: (block height, index in the block)
+TxLocation = Tuple[int, int]
+
+class AddressHistory:
+    """
+    Locations of the transactions involving each address, for the most
+    recent blocks of the main chain. Older history is served from the
+    database; nodes without one index the whole chain.
+    """
+    
+    def __init__(self, window: Optional[int] = HISTORY_WINDOW):
+        """
+        Initialize an empty history index.
+        
+        Args:
+            window: Number of recent blocks to index, None to index every block
+        """
+        self.window = window
+        self.locations: Dict[str, List[TxLocation]] = {}
+        self._blocks: deque = deque()  # (height, addresses touched), oldest first
+    
+    @property
+    def min_height(self) -> Optional[int]:
+        """Lowest indexed height, None if the index is empty."""
+        return self._blocks[0][0] if self._blocks else None
+    
+    def indexed_from(self, length: int) -> int:
+        """
+        Lowest height the index keeps for a chain of the given length.
+        
+        Args:
+            length: Number of blocks in the main chain
+        
+        Returns:
+            int: Height of the oldest block within the window
+        """
+        return 0 if self.window is None else max(0, length - self.window)
+    
+    def add_block(self, block: Block) -> None:
+        """
+        Index the transactions of a block that extends the main chain.
+        
+        Args:
+            block: Block appended to the main chain
+        """
+        touched = set()
+        for position, transaction in enumerate(block.transactions):
+            for address in {transaction.sender_address, transaction.recipient}:
+                self.locations.setdefault(address, []).append((block.index, position))
+                touched.add(address)
+        self._blocks.append((block.index, touched))
+        
+        while self.window is not None and len(self._blocks) > self.window:
+            self._drop_oldest()
+    
+    def remove_block(self, block: Block) -> None:
+        """
+        Unindex the tip block when it is disconnected.
+        
+        Args:
+            block: Block removed from the main chain
+        """
+        if not self._blocks or self._blocks[-1][0] != block.index:
+            return
+        _, touched = self._blocks.pop()
+        for address in touched:
+            entries = self.locations[address]
+            while entries and entries[-1][0] == block.index:
+                entries.pop()
+            if not entries:
+                del self.locations[address]
+    
+    def get_locations(self, address: str, before: Optional[TxLocation] = None,
+                      limit: int = 50) -> List[TxLocation]:
+        """
+        Get the locations of an address's transactions, newest first.
+        
+        Args:
+            address: Address to look up
+            before: Only return locations strictly before this one
+            limit: Maximum number of locations
+        
+        Returns:
+            List[TxLocation]: Matching locations
+        """
+        entries = self.locations.get(address, [])
+        end = bisect_left(entries, before) if before is not None else len(entries)
+        return entries[max(0, end - limit):end][::-1]
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.locations.clear()
+        self._blocks.clear()
+    
+    def _drop_oldest(self) -> None:
+        """Forget the oldest indexed block."""
+        height, touched = self._blocks.popleft()
+        for address in touched:
+            entries = self.locations[address]
+            end = bisect_left(entries, (height + 1, 0))
+            del entries[:end]
+            if not entries:
+                del self.locations[address] 
\ No newline at end of file
@@ -0,0 +1,102 @@
+import hashlib
+from typing import List, Dict
+
+EMPTY_ROOT = '0' * 64
+
+def hash_pair(left: str, right: str) -> str:
+    """
+    Hash two child nodes into their parent node.
+    
+    Args:
+        left: Hex hash of the left child
+        right: Hex hash of the right child
+    
+    Returns:
+        str: Hex hash of the parent node
+    """
+    return hashlib.sha256(bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+class MerkleTree:
+    """
+    Binary Merkle tree over transaction hashes.
+    Every level of the tree is kept so inclusion proofs can be read off
+    without rehashing. A level with an odd number of nodes pairs its last
+    node with itself.
+    """
+    
+    def __init__(self, leaves: List[str]):
+        """
+        Build the tree.
+        
+        Args:
+            leaves: Hex hashes of the transactions, in block order
+        """
+        self.leaves = list(leaves)
+        self.levels: List[List[str]] = [self.leaves]
+        
+        level = self.leaves
+        while len(level) > 1:
+            if len(level) % 2:
+                # Repeated trailing leaves give the same root, which is why
+                # check_block rejects blocks with duplicate transactions
+                level = level + [level[-1]]
+            level = [hash_pair(level[i], level[i + 1]) for i in range(0, len(level), 2)]
+            self.levels.append(level)
+    
+    @property
+    def root(self) -> str:
+        """Root hash of the tree (all zeros for an empty tree)."""
+        if not self.leaves:
+            return EMPTY_ROOT
+        return self.levels[-1][0]
+    
+    def get_proof(self, index: int) -> List[Dict[str, str]]:
+        """
+        Get the inclusion proof for a leaf.
+        
+        Args:
+            index: Position of the leaf
+        
+        Returns:
+            List[Dict[str, str]]: Sibling hashes from the leaf up to the root,
+            each with the side ('left' or 'right') it sits on
+        
+        Raises:
+            IndexError: If the leaf does not exist
+        """
+        if not 0 <= index < len(self.leaves):
+            raise IndexError(f"Leaf {index} not in tree")
+        
+        proof = []
+        for level in self.levels[:-1]:
+            if index % 2:
+                proof.append({'hash': level[index - 1], 'position': 'left'})
+            else:
+                sibling = level[index + 1] if index + 1 < len(level) else level[index]
+                proof.append({'hash': sibling, 'position': 'right'})
+            index //= 2
+        return proof
+    
+    @staticmethod
+    def verify_proof(leaf: str, proof: List[Dict[str, str]], root: str) -> bool:
+        """
+        Check an inclusion proof against a root.
+        
+        Args:
+            leaf: Hex hash of the transaction
+            proof: Proof as returned by get_proof
+            root: Expected Merkle root
+        
+        Returns:
+            bool: True if the proof links the leaf to the root
+        """
+        node = leaf
+        try:
+            for step in proof:
+                if step['position'] == 'left':
+                    node = hash_pair(step['hash'], node)
+                else:
+                    node = hash_pair(node, step['hash'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        return node == root 
\ No newline at end of file
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import multiprocessing
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from .block import Block
+from ..config import POOL_START_METHOD
+
+logger = logging.getLogger(__name__)
+
+# Set in every worker process by the pool initializer
+_stop_event = None
+
+def _init_worker(stop_event: Any) -> None:
+    """Store the shared stop event in the worker process."""
+    global _stop_event
+    _stop_event = stop_event
+
+def _search_nonces(args: Tuple[bytes, int, int, int, int]) -> 'WorkerStats':
+    """
+    Search the nonces start, start + step, start + 2 * step, ... until a valid
+    hash is found or another worker raises the stop event.
+    
+    Args:
+        args: Tuple of (header prefix, difficulty, start nonce, step, check interval)
+    
+    Returns:
+        WorkerStats: Search statistics, including the winning nonce if found
+    """
+    header_prefix, difficulty, start, step, check_interval = args
+    midstate = hashlib.sha256(header_prefix)
+    pack_nonce = Block.NONCE_STRUCT.pack
+    target = '0' * difficulty
+    nonce = start
+    hashes = 0
+    started = time.perf_counter()
+    
+    while not _stop_event.is_set():
+        for _ in range(check_interval):
+            attempt = midstate.copy()
+            attempt.update(pack_nonce(nonce))
+            block_hash = attempt.hexdigest()
+            hashes += 1
+            if block_hash[:difficulty] == target:
+                _stop_event.set()
+                return WorkerStats(start, hashes, time.perf_counter() - started, nonce, block_hash)
+            nonce += step
+    
+    return WorkerStats(start, hashes, time.perf_counter() - started)
+
+class WorkerStats:
+    """Hashing statistics reported by a single mining worker."""
+    
+    def __init__(self, worker_id: int, hashes: int, elapsed: float,
+                 nonce: Optional[int] = None, hash: Optional[str] = None):
+        """
+        Initialize worker statistics.
+        
+        Args:
+            worker_id: Index of the worker (also its first nonce)
+            hashes: Number of hashes computed
+            elapsed: Seconds spent searching
+            nonce: Winning nonce, if this worker found one
+            hash: Winning hash, if this worker found one
+        """
+        self.worker_id = worker_id
+        self.hashes = hashes
+        self.elapsed = elapsed
+        self.nonce = nonce
+        self.hash = hash
+    
+    @property
+    def found(self) -> bool:
+        """Whether this worker found a valid nonce."""
+        return self.nonce is not None
+    
+    @property
+    def hashes_per_second(self) -> float:
+        """Hash rate of this worker."""
+        return self.hashes / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a dictionary."""
+        return {
+            'worker_id': self.worker_id,
+            'hashes': self.hashes,
+            'elapsed': self.elapsed,
+            'hashes_per_second': self.hashes_per_second,
+            'found': self.found
+        }
+
+class MiningResult:
+    """Outcome of a parallel nonce search."""
+    
+    def __init__(self, nonce: int, hash: str, workers: List[WorkerStats], elapsed: float):
+        """
+        Initialize a mining result.
+        
+        Args:
+            nonce: Winning nonce
+            hash: Block hash for the winning nonce
+            workers: Statistics reported by every worker
+            elapsed: Wall-clock seconds for the whole search
+        """
+        self.nonce = nonce
+        self.hash = hash
+        self.workers = workers
+        self.elapsed = elapsed
+    
+    @property
+    def total_hashes(self) -> int:
+        """Number of hashes computed by all workers."""
+        return sum(worker.hashes for worker in self.workers)
+    
+    @property
+    def hashes_per_second(self) -> float:
+        """Combined hash rate of all workers."""
+        return self.total_hashes / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to a dictionary."""
+        return {
+            'nonce': self.nonce,
+            'hash': self.hash,
+            'elapsed': self.elapsed,
+            'total_hashes': self.total_hashes,
+            'hashes_per_second': self.hashes_per_second,
+            'workers': [worker.to_dict() for worker in self.workers]
+        }
+
+class ParallelMiner:
+    """
+    Proof-of-work miner that splits the nonce space across a process pool.
+    Worker i tries nonces i, i + n, i + 2n, ... so the workers never overlap,
+    and all of them stop as soon as one finds a valid hash.
+    """
+    
+    def __init__(self, workers: int = None, check_interval: int = 1000):
+        """
+        Initialize the miner.
+        
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            check_interval: Nonces tried between checks of the stop event
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.check_interval = check_interval
+    
+    def mine(self, block: Block, difficulty: int, cancel_event: Any = None) -> Optional[MiningResult]:
+        """
+        Find a nonce for the block that satisfies the difficulty.
+        The difficulty is recorded in the block header, but the nonce and hash
+        are left for the caller to apply.
+        
+        Args:
+            block: Block to mine
+            difficulty: Number of leading zeros required in the hash
+            cancel_event: Optional event that aborts the search when set
+        
+        Returns:
+            Optional[MiningResult]: Winning nonce and hash with per-worker
+            statistics, or None if the search was cancelled
+        """
+        block.difficulty = difficulty
+        header_prefix = block.header_prefix()
+        context = multiprocessing.get_context(POOL_START_METHOD)
+        stop_event = context.Event()
+        tasks = [
+            (header_prefix, difficulty, worker_id, self.workers, self.check_interval)
+            for worker_id in range(self.workers)
+        ]
+        
+        started = time.perf_counter()
+        with context.Pool(self.workers, initializer=_init_worker, initargs=(stop_event,)) as pool:
+            # Workers only return once the stop event is set, so waiting for
+            # every report also waits for the losers to wind down
+            pending = pool.map_async(_search_nonces, tasks)
+            while not pending.ready():
+                if cancel_event is not None and cancel_event.is_set():
+                    stop_event.set()
+                pending.wait(0.05)
+            reports = pending.get()
+        elapsed = time.perf_counter() - started
+        
+        winner = next((report for report in reports if report.found), None)
+        if winner is None:
+            logger.info(f"Mining of block {block.index} cancelled after {elapsed:.2f}s")
+            return None
+        reports.sort(key=lambda report: report.worker_id)
+        result = MiningResult(winner.nonce, winner.hash, reports, elapsed)
+        
+        for report in reports:
+            logger.info(
+                f"Mining worker {report.worker_id}: {report.hashes} hashes "
+                f"in {report.elapsed:.2f}s ({report.hashes_per_second:.0f} H/s)"
+            )
+        logger.info(
+            f"Block {block.index} mined with nonce {result.nonce} by "
+            f"{self.workers} workers ({result.hashes_per_second:.0f} H/s total)"
+        )
+        return result 
\ No newline at end of file
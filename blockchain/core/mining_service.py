@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Optional
+from .block import Block
+from ..config import MINING_JOB_HISTORY
+
+logger = logging.getLogger(__name__)
+
+class MiningJob:
+    """A request to mine one block for a miner address."""
+    
+    QUEUED = 'queued'
+    MINING = 'mining'
+    COMPLETED = 'completed'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+    
+    FINISHED = (COMPLETED, CANCELLED, FAILED)
+    
+    def __init__(self, miner_address: str):
+        """
+        Initialize a new mining job.
+        
+        Args:
+            miner_address: Address that receives the mining reward
+        """
+        self.job_id = uuid.uuid4().hex
+        self.miner_address = miner_address
+        self.status = self.QUEUED
+        self.block: Optional[Block] = None
+        self.restarts = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancel_requested = False
+    
+    @property
+    def finished(self) -> bool:
+        """Whether the job has reached a final state."""
+        return self.status in self.FINISHED
+    
+    def _finish(self, status: str) -> None:
+        """Move the job to a final state."""
+        self.status = status
+        self.finished_at = time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the job to a dictionary."""
+        return {
+            'job_id': self.job_id,
+            'miner_address': self.miner_address,
+            'status': self.status,
+            'block': self.block.to_dict() if self.block else None,
+            'restarts': self.restarts,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class MiningService:
+    """
+    Mines blocks on a background thread so callers never wait for proof of work.
+    Jobs are processed one at a time. Whenever the chain tip changes, the
+    block being mined is abandoned and a new template is built on the new tip.
+    Only the most recent finished jobs are kept for polling.
+    """
+    
+    def __init__(self, blockchain: Any, job_history: int = MINING_JOB_HISTORY):
+        """
+        Initialize the mining service.
+        
+        Args:
+            blockchain: Blockchain the mined blocks are added to
+            job_history: Number of finished jobs kept before the oldest are
+                forgotten
+        """
+        self.blockchain = blockchain
+        self.job_history = job_history
+        self.jobs: Dict[str, MiningJob] = {}
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._interrupt = threading.Event()
+        self._current: Optional[MiningJob] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        blockchain.add_tip_listener(self._on_tip_changed)
+    
+    def start(self) -> None:
+        """Start the background mining thread if it is not running."""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='mining-service', daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background thread, abandoning the current job."""
+        with self._condition:
+            self._running = False
+            self._interrupt.set()
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+    
+    def submit(self, miner_address: str) -> MiningJob:
+        """
+        Queue a job to mine the next block.
+        
+        Args:
+            miner_address: Address that receives the mining reward
+        
+        Returns:
+            MiningJob: The queued job
+        """
+        job = MiningJob(miner_address)
+        with self._condition:
+            self._prune_jobs()
+            self.jobs[job.job_id] = job
+            self._queue.append(job)
+            self._condition.notify()
+        self.start()
+        return job
+    
+    def get_job(self, job_id: str) -> Optional[MiningJob]:
+        """
+        Look up a job.
+        
+        Args:
+            job_id: ID of the job
+        
+        Returns:
+            Optional[MiningJob]: The job if it exists
+        """
+        return self.jobs.get(job_id)
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+        
+        Args:
+            job_id: ID of the job
+        
+        Returns:
+            bool: True if the job was cancelled, False if it does not exist
+            or has already finished
+        """
+        with self._condition:
+            job = self.jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            
+            job.cancel_requested = True
+            if job is self._current:
+                self._interrupt.set()
+            else:
+                self._queue.remove(job)
+                job._finish(MiningJob.CANCELLED)
+            return True
+    
+    def _prune_jobs(self) -> None:
+        """Forget the oldest finished jobs beyond the history limit."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.job_history, 0)]:
+            del self.jobs[job_id]
+    
+    def _on_tip_changed(self, tip: Block) -> None:
+        """Abandon the current template when a new block arrives."""
+        self._interrupt.set()
+    
+    def _run(self) -> None:
+        """Process queued jobs until the service is stopped."""
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                job = self._queue.popleft()
+                self._current = job
+            
+            try:
+                self._mine(job)
+            except Exception as e:
+                logger.error(f"Mining job {job.job_id} failed: {e}")
+                job.error = str(e)
+                job._finish(MiningJob.FAILED)
+            finally:
+                with self._condition:
+                    self._current = None
+    
+    def _mine(self, job: MiningJob) -> None:
+        """
+        Mine a block for a job, restarting on a fresh template whenever the
+        tip moves before the block could be added. The job fails if the chain
+        rejects a block that still extends the tip, since mining the same
+        template again would be rejected too.
+        
+        Args:
+            job: Job to process
+        """
+        job.status = MiningJob.MINING
+        job.started_at = time.time()
+        
+        while True:
+            self._interrupt.clear()
+            if job.cancel_requested or not self._running:
+                job._finish(MiningJob.CANCELLED)
+                return
+            
+            template = self.blockchain.create_block_template(job.miner_address)
+            if self.blockchain.solve_block(template, self._interrupt):
+                if self.blockchain.add_mined_block(template):
+                    job.block = template
+                    job._finish(MiningJob.COMPLETED)
+                    logger.info(f"Mining job {job.job_id} produced block {template.index}")
+                    return
+                
+                if self.blockchain.get_latest_block().hash == template.previous_hash:
+                    job.error = 'Mined block was rejected by the chain'
+                    job._finish(MiningJob.FAILED)
+                    logger.error(f"Mining job {job.job_id} failed: block {template.index} was rejected")
+                    return
+            
+            if not job.cancel_requested:
+                job.restarts += 1
+                logger.info(f"Mining job {job.job_id} restarting on new tip") 
\ No newline at end of file
@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from .block import Block
+
+class AccountState:
+    """
+    Confirmed balance of every address, updated block by block as the chain
+    grows. Applying a block records the previous balances of the addresses
+    it touches, so recent blocks can be rolled back during a reorganization.
+    """
+    
+    def __init__(self):
+        """Initialize an empty state."""
+        self.balances: Dict[str, float] = {}
+        self._undo: deque = deque()  # (block hash, height, previous balances), oldest first
+    
+    @property
+    def undo_depth(self) -> int:
+        """Number of blocks that can be rolled back."""
+        return len(self._undo)
+    
+    def get_balance(self, address: str) -> float:
+        """
+        Get the confirmed balance of an address.
+        
+        Args:
+            address: Address to look up
+        
+        Returns:
+            float: Balance, 0.0 for unknown addresses
+        """
+        return self.balances.get(address, 0.0)
+    
+    def apply_block(self, block: Block) -> None:
+        """
+        Apply the transfers in a block on top of the current state.
+        
+        Args:
+            block: Block that extends the last applied block
+        """
+        previous: Dict[str, Optional[float]] = {}
+        for address, delta in self._deltas(block):
+            if address not in previous:
+                previous[address] = self.balances.get(address)
+            self.balances[address] = self.balances.get(address, 0.0) + delta
+        self._undo.append((block.hash, block.index, previous))
+    
+    def revert_block(self, block: Block) -> None:
+        """
+        Roll back the last applied block.
+        
+        Args:
+            block: Block to roll back
+        
+        Raises:
+            ValueError: If the block is not the last one applied or its undo
+                data has been pruned
+        """
+        if not self._undo or self._undo[-1][0] != block.hash:
+            raise ValueError(f"No undo data for block {block.index}")
+        
+        _, _, previous = self._undo.pop()
+        for address, balance in previous.items():
+            if balance is None:
+                del self.balances[address]
+            else:
+                self.balances[address] = balance
+    
+    def prune(self, min_height: int) -> None:
+        """
+        Drop undo data for blocks below a height.
+        
+        Args:
+            min_height: Lowest height that can still be rolled back
+        """
+        while self._undo and self._undo[0][1] < min_height:
+            self._undo.popleft()
+    
+    def clear(self) -> None:
+        """Remove all balances and undo data."""
+        self.balances.clear()
+        self._undo.clear()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the state, including its undo data, to a dictionary."""
+        return {
+            'balances': self.balances,
+            'undo': [[block_hash, height, previous] for block_hash, height, previous in self._undo]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AccountState':
+        """Create a state from dictionary data."""
+        state = cls()
+        state.balances = dict(data['balances'])
+        state._undo = deque(
+            (block_hash, height, previous) for block_hash, height, previous in data['undo']
+        )
+        return state
+    
+    @staticmethod
+    def _deltas(block: Block) -> List[Tuple[str, float]]:
+        """Balance changes made by a block, as (address, delta) pairs."""
+        deltas = []
+        for transaction in block.transactions:
+            # Fees leave the sender here and reach the miner through the reward
+            if transaction.sender != "system":
+                deltas.append((transaction.sender_address, -(transaction.amount + transaction.fee)))
+            deltas.append((transaction.recipient, transaction.amount))
+        return deltas 
\ No newline at end of file
@@ -1,17 +1,47 @@
+import sys
 import time
-from typing import Dict, Any, Optional
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
-import json
+import struct
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+from ..crypto.backends import backend_for_key, load_public_key
+from ..crypto.cache import signature_cache, import_public_key
+
+def _intern(value: Any) -> Any:
+    """Intern strings so equal addresses share one object."""
+    return sys.intern(value) if type(value) is str else value
 
 class Transaction:
     """
     Represents a single transaction in the blockchain.
     Handles transaction creation, validation, and signing.
+    
+    Transactions are signed, hashed, stored and sent to peers in a canonical
+    binary encoding: a version byte, the length-prefixed UTF-8 sender and
+    recipient, the amount, fee and timestamp as big-endian doubles and the
+    length-prefixed raw signature (empty when unsigned). The signature
+    covers the encoding without the signature field, and the transaction id
+    is the SHA-256 of the full encoding. JSON is only used at the API edge.
+    
+    Instances are slotted, signatures are held as raw bytes, and the sender
+    and recipient strings are interned, so the transactions of one sender
+    share a single copy of its public key instead of each carrying its own.
+    Transactions are frozen when the block holding them is sealed, after
+    which their encoded fields can no longer be assigned.
     """
     
-    def __init__(self, sender: str, recipient: str, amount: float, timestamp: Optional[float] = None):
+    __slots__ = ('sender', 'recipient', 'amount', 'fee', 'timestamp', '_signature', '_txid', '_frozen')
+    
+    ENCODING_VERSION = 2
+    
+    LENGTH_STRUCT = struct.Struct('>I')
+    VALUES_STRUCT = struct.Struct('>ddd')  # Amount, fee, timestamp
+    
+    # Fields covered by the encoding; assigning one drops the cached txid and
+    # is rejected once the transaction is frozen
+    ENCODED_FIELDS = frozenset({'sender', 'recipient', 'amount', 'fee', 'timestamp', 'signature'})
+    
+    def __init__(self, sender: str, recipient: str, amount: float, timestamp: Optional[float] = None,
+                 fee: float = 0.0):
         """
         Initialize a new transaction.
         
@@ -20,27 +50,168 @@ class Transaction:
             recipient: Recipient's public address
             amount: Amount to transfer
             timestamp: Optional timestamp (defaults to current time)
+            fee: Fee paid to the miner that includes the transaction
         """
-        self.sender = sender
-        self.recipient = recipient
+        self.sender = _intern(sender)
+        self.recipient = _intern(recipient)
         self.amount = amount
+        self.fee = fee
         self.timestamp = timestamp or time.time()
         self.signature = None
+        self._frozen = False
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Drop the cached txid when an encoded field changes."""
+        if name in self.ENCODED_FIELDS:
+            if getattr(self, '_frozen', False):
+                raise AttributeError(f"Cannot modify '{name}' of frozen transaction")
+            super().__setattr__('_txid', None)
+        super().__setattr__(name, value)
+    
+    @property
+    def frozen(self) -> bool:
+        """Whether the transaction is frozen."""
+        return self._frozen
+    
+    def freeze(self) -> 'Transaction':
+        """
+        Make the transaction's encoded fields read-only, so a sealed block's
+        cached hash and Merkle tree cannot go stale.
+        
+        Returns:
+            Transaction: The transaction itself
+        """
+        self._frozen = True
+        return self
     
-    def sign(self, private_key: RSA.RsaKey) -> None:
+    @property
+    def signature(self) -> Optional[str]:
+        """Hex-encoded signature, None if unsigned."""
+        value = self._signature
+        return value.hex() if type(value) is bytes else value
+    
+    @signature.setter
+    def signature(self, value: Optional[str]) -> None:
+        # Canonical hex is stored as bytes, at half the size; anything else is
+        # kept as given so that it round-trips and fails verification
+        if type(value) is str:
+            try:
+                raw = bytes.fromhex(value)
+            except ValueError:
+                raw = None
+            if raw is not None and raw.hex() == value:
+                value = raw
+        self._signature = value
+    
+    def _signature_bytes(self) -> bytes:
         """
-        Sign the transaction with a private key.
+        Raw signature bytes, empty if unsigned.
+        
+        Raises:
+            ValueError: If the signature is not hex
+        """
+        value = self._signature
+        if type(value) is bytes:
+            return value
+        return bytes.fromhex(value) if value else b''
+    
+    def signing_bytes(self) -> bytes:
+        """
+        Serialize every field except the signature; this is what gets signed.
+        
+        Returns:
+            bytes: Canonical encoding without the signature
+        
+        Raises:
+            ValueError: If the amount or timestamp is not a number
+        """
+        sender = self.sender.encode()
+        recipient = self.recipient.encode()
+        try:
+            values = self.VALUES_STRUCT.pack(self.amount, self.fee, self.timestamp)
+        except struct.error as e:
+            raise ValueError(f"Invalid transaction value: {e}")
+        return b''.join((
+            bytes((self.ENCODING_VERSION,)),
+            self.LENGTH_STRUCT.pack(len(sender)), sender,
+            self.LENGTH_STRUCT.pack(len(recipient)), recipient,
+            values
+        ))
+    
+    def encode(self) -> bytes:
+        """
+        Serialize the transaction, including its signature.
+        
+        Returns:
+            bytes: Canonical binary encoding
+        
+        Raises:
+            ValueError: If a field cannot be encoded (e.g. the signature is not hex)
+        """
+        signature = self._signature_bytes()
+        return b''.join((
+            self.signing_bytes(),
+            self.LENGTH_STRUCT.pack(len(signature)), signature
+        ))
+    
+    @classmethod
+    def decode(cls, data: bytes) -> 'Transaction':
+        """
+        Create a Transaction from its canonical binary encoding.
         
         Args:
-            private_key: Private key to sign with
+            data: Encoded transaction
+        
+        Returns:
+            Transaction: Decoded transaction
+        
+        Raises:
+            ValueError: If the data is not a valid encoding
         """
-        # Create a hash of the transaction data
-        transaction_hash = SHA256.new(
-            json.dumps(self.to_dict(), sort_keys=True).encode()
-        )
+        view = memoryview(data)
+        offset = 0
+        
+        def read(size: int) -> bytes:
+            nonlocal offset
+            if offset + size > len(view):
+                raise ValueError("Encoded transaction is truncated")
+            chunk = bytes(view[offset:offset + size])
+            offset += size
+            return chunk
+        
+        def read_field() -> bytes:
+            return read(cls.LENGTH_STRUCT.unpack(read(cls.LENGTH_STRUCT.size))[0])
+        
+        if read(1)[0] != cls.ENCODING_VERSION:
+            raise ValueError("Unsupported transaction encoding version")
+        sender = read_field().decode()
+        recipient = read_field().decode()
+        amount, fee, timestamp = cls.VALUES_STRUCT.unpack(read(cls.VALUES_STRUCT.size))
+        signature = read_field()
+        if offset != len(view):
+            raise ValueError("Unexpected data after encoded transaction")
+        
+        transaction = cls(sender, recipient, amount, timestamp, fee)
+        transaction.signature = signature.hex() if signature else None
+        return transaction
+    
+    @property
+    def txid(self) -> str:
+        """Transaction id: SHA-256 of the canonical encoding, cached until a field changes."""
+        if self._txid is None:
+            self._txid = hashlib.sha256(self.encode()).hexdigest()
+        return self._txid
+    
+    def sign(self, private_key: Any) -> None:
+        """
+        Sign the transaction with the chain's signature scheme for the
+        private key's type.
         
-        # Sign the hash with the private key
-        self.signature = pkcs1_15.new(private_key).sign(transaction_hash).hex()
+        Args:
+            private_key: Private key to sign with
+        """
+        # Sign the canonical encoding without the signature
+        self.signature = backend_for_key(private_key).sign(private_key, self.signing_bytes()).hex()
     
     def verify(self) -> bool:
         """
@@ -57,23 +228,81 @@ class Transaction:
         if not self.signature:
             return False
         
+        # Each signature only has to be checked once
         try:
-            # Create a hash of the transaction data
-            transaction_hash = SHA256.new(
-                json.dumps(self.to_dict(), sort_keys=True).encode()
-            )
-            
-            # Import the public key from the sender's address
-            public_key = RSA.import_key(self.sender)
+            if signature_cache.get(self.signature_cache_key()):
+                return True
+        except ValueError:
+            return False
+        
+        return self.verify_signature()
+    
+    def verify_signature(self, use_cache: bool = True) -> bool:
+        """
+        Check the signature against the sender's public key without
+        consulting the signature cache. A valid signature is added to it.
+        
+        Args:
+            use_cache: Whether the parsed key and the result may use the
+                module-level caches; worker processes pass False
+        
+        Returns:
+            True if signature is valid, False otherwise
+        """
+        try:
+            message = self.signing_bytes()
+            signature = self._signature_bytes()
             
-            # Verify the signature
-            pkcs1_15.new(public_key).verify(
-                transaction_hash,
-                bytes.fromhex(self.signature)
-            )
-            return True
+            # The sender's key type, not the local configuration, picks the scheme
+            backend, public_key = import_public_key(self.sender) if use_cache else load_public_key(self.sender)
         except (ValueError, TypeError):
             return False
+        
+        # Verify the signature
+        if not backend.verify(public_key, message, signature):
+            return False
+        
+        if use_cache:
+            signature_cache.put(self.signature_cache_key(), True)
+        return True
+    
+    def signature_cache_key(self) -> Tuple[str, Optional[str]]:
+        """
+        Key under which a successful verification is remembered. The signed
+        message covers the sender's public key, so a cached entry means this
+        exact key signed this exact message.
+        
+        Returns:
+            Tuple of (hash of the signed message, signature)
+        """
+        return hashlib.sha256(self.signing_bytes()).hexdigest(), self.signature
+    
+    def calculate_hash(self) -> str:
+        """
+        Calculate the hash identifying this transaction in a block.
+        
+        Returns:
+            str: The transaction id
+        """
+        return self.txid
+    
+    @property
+    def fee_rate(self) -> float:
+        """Fee paid per byte of the canonical encoding."""
+        return self.fee / len(self.encode())
+    
+    @property
+    def sender_address(self) -> str:
+        """
+        Address the amount is debited from.
+        
+        Returns:
+            str: Hash of the sender's public key, or the sender itself if it
+            is not a public key (e.g. "system")
+        """
+        if self.sender.startswith('-----BEGIN'):
+            return hashlib.sha256(self.sender.encode()).hexdigest()
+        return self.sender
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -86,6 +315,7 @@ class Transaction:
             'sender': self.sender,
             'recipient': self.recipient,
             'amount': self.amount,
+            'fee': self.fee,
             'timestamp': self.timestamp,
             'signature': self.signature
         }
@@ -97,7 +327,7 @@ class Transaction:
         
         Args:
             data: Dictionary containing transaction data
-            
+        
         Returns:
             Transaction: New Transaction instance
         """
@@ -112,15 +342,22 @@ class Transaction:
             sender=sender,
             recipient=recipient,
             amount=data['amount'],
-            timestamp=data.get('timestamp')
+            timestamp=data.get('timestamp'),
+            fee=data.get('fee', 0.0)
         )
         if 'signature' in data:
             transaction.signature = data['signature']
+        
+        # Reject fields the canonical encoding cannot represent up front
+        try:
+            transaction.encode()
+        except (AttributeError, TypeError) as e:
+            raise ValueError(f"Invalid transaction field: {e}")
         return transaction
     
     def __str__(self) -> str:
         """Return a string representation of the transaction."""
         return (
             f"Transaction(sender={self.sender}, recipient={self.recipient}, "
-            f"amount={self.amount}, timestamp={self.timestamp})"
+            f"amount={self.amount}, fee={self.fee}, timestamp={self.timestamp})"
         ) 
\ No newline at end of file
@@ -1,58 +1,365 @@
-from typing import List, Dict, Any
+import heapq
+import itertools
+import math
+import threading
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from .transaction import Transaction
-from ..config import MAX_TRANSACTION_POOL_SIZE
+from .verification import verify_transactions
+from ..config import MAX_TRANSACTION_POOL_SIZE, MIN_TRANSACTION_FEE
 
 class TransactionPool:
-    """Manages a pool of pending transactions."""
+    """
+    Manages a pool of pending transactions, prioritized by fee rate (fee per
+    byte of the encoded transaction).
     
-    def __init__(self, max_size: int = MAX_TRANSACTION_POOL_SIZE):
-        """Initialize an empty transaction pool."""
-        self.transactions: List[Transaction] = []
+    Entries are keyed by transaction id, so a transaction already in the
+    pool is rejected before its signature is checked again, and removing a
+    block's transactions costs one lookup each. Replays of confirmed
+    transactions are rejected through the optional is_confirmed callback.
+    Mining rewards (sender "system") are never admitted; only block
+    templates create them.
+    
+    With a balance_of callback, the pool also keeps each sender's total
+    pending outflow (amounts plus fees) and rejects a transaction that
+    would take the sender past its confirmed balance. The totals are
+    updated as entries are added, evicted and mined, so the check is O(1).
+    
+    A min-heap on fee rate tracks the cheapest entry, so a full pool evicts
+    it in O(log n) to make room for a better-paying transaction instead of
+    rejecting everything new. Removed entries stay in the heap and are
+    skipped when they reach the top.
+    
+    The pool is thread-safe. Its lock only guards the bookkeeping, so
+    signatures are verified without holding it; insertion re-checks
+    duplicates, replays and balances under the lock. A blockchain passes
+    its own lock, so those checks see a chain that does not move.
+    """
+    
+    def __init__(self, max_size: int = MAX_TRANSACTION_POOL_SIZE, min_fee: float = MIN_TRANSACTION_FEE,
+                 is_confirmed: Optional[Callable[[Transaction], bool]] = None,
+                 balance_of: Optional[Callable[[str], float]] = None,
+                 lock: Optional[threading.RLock] = None):
+        """
+        Initialize an empty transaction pool.
+        
+        Args:
+            max_size: Maximum number of pending transactions
+            min_fee: Lowest fee accepted for non-system transactions
+            is_confirmed: Optional check for transactions already on the chain
+                (e.g. Blockchain.is_confirmed), which are rejected as replays
+            balance_of: Optional confirmed balance lookup by address; when
+                given, transactions that overspend it are rejected
+            lock: Optional reentrant lock to guard the bookkeeping with,
+                e.g. the lock of the chain the callbacks read
+        """
         self.max_size = max_size
+        self.min_fee = min_fee
+        self.is_confirmed = is_confirmed
+        self.balance_of = balance_of
+        self._entries: Dict[str, Tuple[float, int, Transaction]] = {}  # txid -> (fee rate, arrival sequence, transaction)
+        self._heap: List[Tuple[float, int, str]] = []  # (fee rate, -arrival sequence, txid), cheapest first
+        self._sequence = itertools.count()
+        self.pending_deltas: Dict[str, float] = {}  # Address -> net pending balance change
+        self._pending_counts: Dict[str, int] = {}  # Address -> pending transactions touching it
+        self.pending_outflows: Dict[str, float] = {}  # Sender address -> pending amounts plus fees
+        self._outflow_counts: Dict[str, int] = {}  # Sender address -> pending transactions it sends
+        self._lock = lock if lock is not None else threading.RLock()
+    
+    def __len__(self) -> int:
+        """Number of pending transactions."""
+        return len(self._entries)
+    
+    def __contains__(self, txid: str) -> bool:
+        """Whether a transaction id is pending."""
+        return txid in self._entries
     
     def add_transaction(self, transaction: Dict[str, Any] | Transaction) -> bool:
         """
-        Add a transaction to the pool.
+        Add a transaction to the pool, evicting the lowest fee-rate entry if
+        the pool is full and the new transaction pays more. Transactions
+        already in the pool are rejected without being verified again.
         
         Args:
             transaction: Transaction to add (can be dict or Transaction object)
-            
+        
         Returns:
             True if transaction was added, False otherwise
         """
-        if len(self.transactions) >= self.max_size:
-            return False
-        
         # Convert dict to Transaction if needed
         if isinstance(transaction, dict):
             transaction = Transaction.from_dict(transaction)
         
-        if transaction.verify():
-            self.transactions.append(transaction)
-            return True
-        return False
+        # Duplicate and fee checks come first so those are not verified
+        with self._lock:
+            fee_rate = self._admission_fee_rate(transaction)
+        if fee_rate is None or not transaction.verify():
+            return False
+        with self._lock:
+            return self._insert(transaction, fee_rate)
+    
+    def add_transactions(self, transactions: List[Dict[str, Any] | Transaction]) -> List[bool]:
+        """
+        Add many transactions at once, verifying their signatures in a batch.
+        
+        Args:
+            transactions: Transactions to add (dicts or Transaction objects)
+        
+        Returns:
+            List[bool]: Whether each transaction was added, in input order
+        """
+        transactions = [
+            Transaction.from_dict(tx) if isinstance(tx, dict) else tx
+            for tx in transactions
+        ]
+        with self._lock:
+            fee_rates = [self._admission_fee_rate(tx) for tx in transactions]
+        candidates = [tx for tx, fee_rate in zip(transactions, fee_rates) if fee_rate is not None]
+        verified = iter(verify_transactions(candidates))
+        
+        added = []
+        with self._lock:
+            for transaction, fee_rate in zip(transactions, fee_rates):
+                if fee_rate is not None and next(verified):
+                    added.append(self._insert(transaction, fee_rate))
+                else:
+                    added.append(False)
+        return added
+    
+    def readmit_transactions(self, transactions: List[Transaction]) -> None:
+        """
+        Return transactions from disconnected blocks to the pool without
+        verifying their signatures again; they were checked when the
+        blocks were accepted.
+        
+        Args:
+            transactions: Transactions to add back, oldest first
+        """
+        with self._lock:
+            for transaction in transactions:
+                fee_rate = self._admission_fee_rate(transaction)
+                if fee_rate is not None:
+                    self._insert(transaction, fee_rate)
     
     def get_transactions(self) -> List[Transaction]:
-        """Get all transactions in the pool."""
-        return self.transactions
+        """Get all transactions in the pool, highest fee rate first."""
+        return self.select_transactions(len(self._entries))
+    
+    def select_transactions(self, limit: int) -> List[Transaction]:
+        """
+        Get the best-paying transactions, e.g. for a block template.
+        
+        Args:
+            limit: Maximum number of transactions
+        
+        Returns:
+            List[Transaction]: Up to limit transactions, highest fee rate
+            first and oldest first among equal fee rates
+        """
+        with self._lock:
+            best = heapq.nlargest(limit, self._entries.values(), key=lambda entry: (entry[0], -entry[1]))
+        return [transaction for _, _, transaction in best]
+    
+    def get_transaction_count(self) -> int:
+        """Get the number of pending transactions."""
+        return len(self._entries)
+    
+    def get_pending_delta(self, address: str) -> float:
+        """
+        Get the net balance change pending transactions make to an address.
+        
+        Args:
+            address: Address to look up
+        
+        Returns:
+            Sum of pending credits minus pending debits
+        """
+        return self.pending_deltas.get(address, 0.0)
+    
+    def get_pending_outflow(self, address: str) -> float:
+        """
+        Get the amounts plus fees pending transactions send from an address.
+        
+        Args:
+            address: Sender address to look up
+        
+        Returns:
+            Sum of pending debits
+        """
+        return self.pending_outflows.get(address, 0.0)
+    
+    def get_transaction(self, txid: str) -> Optional[Transaction]:
+        """
+        Get a pending transaction by id.
+        
+        Args:
+            txid: Transaction id
+        
+        Returns:
+            Optional[Transaction]: The transaction, None if it is not pending
+        """
+        entry = self._entries.get(txid)
+        return entry[2] if entry else None
     
     def remove_transactions(self, transactions: List[Transaction]) -> None:
-        """Remove transactions from the pool."""
-        self.transactions = [tx for tx in self.transactions if tx not in transactions]
+        """
+        Remove transactions from the pool, e.g. once they are in a block.
+        They are matched by id, so copies received from peers are removed too.
+        """
+        with self._lock:
+            for tx in transactions:
+                if tx.txid in self._entries:
+                    self._remove(tx.txid)
+            
+            # Drop the stale heap entries once they outnumber the live ones
+            if len(self._heap) > 2 * len(self._entries):
+                self._heap = [
+                    (fee_rate, -sequence, txid)
+                    for txid, (fee_rate, sequence, _) in self._entries.items()
+                ]
+                heapq.heapify(self._heap)
     
     def clear_transactions(self) -> None:
         """Clear all transactions from the pool."""
-        self.transactions = []
+        with self._lock:
+            self._entries = {}
+            self._heap = []
+            self.pending_deltas = {}
+            self._pending_counts = {}
+            self.pending_outflows = {}
+            self._outflow_counts = {}
+    
+    def _overspends(self, transaction: Transaction) -> bool:
+        """
+        Check a transaction against its sender's confirmed balance minus
+        what the sender's pending transactions already spend.
+        
+        Args:
+            transaction: Candidate transaction
+        
+        Returns:
+            True if the sender cannot cover it
+        """
+        if self.balance_of is None:
+            return False
+        sender = transaction.sender_address
+        available = self.balance_of(sender) - self.pending_outflows.get(sender, 0.0)
+        return transaction.amount + transaction.fee > available
+    
+    def _admission_fee_rate(self, transaction: Transaction) -> Optional[float]:
+        """
+        Check a transaction's id and fee before verifying it.
+        
+        Args:
+            transaction: Candidate transaction
+        
+        Returns:
+            Optional[float]: Its fee rate, or None if it is a mining reward,
+            already pending, already confirmed, its amount is not positive,
+            its fee is too low, its sender cannot cover it or a full pool
+            holds nothing cheaper
+        """
+        try:
+            # Rewards pass verification unsigned, so only block templates may create them
+            if transaction.sender == "system" or transaction.txid in self._entries:
+                return None
+            # Negative or non-finite values would corrupt the pending totals
+            if not (math.isfinite(transaction.amount) and transaction.amount > 0
+                    and math.isfinite(transaction.fee) and transaction.fee >= 0):
+                return None
+            if not transaction.fee >= self.min_fee:
+                return None
+            fee_rate = transaction.fee_rate
+            if self._overspends(transaction):
+                return None
+        except (ValueError, TypeError, AttributeError):
+            return None
+        if self.is_confirmed is not None and self.is_confirmed(transaction):
+            return None
+        
+        if len(self._entries) >= self.max_size:
+            cheapest = self._cheapest()
+            if cheapest is None or fee_rate <= cheapest[0]:
+                return None
+        return fee_rate
+    
+    def _insert(self, transaction: Transaction, fee_rate: float) -> bool:
+        """
+        Insert a verified transaction, evicting the cheapest entry if full.
+        
+        Returns:
+            True if the transaction was inserted
+        """
+        txid = transaction.txid
+        # The chain and the pool may have changed since the admission checks
+        if txid in self._entries or self._overspends(transaction):
+            return False
+        if self.is_confirmed is not None and self.is_confirmed(transaction):
+            return False
+        if len(self._entries) >= self.max_size:
+            cheapest = self._cheapest()
+            if cheapest is None or fee_rate <= cheapest[0]:
+                return False
+            self._remove(cheapest[2])
+        
+        sequence = next(self._sequence)
+        self._entries[txid] = (fee_rate, sequence, transaction)
+        heapq.heappush(self._heap, (fee_rate, -sequence, txid))
+        self._track(transaction, 1)
+        return True
+    
+    def _cheapest(self) -> Optional[Tuple[float, int, str]]:
+        """Heap entry of the lowest fee-rate transaction (the newest among ties)."""
+        while self._heap:
+            _, negative_sequence, txid = self._heap[0]
+            entry = self._entries.get(txid)
+            # Skip entries removed since, including ones re-added under a new sequence
+            if entry is not None and entry[1] == -negative_sequence:
+                return self._heap[0]
+            heapq.heappop(self._heap)
+        return None
+    
+    def _remove(self, txid: str) -> None:
+        """Remove an entry; its heap entry is discarded lazily."""
+        _, _, transaction = self._entries.pop(txid)
+        self._track(transaction, -1)
+    
+    def _track(self, transaction: Transaction, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a transaction's pending balance changes."""
+        changes = [(transaction.recipient, transaction.amount)]
+        if transaction.sender != "system":
+            sender = transaction.sender_address
+            spent = transaction.amount + transaction.fee
+            changes.append((sender, -spent))
+            count = self._outflow_counts.get(sender, 0) + sign
+            if count:
+                self._outflow_counts[sender] = count
+                self.pending_outflows[sender] = self.pending_outflows.get(sender, 0.0) + sign * spent
+            else:
+                self._outflow_counts.pop(sender, None)
+                self.pending_outflows.pop(sender, None)
+        for address, amount in changes:
+            count = self._pending_counts.get(address, 0) + sign
+            if count:
+                self._pending_counts[address] = count
+                self.pending_deltas[address] = self.pending_deltas.get(address, 0.0) + sign * amount
+            else:
+                # Drop the entry instead of keeping a float that may not be exactly zero
+                self._pending_counts.pop(address, None)
+                self.pending_deltas.pop(address, None)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction pool to dictionary."""
+        with self._lock:
+            transactions = [tx for _, _, tx in self._entries.values()]
         return {
-            'transactions': [tx.to_dict() for tx in self.transactions]
+            'transactions': [tx.to_dict() for tx in transactions]
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TransactionPool':
         """Create a transaction pool from dictionary data."""
         pool = cls()
-        pool.transactions = [Transaction.from_dict(tx) for tx in data['transactions']]
+        for tx_data in data['transactions']:
+            transaction = Transaction.from_dict(tx_data)
+            pool._insert(transaction, transaction.fee_rate)
         return pool 
\ No newline at end of file
@@ -0,0 +1,295 @@
+import logging
+import multiprocessing
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .block import Block
+from .verification import verify_transactions
+from ..config import VALIDATION_WORKERS, VALIDATION_CHUNK_SIZE, VERIFICATION_WORKERS, CHECKPOINTS, POOL_START_METHOD
+
+logger = logging.getLogger(__name__)
+
+def check_block(block: Block, difficulty: int, workers: int = VERIFICATION_WORKERS) -> Optional[str]:
+    """
+    Run the checks that only need the block itself: hash, proof of work and
+    transaction signatures.
+    
+    Args:
+        block: Block to check
+        difficulty: Number of leading zeros required in the hash
+        workers: Number of processes used to verify signatures
+    
+    Returns:
+        Optional[str]: Description of the first problem found, None if valid
+    """
+    # Fields a peer sent with the wrong type make hashing raise
+    try:
+        # Check block hash
+        if block.hash != block.calculate_hash():
+            return "Block hash does not match its contents"
+        
+        # The Merkle tree pairs the last node of an odd level with itself, so
+        # repeating trailing transactions keeps the root (CVE-2012-2459); a
+        # valid block never holds the same transaction twice
+        txids = [transaction.txid for transaction in block.transactions]
+        if len(set(txids)) != len(txids):
+            return "Block contains duplicate transactions"
+        
+        # Check proof of work against the block's own difficulty, which sets the
+        # work it counts for and may not be below the required difficulty
+        if block.difficulty < difficulty:
+            return "Block difficulty is below the required difficulty"
+        if block.hash[:block.difficulty] != "0" * block.difficulty:
+            return "Block hash does not meet the difficulty"
+    except (struct.error, TypeError, ValueError) as e:
+        return f"Malformed block: {e}"
+    
+    # Check transaction signatures
+    for position, valid in enumerate(verify_transactions(block.transactions, workers)):
+        if not valid:
+            return f"Invalid signature on transaction {position}"
+    
+    return None
+
+def _check_chunk(args: Tuple[List[Dict[str, Any]], int]) -> Tuple[int, Optional[int], Optional[str]]:
+    """
+    Check a chunk of blocks in a worker process.
+    
+    Args:
+        args: Tuple of (block dictionaries, difficulty)
+    
+    Returns:
+        Tuple of (blocks checked, height of the first invalid block, error)
+    """
+    block_dicts, difficulty = args
+    for block_data in block_dicts:
+        try:
+            # Pool workers cannot start a pool of their own
+            error = check_block(Block.from_dict(block_data), difficulty, workers=1)
+        except (KeyError, TypeError, ValueError) as e:
+            error = f"Malformed block: {e}"
+        if error:
+            return len(block_dicts), block_data.get('index'), error
+    return len(block_dicts), None, None
+
+class ValidationReport:
+    """Outcome of validating a run of blocks."""
+    
+    def __init__(self, valid: bool, blocks: int, elapsed: float,
+                 error: Optional[str] = None, height: Optional[int] = None):
+        """
+        Initialize a validation report.
+        
+        Args:
+            valid: Whether every block passed
+            blocks: Number of blocks validated
+            elapsed: Seconds spent validating
+            error: Description of the first problem found
+            height: Height of the block that failed
+        """
+        self.valid = valid
+        self.blocks = blocks
+        self.elapsed = elapsed
+        self.error = error
+        self.height = height
+    
+    @property
+    def blocks_per_second(self) -> float:
+        """Validation throughput."""
+        return self.blocks / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def __bool__(self) -> bool:
+        """Whether every block passed."""
+        return self.valid
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a dictionary."""
+        return {
+            'valid': self.valid,
+            'blocks': self.blocks,
+            'elapsed': self.elapsed,
+            'blocks_per_second': self.blocks_per_second,
+            'error': self.error,
+            'height': self.height
+        }
+
+class ChainValidator:
+    """
+    Validates runs of blocks. The per-block checks (hash, proof of work,
+    signatures) are spread over a process pool in chunks while the linkage
+    checks (index, previous hash), which depend on block order, run in this
+    process. Short runs are checked in-process to avoid the pool start-up cost.
+    
+    Blocks at or below the highest checkpoint the run matches are assumed
+    valid: only their linkage and hashes are checked, since the checkpoint
+    hash commits to everything before it.
+    """
+    
+    def __init__(self, workers: int = VALIDATION_WORKERS, chunk_size: int = VALIDATION_CHUNK_SIZE,
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 checkpoints: Optional[Dict[int, str]] = None):
+        """
+        Initialize the validator.
+        
+        Args:
+            workers: Number of worker processes
+            chunk_size: Blocks per task sent to a worker
+            progress: Optional callback invoked with (blocks checked, total)
+            checkpoints: Known block hashes by height (defaults to CHECKPOINTS)
+        """
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.checkpoints = CHECKPOINTS if checkpoints is None else checkpoints
+    
+    def conflicts_with_checkpoint(self, height: int, block_hash: Optional[str]) -> bool:
+        """
+        Check whether a block contradicts a checkpoint.
+        
+        Args:
+            height: Index of the block
+            block_hash: Hash of the block
+        
+        Returns:
+            bool: True if there is a checkpoint at this height with another hash
+        """
+        expected = self.checkpoints.get(height)
+        return expected is not None and expected != block_hash
+    
+    def validate(self, blocks: List[Block], parent: Optional[Block], difficulty: int) -> ValidationReport:
+        """
+        Validate consecutive blocks on top of a parent block.
+        
+        Args:
+            blocks: Blocks to validate, in order
+            parent: Block the run builds on, or None if it starts with the
+                genesis block
+            difficulty: Number of leading zeros required in block hashes
+        
+        Returns:
+            ValidationReport: Result with throughput statistics
+        """
+        started = time.perf_counter()
+        total = len(blocks)
+        
+        def report(error: Optional[str] = None, height: Optional[int] = None) -> ValidationReport:
+            result = ValidationReport(error is None, total, time.perf_counter() - started, error, height)
+            if result.valid:
+                logger.info(
+                    f"Validated {result.blocks} blocks in {result.elapsed:.2f}s "
+                    f"({result.blocks_per_second:.0f} blocks/s)"
+                )
+            else:
+                logger.warning(f"Block {height} failed validation: {error}")
+            return result
+        
+        if not blocks:
+            return report("No blocks to validate")
+        
+        # Reject chains that conflict with a checkpoint outright
+        assumed_height = -1
+        start = blocks[0].index
+        for height, block_hash in self.checkpoints.items():
+            position = height - start
+            if 0 <= position < len(blocks):
+                if blocks[position].hash != block_hash:
+                    return report("Block conflicts with a checkpoint", height)
+                assumed_height = max(assumed_height, height)
+        
+        # Check genesis block
+        if parent is None:
+            if blocks[0].index != 0 or blocks[0].previous_hash != "0" * 64:
+                return report("Invalid genesis block", blocks[0].index)
+            parent, blocks = blocks[0], blocks[1:]
+        
+        # Blocks up to the highest matching checkpoint only need their linkage
+        # and hashes checked, which is what ties them to the checkpoint
+        assumed = 0
+        while assumed < len(blocks) and blocks[assumed].index <= assumed_height:
+            current = blocks[assumed]
+            error = self._check_link(current, parent)
+            if not error and current.hash != current.calculate_hash():
+                error = "Block hash does not match its contents"
+            if error:
+                return report(error, current.index)
+            parent = current
+            assumed += 1
+        blocks = blocks[assumed:]
+        
+        if self.workers > 1 and len(blocks) > self.chunk_size:
+            return self._validate_parallel(blocks, parent, difficulty, report)
+        
+        checked = 0
+        for current in blocks:
+            error = self._check_link(current, parent) or check_block(current, difficulty)
+            if error:
+                return report(error, current.index)
+            parent = current
+            checked += 1
+            if self.progress and checked % self.chunk_size == 0:
+                self.progress(checked, len(blocks))
+        if self.progress:
+            self.progress(checked, len(blocks))
+        return report()
+    
+    def _validate_parallel(self, blocks: List[Block], parent: Block, difficulty: int,
+                           report: Callable[..., ValidationReport]) -> ValidationReport:
+        """
+        Check blocks in a process pool while running linkage checks here.
+        
+        Args:
+            blocks: Blocks to validate, in order
+            parent: Block the run builds on
+            difficulty: Number of leading zeros required in block hashes
+            report: Callback building the final report
+        
+        Returns:
+            ValidationReport: Result with throughput statistics
+        """
+        chunks = [
+            ([block.to_dict() for block in blocks[i:i + self.chunk_size]], difficulty)
+            for i in range(0, len(blocks), self.chunk_size)
+        ]
+        
+        context = multiprocessing.get_context(POOL_START_METHOD)
+        with context.Pool(self.workers) as pool:
+            results = pool.imap(_check_chunk, chunks)
+            
+            # Linkage only needs the claimed hashes, so it runs while the workers hash
+            for current in blocks:
+                error = self._check_link(current, parent)
+                if error:
+                    return report(error, current.index)
+                parent = current
+            
+            checked = 0
+            for count, height, error in results:
+                if error:
+                    return report(error, height)
+                checked += count
+                if self.progress:
+                    self.progress(checked, len(blocks))
+        
+        return report()
+    
+    @staticmethod
+    def _check_link(block: Block, parent: Block) -> Optional[str]:
+        """
+        Check that a block directly follows its parent.
+        
+        Args:
+            block: Block to check
+            parent: Expected parent block
+        
+        Returns:
+            Optional[str]: Description of the problem, None if linked correctly
+        """
+        # Check block index
+        if block.index != parent.index + 1:
+            return "Block index does not follow its parent"
+        
+        # Check previous hash
+        if block.previous_hash != parent.hash:
+            return "Previous hash does not match the parent block"
+        
+        return None 
\ No newline at end of file
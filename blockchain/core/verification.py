@@ -0,0 +1,84 @@
+import logging
+import multiprocessing
+from typing import List, Optional, Sequence
+from .transaction import Transaction
+from ..crypto.cache import signature_cache
+from ..config import VERIFICATION_WORKERS, VERIFICATION_CHUNK_SIZE, POOL_START_METHOD
+
+logger = logging.getLogger(__name__)
+
+def _verify_chunk(encoded: List[bytes]) -> List[bool]:
+    """
+    Check the signatures of a chunk of transactions in a worker process,
+    without the module-level caches, which the parent updates instead.
+    
+    Args:
+        encoded: Transactions to check, in their canonical encoding
+    
+    Returns:
+        List[bool]: Whether each signature is valid, in input order
+    """
+    return [Transaction.decode(data).verify_signature(use_cache=False) for data in encoded]
+
+def verify_transactions(transactions: Sequence[Transaction], workers: int = VERIFICATION_WORKERS,
+                        chunk_size: int = VERIFICATION_CHUNK_SIZE) -> List[bool]:
+    """
+    Verify the signatures of many transactions, sharding the signature checks over
+    a process pool. System, unsigned and already verified transactions are
+    resolved here; only the remaining signatures are sent to the workers,
+    and batches no larger than one chunk are checked in-process to avoid
+    the pool start-up cost.
+    
+    Args:
+        transactions: Transactions to verify
+        workers: Number of worker processes
+        chunk_size: Transactions per task sent to a worker
+    
+    Returns:
+        List[bool]: Whether each transaction is valid, in input order
+    """
+    results: List[Optional[bool]] = []
+    pending: List[int] = []
+    for position, transaction in enumerate(transactions):
+        if transaction.sender == "system":
+            results.append(True)
+        elif not transaction.signature:
+            results.append(False)
+        else:
+            try:
+                transaction.encode()
+                cached = signature_cache.get(transaction.signature_cache_key())
+            except ValueError:
+                results.append(False)  # Cannot be encoded, so cannot have been signed
+                continue
+            if cached:
+                results.append(True)
+            else:
+                results.append(None)
+                pending.append(position)
+    
+    if not pending:
+        return results
+    
+    if workers <= 1 or len(pending) <= chunk_size:
+        for position in pending:
+            results[position] = transactions[position].verify_signature()
+        return results
+    
+    chunks = [
+        [transactions[position].encode() for position in pending[i:i + chunk_size]]
+        for i in range(0, len(pending), chunk_size)
+    ]
+    context = multiprocessing.get_context(POOL_START_METHOD)
+    with context.Pool(min(workers, len(chunks))) as pool:
+        # map returns the chunks in submission order
+        verified = [valid for chunk in pool.map(_verify_chunk, chunks) for valid in chunk]
+    
+    # Workers do not cache, so remember the results here
+    for position, valid in zip(pending, verified):
+        results[position] = valid
+        if valid:
+            signature_cache.put(transactions[position].signature_cache_key(), True)
+    
+    logger.debug(f"Verified {len(pending)} signatures with {len(chunks)} tasks")
+    return results 
\ No newline at end of file
@@ -0,0 +1,258 @@
+import hashlib
+from typing import Any, Dict, Tuple
+from Crypto.PublicKey import RSA
+from Crypto.Signature import pkcs1_15, pss
+from Crypto.Hash import SHA256
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+from ..config import KEY_SIZE, SIGNATURE_ALGORITHM
+
+class SignatureBackend:
+    """
+    Key generation, serialization, signing and verification for one
+    signature scheme. Public keys travel as PEM strings (they are the
+    transaction sender), and an address is the SHA-256 of that PEM.
+    """
+    
+    name = ''
+    
+    def generate_private_key(self) -> Any:
+        """Generate a new private key."""
+        raise NotImplementedError
+    
+    def public_key(self, private_key: Any) -> Any:
+        """Get the public key of a private key."""
+        raise NotImplementedError
+    
+    def export_public_key(self, public_key: Any) -> str:
+        """Serialize a public key to PEM."""
+        raise NotImplementedError
+    
+    def import_public_key(self, pem: str) -> Any:
+        """
+        Parse a PEM public key.
+        
+        Raises:
+            ValueError: If the key cannot be parsed or belongs to another scheme
+        """
+        raise NotImplementedError
+    
+    def export_private_key(self, private_key: Any) -> str:
+        """Serialize a private key to PEM."""
+        raise NotImplementedError
+    
+    def import_private_key(self, pem: str) -> Any:
+        """
+        Parse a PEM private key.
+        
+        Raises:
+            ValueError: If the key cannot be parsed or belongs to another scheme
+        """
+        raise NotImplementedError
+    
+    def handles(self, key: Any) -> bool:
+        """Whether a parsed public or private key belongs to this scheme."""
+        raise NotImplementedError
+    
+    def sign(self, private_key: Any, message: bytes) -> bytes:
+        """Sign a message."""
+        raise NotImplementedError
+    
+    def verify(self, public_key: Any, message: bytes, signature: bytes) -> bool:
+        """Check a signature, returning False instead of raising when it is invalid."""
+        raise NotImplementedError
+    
+    def address(self, public_key: Any) -> str:
+        """
+        Derive the address of a public key.
+        
+        Returns:
+            str: SHA-256 of the PEM-encoded key
+        """
+        return hashlib.sha256(self.export_public_key(public_key).encode()).hexdigest()
+
+class RSABackend(SignatureBackend):
+    """RSA keys with SHA-256; subclasses choose the signature padding."""
+    
+    def __init__(self, key_size: int = KEY_SIZE):
+        """
+        Initialize the backend.
+        
+        Args:
+            key_size: Modulus size of generated keys in bits
+        """
+        self.key_size = key_size
+    
+    def generate_private_key(self) -> RSA.RsaKey:
+        return RSA.generate(self.key_size)
+    
+    def public_key(self, private_key: RSA.RsaKey) -> RSA.RsaKey:
+        return private_key.publickey()
+    
+    def export_public_key(self, public_key: RSA.RsaKey) -> str:
+        return public_key.export_key().decode()
+    
+    def import_public_key(self, pem: str) -> RSA.RsaKey:
+        return RSA.import_key(pem)
+    
+    def export_private_key(self, private_key: RSA.RsaKey) -> str:
+        return private_key.export_key().decode()
+    
+    def import_private_key(self, pem: str) -> RSA.RsaKey:
+        key = RSA.import_key(pem)
+        if not key.has_private():
+            raise ValueError("Not an RSA private key")
+        return key
+    
+    def handles(self, key: Any) -> bool:
+        return isinstance(key, RSA.RsaKey)
+    
+    def _scheme(self, key: RSA.RsaKey) -> Any:
+        """Signature scheme object for a key."""
+        raise NotImplementedError
+    
+    def sign(self, private_key: RSA.RsaKey, message: bytes) -> bytes:
+        return self._scheme(private_key).sign(SHA256.new(message))
+    
+    def verify(self, public_key: RSA.RsaKey, message: bytes, signature: bytes) -> bool:
+        try:
+            self._scheme(public_key).verify(SHA256.new(message), signature)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+class PKCS1v15Backend(RSABackend):
+    """RSA with PKCS#1 v1.5 padding (deterministic signatures)."""
+    
+    name = 'PKCS1_v1_5'
+    
+    def _scheme(self, key: RSA.RsaKey) -> Any:
+        return pkcs1_15.new(key)
+
+class RSAPSSBackend(RSABackend):
+    """RSA with PSS padding (randomized signatures)."""
+    
+    name = 'RSA-PSS'
+    
+    def _scheme(self, key: RSA.RsaKey) -> Any:
+        return pss.new(key)
+
+class Ed25519Backend(SignatureBackend):
+    """
+    Ed25519: 32-byte keys, 64-byte signatures, and far faster key
+    generation and signing than RSA-2048.
+    """
+    
+    name = 'Ed25519'
+    
+    def generate_private_key(self) -> Ed25519PrivateKey:
+        return Ed25519PrivateKey.generate()
+    
+    def public_key(self, private_key: Ed25519PrivateKey) -> Ed25519PublicKey:
+        return private_key.public_key()
+    
+    def export_public_key(self, public_key: Ed25519PublicKey) -> str:
+        return public_key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+    
+    def import_public_key(self, pem: str) -> Ed25519PublicKey:
+        key = serialization.load_pem_public_key(pem.encode())
+        if not isinstance(key, Ed25519PublicKey):
+            raise ValueError("Not an Ed25519 public key")
+        return key
+    
+    def export_private_key(self, private_key: Ed25519PrivateKey) -> str:
+        return private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+    
+    def import_private_key(self, pem: str) -> Ed25519PrivateKey:
+        key = serialization.load_pem_private_key(pem.encode(), password=None)
+        if not isinstance(key, Ed25519PrivateKey):
+            raise ValueError("Not an Ed25519 private key")
+        return key
+    
+    def handles(self, key: Any) -> bool:
+        return isinstance(key, (Ed25519PrivateKey, Ed25519PublicKey))
+    
+    def sign(self, private_key: Ed25519PrivateKey, message: bytes) -> bytes:
+        return private_key.sign(message)
+    
+    def verify(self, public_key: Ed25519PublicKey, message: bytes, signature: bytes) -> bool:
+        try:
+            public_key.verify(signature, message)
+        except InvalidSignature:
+            return False
+        return True
+
+BACKENDS: Dict[str, SignatureBackend] = {
+    backend.name: backend
+    for backend in (PKCS1v15Backend(), RSAPSSBackend(), Ed25519Backend())
+}
+
+# Schemes used on the chain, one per key type. Every node must verify a
+# signature the same way, so the scheme follows from the sender's key and
+# RSA keys always use PKCS#1 v1.5 padding, whatever SIGNATURE_ALGORITHM says.
+CHAIN_BACKENDS: Tuple[SignatureBackend, ...] = (BACKENDS['PKCS1_v1_5'], BACKENDS['Ed25519'])
+
+def get_backend(name: str = SIGNATURE_ALGORITHM) -> SignatureBackend:
+    """
+    Get a signature backend by name.
+    
+    Args:
+        name: One of PKCS1_v1_5, RSA-PSS or Ed25519 (defaults to SIGNATURE_ALGORITHM,
+            which only chooses the key type of new wallets)
+    
+    Returns:
+        SignatureBackend: The backend
+    
+    Raises:
+        ValueError: If the name is unknown
+    """
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown signature algorithm: {name}")
+
+def backend_for_key(key: Any) -> SignatureBackend:
+    """
+    Get the chain's signature scheme for a parsed public or private key.
+    
+    Args:
+        key: Key of any supported type
+    
+    Returns:
+        SignatureBackend: Backend that signs and verifies with the key
+    
+    Raises:
+        ValueError: If no chain scheme uses this type of key
+    """
+    for backend in CHAIN_BACKENDS:
+        if backend.handles(key):
+            return backend
+    raise ValueError(f"Unsupported key type: {type(key).__name__}")
+
+def load_public_key(pem: str) -> Tuple[SignatureBackend, Any]:
+    """
+    Parse a PEM public key of any supported type.
+    
+    Args:
+        pem: PEM-encoded public key
+    
+    Returns:
+        Tuple of (backend that verifies the key's signatures, parsed key)
+    
+    Raises:
+        ValueError: If no chain scheme can parse the key
+    """
+    for backend in CHAIN_BACKENDS:
+        try:
+            return backend, backend.import_public_key(pem)
+        except (ValueError, TypeError, IndexError):
+            continue
+    raise ValueError("Unsupported public key") 
\ No newline at end of file
@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from .backends import SignatureBackend, load_public_key
+from ..config import SIGNATURE_CACHE_SIZE, PUBLIC_KEY_CACHE_SIZE
+
+class LRUCache:
+    """Thread-safe bounded cache that evicts the least recently used entry and counts hits and misses."""
+    
+    def __init__(self, max_size: int):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_size: Maximum number of entries
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry, counting a hit or a miss.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Optional[Any]: Cached value, or None if absent
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+        
+        Args:
+            key: Cache key
+            value: Value to store (must not be None)
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Look up an entry, computing and storing it on a miss.
+        
+        Args:
+            key: Cache key
+            compute: Function producing the value
+        
+        Returns:
+            Any: Cached or computed value
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+# (message hash, signature) pairs that have been verified successfully.
+# The message hash covers the sender's public key, so a hit means this exact
+# key signed this exact message.
+signature_cache = LRUCache(SIGNATURE_CACHE_SIZE)
+
+# Parsed public keys by their PEM encoding
+public_key_cache = LRUCache(PUBLIC_KEY_CACHE_SIZE)
+
+def import_public_key(pem: str) -> Tuple[SignatureBackend, Any]:
+    """
+    Parse a PEM public key with the backend for its key type, reusing keys
+    parsed before.
+    
+    Args:
+        pem: PEM-encoded public key
+    
+    Returns:
+        Tuple of (backend that verifies the key's signatures, parsed key)
+    
+    Raises:
+        ValueError: If the key cannot be parsed
+    """
+    return public_key_cache.get_or_compute(pem, lambda: load_public_key(pem))
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics of the crypto caches, for monitoring."""
+    return {
+        'signature_cache': signature_cache.stats(),
+        'public_key_cache': public_key_cache.stats()
+    } 
\ No newline at end of file
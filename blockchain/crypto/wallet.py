@@ -1,53 +1,51 @@
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
-import json
-import hashlib
 from typing import Dict, Any
+from .backends import backend_for_key, get_backend
+from ..core.transaction import Transaction
 
 class Wallet:
     """Handles cryptographic operations including key generation, signing, and verification."""
     
     def __init__(self, password: str = None):
-        """Initialize a new wallet."""
-        self.private_key = RSA.generate(2048)
-        self.public_key = self.private_key.publickey()
+        """Initialize a new wallet with a key pair of the configured key type."""
+        self.private_key = get_backend().generate_private_key()
+        self.backend = backend_for_key(self.private_key)
+        self.public_key = self.backend.public_key(self.private_key)
         self.address = self.generate_address()
     
     def get_address(self) -> str:
         """Get the wallet's public address."""
         return self.address
     
+    def get_public_key(self) -> str:
+        """Get the wallet's PEM public key, used as the sender of its transactions."""
+        return self.backend.export_public_key(self.public_key)
+    
     def generate_address(self) -> str:
         """Generate a unique address for the wallet."""
-        public_key_bytes = self.public_key.export_key()
-        return hashlib.sha256(public_key_bytes).hexdigest()
+        return self.backend.address(self.public_key)
     
     def sign_transaction(self, transaction: Dict[str, Any]) -> str:
         """Sign a transaction with the private key."""
-        # Create a string representation of the transaction
-        transaction_str = json.dumps(transaction, sort_keys=True)
-        
-        # Create a hash of the transaction
-        transaction_hash = SHA256.new(transaction_str.encode())
-        
-        # Sign the hash
-        signature = pkcs1_15.new(self.private_key).sign(transaction_hash)
-        return signature.hex()
+        # Sign the canonical encoding the signature is verified against
+        message = Transaction.from_dict(transaction).signing_bytes()
+        return self.backend.sign(self.private_key, message).hex()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert wallet to dictionary."""
         return {
             'address': self.address,
-            'public_key': self.public_key.export_key().decode(),
-            'private_key': self.private_key.export_key().decode()
+            'algorithm': self.backend.name,
+            'public_key': self.get_public_key(),
+            'private_key': self.backend.export_private_key(self.private_key)
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Wallet':
         """Create a wallet from dictionary data."""
-        wallet = cls()
+        wallet = cls.__new__(cls)
+        backend = get_backend(data['algorithm']) if 'algorithm' in data else get_backend()
         wallet.address = data['address']
-        wallet.public_key = RSA.import_key(data['public_key'])
-        wallet.private_key = RSA.import_key(data['private_key'])
+        wallet.private_key = backend.import_private_key(data['private_key'])
+        wallet.backend = backend_for_key(wallet.private_key)
+        wallet.public_key = wallet.backend.import_public_key(data['public_key'])
         return wallet 
\ No newline at end of file
@@ -71,7 +71,9 @@ class DHTNode:
         """
         message = {
             'type': 'new_block',
-            'data': block.to_dict()
+            'data': {
+                'block': block.encode().hex()
+            }
         }
         self._broadcast_message(message)
     
@@ -85,8 +87,7 @@ class DHTNode:
         message = {
             'type': 'new_transaction',
             'data': {
-                'transaction': transaction.to_dict(),
-                'signature': transaction.signature
+                'transaction': transaction.encode().hex()
             }
         }
         self._broadcast_message(message)
@@ -118,7 +119,7 @@ class DHTNode:
         data = message.get('data', {})
         
         if message_type == 'new_block':
-            self._handle_new_block(data)
+            self._handle_new_block(data, sender_id)
         elif message_type == 'new_transaction':
             self._handle_new_transaction(data)
         elif message_type == 'request_chain':
@@ -126,38 +127,51 @@ class DHTNode:
         elif message_type == 'chain_response':
             self._handle_chain_response(data)
     
-    def _handle_new_block(self, data: Dict[str, Any]) -> None:
+    def _handle_new_block(self, data: Dict[str, Any], sender_id: Optional[str] = None) -> None:
         """
         Handle a new block received from a peer.
         
         Args:
-            data: Block data
+            data: Block data, hex of the binary block encoding
+            sender_id: ID of the sending peer
         """
         if not self.blockchain:
             return
         
-        block = Block.from_dict(data)
+        try:
+            encoded = bytes.fromhex(data['block'])
+            # Skip blocks we already have without decoding their transactions
+            if self.blockchain.has_block(Block.encoded_hash(encoded)):
+                return
+            block = Block.decode(encoded)
+        except (KeyError, TypeError, ValueError):
+            # Malformed blocks are dropped
+            return
         
         # Validate and add the block
         if self.blockchain.add_block(block):
             # Remove transactions from pool
             if self.transaction_pool:
                 self.transaction_pool.remove_transactions(block.transactions)
+        elif sender_id and block.hash in self.blockchain.block_tree.orphans:
+            # We are missing the block's ancestors; fetch them from the sender
+            self.request_chain(sender_id)
     
     def _handle_new_transaction(self, data: Dict[str, Any]) -> None:
         """
         Handle a new transaction received from a peer.
         
         Args:
-            data: Transaction data
+            data: Transaction data, hex of the canonical encoding
         """
         if not self.transaction_pool:
             return
         
-        transaction = Transaction.from_dict(
-            data['transaction'],
-            signature=data['signature']
-        )
+        try:
+            transaction = Transaction.decode(bytes.fromhex(data['transaction']))
+        except (KeyError, TypeError, ValueError):
+            # Malformed transactions are dropped
+            return
         
         # Add transaction to pool
         self.transaction_pool.add_transaction(transaction)
@@ -176,7 +190,7 @@ class DHTNode:
         response = {
             'type': 'chain_response',
             'data': {
-                'chain': self.blockchain.to_dict(),
+                'chain': [block.encode().hex() for block in self.blockchain.chain],
                 'node_id': data['node_id']
             }
         }
@@ -187,7 +201,7 @@ class DHTNode:
         Handle a blockchain response from a peer.
         
         Args:
-            data: Response data
+            data: Response data, with the chain as hex block encodings
         """
         if not self.blockchain:
             return
@@ -196,8 +210,14 @@ class DHTNode:
         if data['node_id'] != self.node_id:
             return
         
-        # Try to replace the current chain
-        self.blockchain.replace_chain(data['chain'])
+        try:
+            chain = [bytes.fromhex(encoded) for encoded in data['chain']]
+        except (KeyError, TypeError, ValueError):
+            # Malformed chains are dropped
+            return
+        
+        # Try to replace the current chain; only blocks past the fork are decoded
+        self.blockchain.replace_chain_encoded(chain)
     
     def _broadcast_message(self, message: Dict[str, Any]) -> None:
         """
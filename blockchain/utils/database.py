@@ -2,9 +2,10 @@ import psycopg2
 from psycopg2.extras import DictCursor
 from psycopg2 import pool
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from ..config import DATABASE_CONFIG
+from ..core.transaction import Transaction
 
 logger = logging.getLogger(__name__)
 
@@ -62,25 +63,67 @@ class Database:
                         timestamp DOUBLE PRECISION NOT NULL,
                         previous_hash VARCHAR(64) NOT NULL,
                         hash VARCHAR(64) NOT NULL UNIQUE,
-                        nonce INTEGER NOT NULL,
+                        nonce NUMERIC(20, 0) NOT NULL,
                         data JSONB NOT NULL
                     )
                 """)
                 
+                # Look blocks up by height
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_blocks_index ON blocks (index)
+                """)
+                
+                # Block headers carry an unsigned 64-bit nonce, wider than the original INTEGER column
+                cur.execute("""
+                    ALTER TABLE blocks ALTER COLUMN nonce TYPE NUMERIC(20, 0)
+                """)
+                
                 # Create transactions table
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS transactions (
                         id SERIAL PRIMARY KEY,
+                        txid VARCHAR(64),
                         block_id INTEGER REFERENCES blocks(id),
-                        sender VARCHAR(255) NOT NULL,
+                        block_height INTEGER,
+                        tx_index INTEGER,
+                        sender TEXT NOT NULL,
+                        sender_address VARCHAR(255),
                         recipient VARCHAR(255) NOT NULL,
                         amount DOUBLE PRECISION NOT NULL,
+                        fee DOUBLE PRECISION NOT NULL DEFAULT 0,
                         timestamp DOUBLE PRECISION NOT NULL,
                         signature TEXT,
+                        encoded BYTEA,
                         is_pending BOOLEAN DEFAULT TRUE
                     )
                 """)
                 
+                # Add the history, encoding and fee columns to tables created before they existed
+                cur.execute("""
+                    ALTER TABLE transactions
+                    ADD COLUMN IF NOT EXISTS block_height INTEGER,
+                    ADD COLUMN IF NOT EXISTS tx_index INTEGER,
+                    ADD COLUMN IF NOT EXISTS sender_address VARCHAR(255),
+                    ADD COLUMN IF NOT EXISTS txid VARCHAR(64),
+                    ADD COLUMN IF NOT EXISTS encoded BYTEA,
+                    ADD COLUMN IF NOT EXISTS fee DOUBLE PRECISION NOT NULL DEFAULT 0
+                """)
+                
+                # Look transactions up by id
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_transactions_txid ON transactions (txid)
+                """)
+                
+                # Index transactions by address for history queries
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_transactions_sender_address
+                    ON transactions (sender_address, block_height, tx_index)
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_transactions_recipient
+                    ON transactions (recipient, block_height, tx_index)
+                """)
+                
                 # Create wallets table
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS wallets (
@@ -144,18 +187,26 @@ class Database:
                 block_id = cur.fetchone()[0]
                 
                 # Save transactions
-                for tx in block_data.get('transactions', []):
+                for position, tx in enumerate(block_data.get('transactions', [])):
+                    transaction = Transaction.from_dict(tx)
                     cur.execute("""
                         INSERT INTO transactions 
-                        (block_id, sender, recipient, amount, timestamp, signature, is_pending)
-                        VALUES (%s, %s, %s, %s, %s, %s, FALSE)
+                        (txid, block_id, block_height, tx_index, sender, sender_address, recipient,
+                         amount, fee, timestamp, signature, encoded, is_pending)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, FALSE)
                     """, (
+                        transaction.txid,
                         block_id,
+                        block_data['index'],
+                        position,
                         tx['sender'],
+                        transaction.sender_address,
                         tx['recipient'],
                         tx['amount'],
+                        transaction.fee,
                         tx['timestamp'],
-                        tx.get('signature')
+                        tx.get('signature'),
+                        psycopg2.Binary(transaction.encode())
                     ))
                 
                 conn.commit()
@@ -192,6 +243,190 @@ class Database:
             if conn:
                 cls.return_connection(conn)
     
+    @classmethod
+    def get_block(cls, height: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a single block from the database by height.
+        
+        Args:
+            height: Index of the block
+        
+        Returns:
+            Optional[Dict[str, Any]]: Block data if found, None otherwise
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor(cursor_factory=DictCursor) as cur:
+                cur.execute("SELECT data FROM blocks WHERE index = %s", (height,))
+                row = cur.fetchone()
+                return row['data'] if row else None
+        except Exception as e:
+            logger.error(f"Failed to get block {height}: {e}")
+            return None
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
+    @classmethod
+    def get_block_height(cls, block_hash: str) -> Optional[int]:
+        """
+        Get the height of a stored block by hash.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            Optional[int]: Index of the block if found, None otherwise
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor() as cur:
+                cur.execute("SELECT index FROM blocks WHERE hash = %s", (block_hash,))
+                row = cur.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Failed to look up block {block_hash}: {e}")
+            return None
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
+    @classmethod
+    def get_block_count(cls) -> int:
+        """
+        Get the number of blocks in the database.
+        
+        Returns:
+            int: Number of blocks
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor() as cur:
+                cur.execute("SELECT COUNT(*) FROM blocks")
+                return cur.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Failed to count blocks: {e}")
+            return 0
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
+    @classmethod
+    def has_transaction(cls, txid: str) -> bool:
+        """
+        Check whether a transaction is in a stored block.
+        
+        Args:
+            txid: Transaction id
+        
+        Returns:
+            bool: True if a stored block contains the transaction
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT 1 FROM transactions WHERE txid = %s AND block_id IS NOT NULL LIMIT 1",
+                    (txid,)
+                )
+                return cur.fetchone() is not None
+        except Exception as e:
+            logger.error(f"Failed to look up transaction {txid}: {e}")
+            return False
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
+    @classmethod
+    def delete_blocks_from(cls, height: int) -> bool:
+        """
+        Delete the blocks at and above a height, with their transactions.
+        
+        Args:
+            height: Lowest height to delete
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM transactions
+                    WHERE block_id IN (SELECT id FROM blocks WHERE index >= %s)
+                """, (height,))
+                cur.execute("DELETE FROM blocks WHERE index >= %s", (height,))
+                conn.commit()
+                logger.info(f"Blocks from {height} deleted successfully")
+                return True
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"Failed to delete blocks: {e}")
+            return False
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
+    @classmethod
+    def get_address_history(cls, address: str, before: Optional[Tuple[int, int]] = None,
+                            limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get confirmed transactions involving an address, newest first.
+        
+        Args:
+            address: Address to look up
+            before: Only return transactions strictly before this
+                (block height, transaction index) location
+            limit: Maximum number of transactions
+        
+        Returns:
+            List[Dict[str, Any]]: Transactions with their location and block hash
+        """
+        conn = None
+        try:
+            conn = cls.get_connection()
+            with conn.cursor(cursor_factory=DictCursor) as cur:
+                query = """
+                    SELECT t.block_height, t.tx_index, b.hash AS block_hash,
+                           t.sender, t.recipient, t.amount, t.fee, t.timestamp, t.signature
+                    FROM transactions t
+                    JOIN blocks b ON b.id = t.block_id
+                    WHERE (t.sender_address = %s OR t.recipient = %s)
+                """
+                params: List[Any] = [address, address]
+                if before is not None:
+                    query += " AND (t.block_height, t.tx_index) < (%s, %s)"
+                    params.extend(before)
+                query += " ORDER BY t.block_height DESC, t.tx_index DESC LIMIT %s"
+                params.append(limit)
+                
+                cur.execute(query, params)
+                return [{
+                    'block_height': row['block_height'],
+                    'tx_index': row['tx_index'],
+                    'block_hash': row['block_hash'],
+                    'transaction': {
+                        'sender': row['sender'],
+                        'recipient': row['recipient'],
+                        'amount': row['amount'],
+                        'fee': row['fee'],
+                        'timestamp': row['timestamp'],
+                        'signature': row['signature']
+                    }
+                } for row in cur.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get address history: {e}")
+            return []
+        finally:
+            if conn:
+                cls.return_connection(conn)
+    
     @classmethod
     def save_transaction(cls, transaction: Dict[str, Any]) -> bool:
         """
@@ -209,12 +444,13 @@ class Database:
             with conn.cursor() as cur:
                 cur.execute("""
                     INSERT INTO transactions 
-                    (sender, recipient, amount, timestamp, signature, is_pending)
-                    VALUES (%s, %s, %s, %s, %s, TRUE)
+                    (sender, recipient, amount, fee, timestamp, signature, is_pending)
+                    VALUES (%s, %s, %s, %s, %s, %s, TRUE)
                 """, (
                     transaction['sender'],
                     transaction['recipient'],
                     transaction['amount'],
+                    transaction.get('fee', 0.0),
                     transaction['timestamp'],
                     transaction.get('signature')
                 ))
@@ -243,7 +479,7 @@ class Database:
             conn = cls.get_connection()
             with conn.cursor(cursor_factory=DictCursor) as cur:
                 cur.execute("""
-                    SELECT sender, recipient, amount, timestamp, signature
+                    SELECT sender, recipient, amount, fee, timestamp, signature
                     FROM transactions
                     WHERE is_pending = TRUE
                 """)
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Any, Dict, List, Optional
+from ..config import SNAPSHOT_FILE, SNAPSHOT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BHSNAP\x00\x01'
+VERSION = 1
+
+# Magic, format version, number of sections
+HEADER_STRUCT = struct.Struct('>8sII')
+# Section name, payload offset, payload length, SHA-256 of the payload
+SECTION_STRUCT = struct.Struct('>16sQQ32s')
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or corrupt."""
+    pass
+
+def write_snapshot(path: str, sections: Dict[str, Any]) -> None:
+    """
+    Write a snapshot atomically: the file is written and synced under a
+    temporary name, then renamed over the previous snapshot, so readers see
+    either the old or the new snapshot and never a partial one.
+    
+    Args:
+        path: Snapshot file path
+        sections: JSON-serializable section contents by name
+    """
+    payloads = [
+        (name.encode(), json.dumps(content, sort_keys=True).encode())
+        for name, content in sections.items()
+    ]
+    
+    offset = HEADER_STRUCT.size + SECTION_STRUCT.size * len(payloads)
+    table = []
+    for name, payload in payloads:
+        if len(name) > 16:
+            raise ValueError(f"Section name too long: {name!r}")
+        table.append(SECTION_STRUCT.pack(name, offset, len(payload), hashlib.sha256(payload).digest()))
+        offset += len(payload)
+    
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER_STRUCT.pack(MAGIC, VERSION, len(payloads)))
+        f.writelines(table)
+        f.writelines(payload for _, payload in payloads)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class Snapshot:
+    """
+    Read-only view of a snapshot file. The file is memory-mapped and each
+    section is only decoded when it is loaded.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a snapshot file and read its section table.
+        
+        Args:
+            path: Snapshot file path
+        
+        Raises:
+            SnapshotError: If the file is missing or is not a valid snapshot
+        """
+        try:
+            self._file = open(path, 'rb')
+        except OSError as e:
+            raise SnapshotError(f"Cannot open snapshot: {e}")
+        
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, count = HEADER_STRUCT.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise SnapshotError("Not a snapshot file or unsupported version")
+            
+            self._sections = {}
+            for i in range(count):
+                name, offset, length, digest = SECTION_STRUCT.unpack_from(
+                    self._map, HEADER_STRUCT.size + i * SECTION_STRUCT.size
+                )
+                if offset + length > len(self._map):
+                    raise SnapshotError("Snapshot is truncated")
+                self._sections[name.rstrip(b'\x00').decode()] = (offset, length, digest)
+        except (ValueError, struct.error) as e:
+            self.close()
+            raise SnapshotError(f"Invalid snapshot: {e}")
+        except SnapshotError:
+            self.close()
+            raise
+    
+    @property
+    def sections(self) -> List[str]:
+        """Names of the sections in the snapshot."""
+        return list(self._sections)
+    
+    def load(self, name: str, default: Any = None) -> Any:
+        """
+        Decode a section.
+        
+        Args:
+            name: Section name
+            default: Value returned if the section does not exist
+        
+        Returns:
+            Any: Section contents
+        
+        Raises:
+            SnapshotError: If the section does not match its checksum
+        """
+        if name not in self._sections:
+            return default
+        offset, length, digest = self._sections[name]
+        payload = self._map[offset:offset + length]
+        if hashlib.sha256(payload).digest() != digest:
+            raise SnapshotError(f"Snapshot section {name} is corrupt")
+        return json.loads(payload)
+    
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def __enter__(self) -> 'Snapshot':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def load_snapshot(path: str = SNAPSHOT_FILE) -> Optional[Snapshot]:
+    """
+    Open the latest snapshot, if there is a valid one.
+    
+    Args:
+        path: Snapshot file path
+    
+    Returns:
+        Optional[Snapshot]: The snapshot, or None if it is missing or corrupt
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return Snapshot(path)
+    except SnapshotError as e:
+        logger.warning(f"Ignoring snapshot {path}: {e}")
+        return None
+
+class SnapshotManager:
+    """
+    Writes a snapshot of the node's state every N blocks: the chain tip and
+    settings, account balances and the mempool.
+    """
+    
+    def __init__(self, blockchain: Any, path: str = SNAPSHOT_FILE, interval: int = SNAPSHOT_INTERVAL):
+        """
+        Initialize the manager and start following the chain tip.
+        
+        Args:
+            blockchain: Blockchain to snapshot
+            path: Snapshot file path
+            interval: Number of blocks between snapshots
+        """
+        self.blockchain = blockchain
+        self.path = path
+        self.interval = interval
+        self.last_height: Optional[int] = None
+        blockchain.add_tip_listener(self._on_tip_changed)
+    
+    def write(self) -> None:
+        """Write a snapshot of the current state."""
+        sections = self.blockchain.snapshot_sections()
+        write_snapshot(self.path, sections)
+        self.last_height = sections['tip']['index']
+        logger.info(f"Snapshot written at height {self.last_height}")
+    
+    def _on_tip_changed(self, tip: Any) -> None:
+        """Write a snapshot when the tip reaches a multiple of the interval."""
+        if self.interval > 0 and tip.index % self.interval == 0 and tip.index != self.last_height:
+            try:
+                self.write()
+            except OSError as e:
+                logger.error(f"Failed to write snapshot: {e}") 
\ No newline at end of file
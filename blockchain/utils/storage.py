@@ -1,7 +1,7 @@
 import os
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from .database import Database
 from ..config import DATA_DIR, BLOCKCHAIN_FILE, WALLET_FILE, PEERS_FILE
 
@@ -70,6 +70,127 @@ class Storage:
             logger.error(f"Failed to load blockchain: {e}")
             return None
     
+    @staticmethod
+    def save_block(block_data: Dict[str, Any]) -> bool:
+        """
+        Save a single block to the database.
+        
+        Args:
+            block_data: Block data to save
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            return Database.save_block(block_data)
+        except Exception as e:
+            logger.error(f"Failed to save block: {e}")
+            return False
+    
+    @staticmethod
+    def load_block(height: int) -> Optional[Dict[str, Any]]:
+        """
+        Load a single block from the database.
+        
+        Args:
+            height: Index of the block
+        
+        Returns:
+            Optional[Dict[str, Any]]: Block data if found, None otherwise
+        """
+        try:
+            return Database.get_block(height)
+        except Exception as e:
+            logger.error(f"Failed to load block {height}: {e}")
+            return None
+    
+    @staticmethod
+    def get_block_height(block_hash: str) -> Optional[int]:
+        """
+        Get the height of a stored block by hash.
+        
+        Args:
+            block_hash: Hash of the block
+        
+        Returns:
+            Optional[int]: Index of the block if found, None otherwise
+        """
+        try:
+            return Database.get_block_height(block_hash)
+        except Exception as e:
+            logger.error(f"Failed to look up block: {e}")
+            return None
+    
+    @staticmethod
+    def get_block_count() -> int:
+        """
+        Get the number of stored blocks.
+        
+        Returns:
+            int: Number of blocks
+        """
+        try:
+            return Database.get_block_count()
+        except Exception as e:
+            logger.error(f"Failed to count blocks: {e}")
+            return 0
+    
+    @staticmethod
+    def delete_blocks_from(height: int) -> bool:
+        """
+        Delete the stored blocks at and above a height.
+        
+        Args:
+            height: Lowest height to delete
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            return Database.delete_blocks_from(height)
+        except Exception as e:
+            logger.error(f"Failed to delete blocks: {e}")
+            return False
+    
+    @staticmethod
+    def get_address_history(address: str, before: Optional[Tuple[int, int]] = None,
+                            limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get stored confirmed transactions involving an address, newest first.
+        
+        Args:
+            address: Address to look up
+            before: Only return transactions strictly before this
+                (block height, transaction index) location
+            limit: Maximum number of transactions
+        
+        Returns:
+            List[Dict[str, Any]]: Transactions with their location and block
+            hash, empty if the database cannot be reached
+        """
+        try:
+            return Database.get_address_history(address, before, limit)
+        except Exception as e:
+            logger.error(f"Failed to load address history: {e}")
+            return []
+    
+    @staticmethod
+    def has_transaction(txid: str) -> bool:
+        """
+        Check whether a transaction is in a stored block.
+        
+        Args:
+            txid: Transaction id
+        
+        Returns:
+            bool: True if a stored block contains the transaction
+        """
+        try:
+            return Database.has_transaction(txid)
+        except Exception as e:
+            logger.error(f"Failed to look up transaction: {e}")
+            return False
+    
     @staticmethod
     def save_wallet(wallet_data: Dict[str, Any]) -> bool:
         """
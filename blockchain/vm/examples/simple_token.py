@@ -71,11 +71,12 @@ def create_simple_token_contract(owner_address: str) -> List[Instruction]:
 
 def main():
     """Example usage of the simple token contract."""
-    from ..vm import VM
+    from ...core.blockchain import Blockchain
     from ..contract import ContractManager
     
-    # Create VM and contract manager
-    vm = VM()
+    # Create a VM that reads balances from the chain, and a contract manager
+    blockchain = Blockchain()
+    vm = blockchain.create_vm()
     contract_manager = ContractManager()
     
     # Create contract
@@ -30,8 +30,14 @@ class VM:
     MAX_PROGRAM_SIZE = 1024 * 1024  # 1MB max program size
     MAX_JUMP_DISTANCE = 1024  # Maximum jump distance
     
-    def __init__(self):
-        """Initialize VM components."""
+    def __init__(self, state: Optional[Any] = None):
+        """
+        Initialize VM components.
+        
+        Args:
+            state: Account state used by BALANCE (anything with get_balance)
+        """
+        self.state = state
         self.memory = Memory()
         self.stack = Stack()
         self.pc = 0  # Program counter
@@ -345,8 +351,7 @@ class VM:
     def _handle_balance(self, operands: List[Any]) -> None:
         """Handle BALANCE instruction."""
         address = operands[0]
-        # TODO: Implement balance check against blockchain
-        self.stack.push(0)
+        self.stack.push(self.state.get_balance(address) if self.state is not None else 0)
         self.gas_used += 1
     
     def _handle_transfer(self, operands: List[Any]) -> None:
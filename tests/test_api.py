@@ -48,10 +48,10 @@ def test_new_transaction(client):
         data=json.dumps(transaction_data),
         content_type='application/json'
     )
-    assert response.status_code == 201
+    assert response.status_code == 202
     data = json.loads(response.data)
     assert 'message' in data
-    assert data['message'] == 'Transaction added to pool'
+    assert data['message'] == 'Transaction accepted for processing'
 
 def test_mine_block(client):
     """Test mining a new block."""
@@ -156,4 +156,193 @@ def test_get_balance_without_address(client):
     assert response.status_code == 400
     data = json.loads(response.data)
     assert 'error' in data
-    assert data['error'] == 'Address required' 
\ No newline at end of file
+    assert data['error'] == 'Address required'
+
+def test_transaction_proof(client):
+    """Test getting a Merkle inclusion proof for a mined transaction."""
+    from blockchain.core.merkle import MerkleTree
+    
+    miner_wallet = Wallet()
+    response = client.get(f'/mine?address={miner_wallet.get_address()}')
+    block = json.loads(response.data)['block']
+    
+    response = client.get(f"/blocks/{block['index']}/transactions/0/proof")
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['merkle_root'] == block['merkle_root']
+    assert MerkleTree.verify_proof(data['transaction_hash'], data['proof'], data['merkle_root'])
+    
+    response = client.get(f"/blocks/{block['index']}/transactions/99/proof")
+    assert response.status_code == 404
+
+def test_get_block(client):
+    """Test getting a single block by height and by hash."""
+    miner_wallet = Wallet()
+    response = client.get(f'/mine?address={miner_wallet.get_address()}')
+    block = json.loads(response.data)['block']
+    
+    response = client.get(f"/blocks/{block['index']}")
+    assert response.status_code == 200
+    assert json.loads(response.data)['hash'] == block['hash']
+    
+    response = client.get(f"/blocks/hash/{block['hash']}")
+    assert response.status_code == 200
+    assert json.loads(response.data)['index'] == block['index']
+    
+    assert client.get('/blocks/100000').status_code == 404
+    assert client.get(f"/blocks/hash/{'f' * 64}").status_code == 404
+
+def test_mining_jobs(client):
+    """Test submitting, polling and cancelling background mining jobs."""
+    import time
+    
+    miner_wallet = Wallet()
+    response = client.post('/mine/jobs', json={'address': miner_wallet.get_address()})
+    assert response.status_code == 202
+    job_id = json.loads(response.data)['job']['job_id']
+    
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        data = json.loads(client.get(f'/mine/jobs/{job_id}').data)
+        if data['status'] == 'completed':
+            break
+        time.sleep(0.05)
+    assert data['status'] == 'completed'
+    assert data['block']['hash'].startswith('0' * 4)
+    
+    # Finished jobs cannot be cancelled, unknown jobs do not exist
+    assert client.delete(f'/mine/jobs/{job_id}').status_code == 409
+    assert client.get('/mine/jobs/unknown').status_code == 404
+    assert client.post('/mine/jobs').status_code == 400
+
+def test_address_transactions(client):
+    """Test paging through the transactions of an address."""
+    miner_wallet = Wallet()
+    address = miner_wallet.get_address()
+    for _ in range(3):
+        client.get(f'/mine?address={address}')
+    
+    response = client.get(f'/address/{address}/transactions?limit=2')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['transactions']) == 2
+    assert data['next_cursor']
+    
+    response = client.get(f"/address/{address}/transactions?limit=2&cursor={data['next_cursor']}")
+    data = json.loads(response.data)
+    assert len(data['transactions']) == 1
+    assert data['next_cursor'] is None
+    
+    assert client.get(f'/address/{address}/transactions?cursor=bad').status_code == 400
+
+def test_get_chain_range(client):
+    """Test streaming a range of the blockchain."""
+    miner_wallet = Wallet()
+    for _ in range(3):
+        client.get(f'/mine?address={miner_wallet.get_address()}')
+    
+    full = json.loads(client.get('/chain').data)
+    length = len(full['chain'])
+    
+    response = client.get('/chain?from=1&limit=2')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.headers['X-Chain-Length'] == str(length)
+    data = json.loads(response.data)
+    assert data['chain'] == full['chain'][1:3]
+    assert data['difficulty'] == full['difficulty']
+    
+    data = json.loads(client.get(f'/chain?from={length}').data)
+    assert data['chain'] == []
+    assert client.get('/chain?limit=0').status_code == 400
+
+def test_metrics(client):
+    """Test getting the cache metrics."""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert {'hits', 'misses', 'size'} <= set(data['signature_cache'])
+    assert 'public_key_cache' in data
+
+def test_batch_transactions(client):
+    """Test adding transactions in a batch."""
+    wallet = Wallet()
+    response = client.post(
+        '/transactions/batch',
+        data=json.dumps({'transactions': [
+            {'sender': wallet.get_address(), 'recipient': 'test_recipient', 'amount': 1.0, 'signature': '00' * 256},
+            {'sender': 'test_sender'}
+        ]}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['accepted'] == 0
+    assert data['results'][0] == {'accepted': False, 'error': 'Invalid transaction'}
+    assert data['results'][1] == {'accepted': False, 'error': 'Missing required fields'}
+    
+    # Fields of the wrong type reject the entry instead of failing the request
+    malformed = [
+        {'sender': 123, 'recipient': 'test_recipient', 'amount': 1.0, 'signature': '00'},
+        {'sender': ['x'], 'recipient': 'test_recipient', 'amount': 1.0, 'signature': '00'},
+        {'sender': wallet.get_address(), 'recipient': {'x': 1}, 'amount': 1.0, 'signature': '00'},
+        {'sender': wallet.get_address(), 'recipient': 'test_recipient', 'amount': 'one', 'signature': '00'}
+    ]
+    response = client.post(
+        '/transactions/batch',
+        data=json.dumps({'transactions': malformed}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    assert json.loads(response.data)['results'] == [{'accepted': False, 'error': 'Invalid transaction'}] * 4
+    
+    response = client.post('/transactions/batch', data=json.dumps({}), content_type='application/json')
+    assert response.status_code == 400
+
+def test_transaction_admission(client):
+    """Test that queued transactions are admitted in the background."""
+    from blockchain.api.app import admission_queue
+    from blockchain.core.transaction import Transaction
+    
+    wallet = Wallet()
+    client.get(f'/mine?address={wallet.get_address()}')
+    transaction = Transaction(wallet.get_public_key(), 'test_recipient', 1.0, fee=0.01)
+    transaction.sign(wallet.private_key)
+    
+    response = client.post('/transactions/new', json=transaction.to_dict())
+    assert response.status_code == 202
+    assert json.loads(response.data)['txid'] == transaction.txid
+    
+    admission_queue.join()
+    pending = json.loads(client.get('/transactions/pending').data)['pending_transactions']
+    assert transaction.to_dict() in pending
+    
+    stats = json.loads(client.get('/metrics').data)['admission']
+    assert stats['queue_depth'] == 0
+    assert stats['accepted'] >= 1
+    assert stats['latency']['max'] >= 0
+    
+    bad = dict(transaction.to_dict(), signature='not hex')
+    assert client.post('/transactions/new', json=bad).status_code == 400
+
+def test_address_history_without_store(client, monkeypatch):
+    """Test that nodes without a store serve the full history without querying the database."""
+    from blockchain.api import app as api
+    from blockchain.config import HISTORY_WINDOW
+    from blockchain.utils.database import Database
+    
+    def unavailable(*args, **kwargs):
+        raise AssertionError("database queried without a store")
+    
+    monkeypatch.setattr(Database, 'get_address_history', unavailable)
+    address = Wallet().get_address()
+    for _ in range(3):
+        client.get(f'/mine?address={address}')
+    
+    # Blocks past the history window of store-backed nodes stay indexed
+    assert api.blockchain.history.indexed_from(HISTORY_WINDOW + 3) == 0
+    response = client.get(f'/address/{address}/transactions?limit=5')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data['transactions']) == 3
+    assert data['next_cursor'] is None
@@ -1,4 +1,5 @@
 import pytest
+import json
 import time
 from blockchain.core.block import Block
 from blockchain.core.blockchain import Blockchain
@@ -168,4 +169,1009 @@ def test_wallet_operations():
     # Test wallet persistence
     wallet_data = wallet.to_dict()
     assert 'public_key' in wallet_data
-    assert 'address' in wallet_data 
\ No newline at end of file
+    assert 'address' in wallet_data
+
+def test_parallel_mining():
+    """Test mining a block across several worker processes."""
+    from blockchain.core.miner import ParallelMiner
+    
+    block = Block(
+        index=1,
+        transactions=[],
+        timestamp=time.time(),
+        previous_hash="0" * 64
+    )
+    
+    result = ParallelMiner(workers=2, check_interval=100).mine(block, 3)
+    assert result.hash.startswith("0" * 3)
+    assert len(result.workers) == 2
+    assert sum(1 for worker in result.workers if worker.found) >= 1
+    assert result.total_hashes > 0
+    
+    block.nonce = result.nonce
+    block.hash = result.hash
+    assert block.is_valid(3)
+    
+    # The blockchain uses the same miner when configured with several workers
+    blockchain = Blockchain(difficulty=2, mining_workers=2)
+    block = blockchain.mine_pending_transactions('test_miner')
+    assert block.hash.startswith("0" * 2)
+    assert blockchain._is_valid_chain(blockchain.chain)
+
+def test_block_header():
+    """Test the binary block header and its round trip through a dictionary."""
+    import hashlib
+    
+    block = Block(
+        index=1,
+        transactions=[Transaction(sender="system", recipient="miner", amount=10.0)],
+        timestamp=time.time(),
+        previous_hash="0" * 64
+    )
+    block.mine_block(2)
+    
+    header = block.header_bytes()
+    assert len(header) == Block.HEADER_STRUCT.size + Block.NONCE_STRUCT.size
+    assert block.hash == hashlib.sha256(header).hexdigest()
+    assert block.difficulty == 2
+    
+    # Decoded blocks hash to the same value
+    decoded = Block.from_dict(block.to_dict())
+    assert decoded.calculate_hash() == block.hash
+    assert decoded.is_valid(2)
+    
+    # Sealed blocks are immutable
+    with pytest.raises(AttributeError):
+        decoded.nonce = 0
+    
+    # So are their transactions, keeping the cached hash and Merkle tree valid
+    assert all(tx.frozen for tx in decoded.transactions)
+    with pytest.raises(AttributeError):
+        decoded.transactions[0].amount = 20.0
+    assert decoded.transactions[0].amount == 10.0
+    assert decoded.to_dict()['transactions'][0]['amount'] == 10.0
+    
+    # A tampered transaction no longer matches the stored hash
+    tampered = json.loads(block.to_json())
+    tampered['transactions'][0]['amount'] = 20.0
+    assert Block.from_dict(tampered).calculate_hash() != block.hash
+
+def test_merkle_proofs():
+    """Test Merkle roots and inclusion proofs for blocks of different sizes."""
+    from blockchain.core.merkle import MerkleTree
+    
+    for size in range(1, 8):
+        transactions = [
+            Transaction(sender="system", recipient=f"address{i}", amount=float(i))
+            for i in range(size)
+        ]
+        block = Block(index=1, transactions=transactions, previous_hash="0" * 64)
+        
+        for i, tx in enumerate(transactions):
+            proof = block.get_merkle_proof(i)
+            assert MerkleTree.verify_proof(tx.calculate_hash(), proof, block.merkle_root)
+            assert not MerkleTree.verify_proof(tx.calculate_hash(), proof, "f" * 64)
+    
+    # The header commits to the root, so changing a transaction changes the hash
+    original_hash = block.calculate_hash()
+    transactions[0].amount = 100.0
+    assert block.calculate_hash() != original_hash
+
+def _wait_for(condition, timeout=30.0):
+    """Poll until a condition holds or the timeout expires."""
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_mining_service():
+    """Test background mining jobs, cancellation and restarts on a new tip."""
+    from blockchain.core.mining_service import MiningService, MiningJob
+    
+    blockchain = Blockchain(difficulty=2)
+    service = MiningService(blockchain)
+    try:
+        # A job completes in the background and extends the chain
+        job = service.submit('test_miner')
+        assert _wait_for(lambda: job.finished)
+        assert job.status == MiningJob.COMPLETED
+        assert blockchain.get_latest_block().hash == job.block.hash
+        
+        # A job that cannot finish can be cancelled
+        blockchain.difficulty = 64
+        job = service.submit('test_miner')
+        assert _wait_for(lambda: job.status == MiningJob.MINING)
+        assert service.cancel(job.job_id)
+        assert _wait_for(lambda: job.finished)
+        assert job.status == MiningJob.CANCELLED
+        assert not service.cancel(job.job_id)
+        
+        # A competing block moves the tip and the job restarts on top of it
+        job = service.submit('test_miner')
+        assert _wait_for(lambda: job.status == MiningJob.MINING)
+        blockchain.difficulty = 1
+        competing = blockchain.create_block_template('other_miner')
+        competing.mine_block(1)
+        assert blockchain.add_block(competing)
+        assert _wait_for(lambda: job.finished)
+        assert job.status == MiningJob.COMPLETED
+        assert job.restarts >= 1
+        assert job.block.previous_hash == competing.hash
+        
+        # A block the chain rejects without the tip moving fails the job
+        blockchain.add_block = lambda block: False
+        job = service.submit('test_miner')
+        assert _wait_for(lambda: job.finished)
+        assert job.status == MiningJob.FAILED
+        assert job.restarts == 0
+        del blockchain.add_block
+    finally:
+        service.stop()
+    
+    # Only the most recent finished jobs are kept
+    service = MiningService(blockchain, job_history=2)
+    try:
+        jobs = []
+        for _ in range(4):
+            jobs.append(service.submit('test_miner'))
+            assert _wait_for(lambda: jobs[-1].finished)
+        assert service.get_job(jobs[0].job_id) is None
+        assert service.get_job(jobs[1].job_id) is jobs[1]
+        assert len(service.jobs) == 3
+    finally:
+        service.stop()
+
+def test_replace_chain_from_fork_point():
+    """Test that replace_chain only decodes and validates the divergent suffix."""
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions('miner1')
+    blockchain.mine_pending_transactions('miner1')
+    shared = blockchain.chain[1]
+    
+    # A peer shares our first block, then mines a longer branch of its own
+    data = blockchain.to_dict()
+    data['chain'] = data['chain'][:2]
+    peer = Blockchain.from_dict(data)
+    for _ in range(3):
+        peer.mine_pending_transactions('miner2')
+    
+    assert blockchain._find_fork_point([block.hash for block in peer.chain]) == 1
+    assert blockchain.replace_chain(peer.to_dict()['chain'])
+    assert len(blockchain.chain) == 5
+    assert blockchain.chain[1] is shared
+    assert blockchain.chain[-1].hash == peer.chain[-1].hash
+    
+    # Chains with less work are rejected before being decoded
+    assert not blockchain.replace_chain([{}] * 5)
+    
+    # A tampered suffix is rejected
+    longer = peer.to_dict()['chain'] + [dict(peer.chain[-1].to_dict(), index=5)]
+    assert not blockchain.replace_chain(longer)
+    assert len(blockchain.chain) == 5
+
+def test_parallel_chain_validation():
+    """Test validating a chain in chunks across worker processes."""
+    from blockchain.core.validation import ChainValidator
+    
+    blockchain = Blockchain(difficulty=1)
+    for _ in range(8):
+        blockchain.mine_pending_transactions('test_miner')
+    
+    progress = []
+    validator = ChainValidator(workers=2, chunk_size=2, progress=lambda done, total: progress.append((done, total)))
+    report = validator.validate(list(blockchain.chain), None, blockchain.difficulty)
+    assert report.valid
+    assert report.blocks == 9
+    assert progress[-1] == (8, 8)
+    
+    # A block whose contents do not match its hash is reported with its height
+    tampered = blockchain.to_dict()['chain']
+    tampered[5] = dict(tampered[5], timestamp=tampered[5]['timestamp'] + 1)
+    blocks = [Block.from_dict(block_data) for block_data in tampered]
+    report = validator.validate(blocks, None, blockchain.difficulty)
+    assert not report.valid
+    assert report.height == 5
+    
+    # Broken linkage is caught as well
+    report = validator.validate(list(blockchain.chain[:3]) + list(blockchain.chain[4:]), None, 1)
+    assert not report.valid
+    assert report.height == 4
+    
+    assert blockchain.validate().valid
+
+def test_block_tree_reorg():
+    """Test side branches, reorganizations and orphan blocks."""
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions('miner1')
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    blockchain.mine_pending_transactions('miner1')
+    for _ in range(2):
+        peer.mine_pending_transactions('miner2')
+    
+    # A competing block with equal work is kept on a side branch
+    tips = []
+    blockchain.add_tip_listener(tips.append)
+    assert blockchain.add_block(peer.chain[2])
+    assert peer.chain[2].hash in blockchain.block_tree
+    assert blockchain.get_latest_block().hash != peer.chain[2].hash
+    assert not tips
+    
+    # Extending the side branch makes it heavier, so the chain reorganizes
+    abandoned = blockchain.chain[2]
+    assert blockchain.add_block(peer.chain[3])
+    assert [block.hash for block in blockchain.chain] == [block.hash for block in peer.chain]
+    assert len(tips) == 1
+    
+    # The lookup indexes follow the reorganization
+    assert blockchain.get_block_by_hash(abandoned.hash) is None
+    assert blockchain.has_block(abandoned.hash)
+    assert blockchain.get_block_by_hash(peer.chain[3].hash) is blockchain.chain[3]
+    assert blockchain.get_block_by_height(2).hash == peer.chain[2].hash
+    assert blockchain.get_block_by_height(4) is None
+    
+    # A block whose parent is unknown waits until the parent arrives
+    for _ in range(2):
+        peer.mine_pending_transactions('miner2')
+    assert not blockchain.add_block(peer.chain[5])
+    assert peer.chain[5].hash in blockchain.block_tree.orphans
+    assert blockchain.add_block(peer.chain[4])
+    assert blockchain.get_latest_block().hash == peer.chain[5].hash
+    assert not blockchain.block_tree.orphans
+    
+    # Known blocks are ignored
+    assert not blockchain.add_block(peer.chain[5])
+
+def test_account_state():
+    """Test the balance index through new blocks, pending transactions and reorgs."""
+    from blockchain.config import MINING_REWARD
+    
+    wallet = Wallet()
+    miner1 = wallet.get_address()
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions(miner1)
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    blockchain.mine_pending_transactions(miner1)
+    assert blockchain.get_balance(miner1) == 2 * MINING_REWARD
+    assert peer.get_balance(miner1) == MINING_REWARD
+    
+    # Pending transactions are included unless only confirmed funds are asked for
+    transaction = Transaction(wallet.get_public_key(), 'miner3', 5, fee=0.5)
+    transaction.sign(wallet.private_key)
+    assert blockchain.transaction_pool.add_transaction(transaction)
+    assert blockchain.get_balance('miner3') == 5
+    assert blockchain.get_balance('miner3', include_pending=False) == 0
+    assert blockchain.get_balance(miner1) == 2 * MINING_REWARD - 5.5
+    
+    # A reorganization rolls back the abandoned block
+    for _ in range(2):
+        peer.mine_pending_transactions('miner2')
+    assert blockchain.replace_chain(peer.to_dict()['chain'])
+    assert blockchain.get_balance(miner1, include_pending=False) == MINING_REWARD
+    assert blockchain.get_balance('miner2') == 2 * MINING_REWARD
+
+def test_address_history():
+    """Test the in-memory address history index."""
+    from blockchain.core.history import AddressHistory
+    
+    blockchain = Blockchain(difficulty=1)
+    for miner in ('miner1', 'miner2', 'miner1'):
+        blockchain.mine_pending_transactions(miner)
+    
+    history = blockchain.get_address_history('miner1')
+    assert [(entry['block_height'], entry['tx_index']) for entry in history] == [(3, 0), (1, 0)]
+    assert history[0]['block_hash'] == blockchain.chain[3].hash
+    assert blockchain.get_address_history('miner1', before=(3, 0)) == history[1:]
+    
+    # Disconnecting a block removes its entries
+    blockchain._disconnect_tip()
+    assert len(blockchain.get_address_history('miner1')) == 1
+    
+    # Only the most recent blocks are kept
+    window = AddressHistory(window=2)
+    for block in blockchain.chain:
+        window.add_block(block)
+    assert window.min_height == 1
+    assert window.get_locations('miner2') == [(2, 0)]
+
+def test_checkpoints():
+    """Test that checkpointed blocks skip proof of work checks and conflicts are rejected."""
+    from blockchain.core.validation import ChainValidator
+    
+    blockchain = Blockchain(difficulty=1)
+    for _ in range(4):
+        blockchain.mine_pending_transactions('test_miner')
+    blocks = list(blockchain.chain)
+    
+    # The blocks were mined at difficulty 1, so a stricter check fails...
+    assert not ChainValidator(workers=1, checkpoints={}).validate(blocks, None, 3).valid
+    
+    # ...unless they are covered by a checkpoint
+    validator = ChainValidator(workers=1, checkpoints={3: blocks[3].hash})
+    report = validator.validate(blocks, None, 3)
+    assert not report.valid
+    assert report.height == 4
+    validator = ChainValidator(workers=1, checkpoints={4: blocks[4].hash})
+    assert validator.validate(blocks, None, 3).valid
+    
+    # Chains that conflict with a checkpoint are rejected
+    report = ChainValidator(workers=1, checkpoints={2: 'f' * 64}).validate(blocks, None, 1)
+    assert not report.valid
+    assert report.height == 2
+    
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    peer.mine_pending_transactions('test_miner')
+    blockchain.validator.checkpoints = {2: 'f' * 64}
+    assert not blockchain.replace_chain(peer.to_dict()['chain'])
+    blockchain.validator.checkpoints = {2: blocks[2].hash}
+    assert blockchain.replace_chain(peer.to_dict()['chain'])
+
+class _MemoryStore:
+    """Block store keeping block dictionaries in a list."""
+    
+    def __init__(self):
+        self.blocks = []
+        self.loads = 0
+    
+    def save_block(self, block_data):
+        self.blocks.append(block_data)
+        return True
+    
+    def load_block(self, height):
+        self.loads += 1
+        return self.blocks[height] if height < len(self.blocks) else None
+    
+    def get_block_count(self):
+        return len(self.blocks)
+    
+    def get_block_height(self, block_hash):
+        heights = [i for i, block in enumerate(self.blocks) if block['hash'] == block_hash]
+        return heights[0] if heights else None
+    
+    def delete_blocks_from(self, height):
+        del self.blocks[height:]
+        return True
+
+def test_chain_window():
+    """Test keeping only recent blocks in memory and loading older ones on demand."""
+    from blockchain.core.chain_window import ChainWindow
+    
+    store = _MemoryStore()
+    blockchain = Blockchain(difficulty=1, store=store, chain_window=3)
+    for _ in range(5):
+        blockchain.mine_pending_transactions('test_miner')
+    
+    assert isinstance(blockchain.chain, ChainWindow)
+    assert len(blockchain.chain) == 6
+    assert len(blockchain.chain._resident) == 3
+    assert len(store.blocks) == 6
+    
+    # Old blocks are loaded from the store once, then served from the cache
+    assert blockchain.get_block_by_height(1).hash == store.blocks[1]['hash']
+    loads = store.loads
+    assert blockchain.get_block_by_hash(store.blocks[1]['hash']).index == 1
+    assert store.loads == loads
+    
+    assert blockchain.validate().valid
+    assert json.loads(blockchain.to_json())['chain'] == store.blocks
+    
+    # Reorganizing removes abandoned blocks from the store
+    peer = Blockchain.from_dict(dict(blockchain.to_dict(), chain=blockchain.to_dict()['chain'][:2]))
+    for _ in range(6):
+        peer.mine_pending_transactions('peer_miner')
+    assert blockchain.replace_chain(peer.to_dict()['chain'])
+    assert [block['hash'] for block in store.blocks] == [block.hash for block in peer.chain]
+    
+    # A restarted node picks the chain up from the store
+    restarted = Blockchain(difficulty=1, store=store, chain_window=3)
+    assert restarted.get_latest_block().hash == peer.chain[-1].hash
+    assert restarted.get_balance('peer_miner') == peer.get_balance('peer_miner')
+    
+    # A block the store refuses is not appended
+    from blockchain.core.chain_window import ChainStorageError
+    store.save_block = lambda block_data: False
+    length = len(restarted.chain)
+    with pytest.raises(ChainStorageError):
+        restarted.chain.append(peer.chain[-1])
+    assert len(restarted.chain) == length
+
+def test_chain_window_concurrent_reads():
+    """Test that a block read while another is appended is at the requested height."""
+    import threading
+    from blockchain.core.chain_window import ChainWindow
+    
+    source = Blockchain(difficulty=1)
+    for _ in range(3):
+        source.mine_pending_transactions('test_miner')
+    chain = ChainWindow(_MemoryStore(), window_size=2)
+    for block in source.chain[:3]:
+        chain.append(block)
+    
+    # Read from another thread just after append trims the resident blocks
+    reads, readers = [], []
+    class TrimHook(list):
+        def __delitem__(self, key):
+            super().__delitem__(key)
+            reader = threading.Thread(target=lambda: reads.append(chain[2].index))
+            reader.start()
+            reader.join(0.2)
+            readers.append(reader)
+    
+    chain._resident = TrimHook(chain._resident)
+    chain.append(source.chain[3])
+    for reader in readers:
+        reader.join()
+    assert reads == [2]
+
+def test_snapshot(tmp_path):
+    """Test writing a snapshot and restarting a node from it."""
+    from blockchain.utils.snapshot import (
+        Snapshot, SnapshotError, SnapshotManager, load_snapshot, write_snapshot
+    )
+    
+    wallet = Wallet()
+    store = _MemoryStore()
+    blockchain = Blockchain(difficulty=1, store=store, chain_window=3)
+    manager = SnapshotManager(blockchain, str(tmp_path / 'snapshot.bin'), interval=2)
+    for _ in range(3):
+        blockchain.mine_pending_transactions(wallet.get_address())
+    transaction = Transaction(wallet.get_public_key(), 'recipient', 1, fee=0.01)
+    transaction.sign(wallet.private_key)
+    assert blockchain.add_transaction(transaction)
+    assert manager.last_height == 2
+    
+    # Blocks stored after the snapshot are replayed on startup
+    snapshot = load_snapshot(manager.path)
+    restarted = Blockchain(difficulty=1, store=store, chain_window=3, snapshot=snapshot)
+    snapshot.close()
+    assert restarted.get_latest_block().hash == blockchain.get_latest_block().hash
+    assert restarted.get_balance(wallet.get_address(), include_pending=False) == blockchain.get_balance(wallet.get_address(), include_pending=False)
+    assert restarted.get_chain_work() == blockchain.get_chain_work()
+    
+    # Writes are atomic and corruption is detected
+    write_snapshot(manager.path, {'tip': {'index': 0}})
+    assert not (tmp_path / 'snapshot.bin.tmp').exists()
+    data = bytearray((tmp_path / 'snapshot.bin').read_bytes())
+    data[-2] ^= 0xff
+    (tmp_path / 'snapshot.bin').write_bytes(bytes(data))
+    with Snapshot(manager.path) as corrupt:
+        with pytest.raises(SnapshotError):
+            corrupt.load('tip')
+
+def test_crypto_caches():
+    """Test the bounded LRU cache and the parsed public key cache."""
+    from blockchain.crypto.cache import LRUCache, import_public_key, public_key_cache
+    
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)  # Evicts 'b', the least recently used
+    assert cache.get('b') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    assert len(cache) == 2
+    
+    pem = Wallet().get_public_key()
+    hits = public_key_cache.hits
+    assert import_public_key(pem) is import_public_key(pem)
+    assert public_key_cache.hits == hits + 1
+
+def test_batch_verification():
+    """Test that batch verification reports results in input order."""
+    from blockchain.core.verification import verify_transactions
+    from blockchain.crypto.cache import public_key_cache, signature_cache
+    
+    pem = Wallet().get_public_key()
+    forged = []
+    for amount in range(1, 7):
+        transaction = Transaction(pem, "recipient", float(amount))
+        transaction.signature = "00" * 256
+        forged.append(transaction)
+    
+    # Seed the cache as if the third forged transaction had been verified
+    signature_cache.put(forged[2].signature_cache_key(), True)
+    
+    transactions = [Transaction("system", "miner", 10.0), Transaction(pem, "recipient", 1.0)] + forged
+    expected = [True, False, False, False, True, False, False, False]
+    assert verify_transactions(transactions, workers=1) == expected
+    
+    # Sharded over a pool, one signature per task. Workers neither start as
+    # forks holding copied cache locks nor use the caches themselves.
+    with public_key_cache._lock:
+        assert verify_transactions(transactions, workers=2, chunk_size=1) == expected
+    
+    wallet = Wallet()
+    signed = []
+    for amount in (1.0, 2.0):
+        transaction = Transaction(wallet.get_public_key(), "recipient", amount, fee=0.01)
+        transaction.sign(wallet.private_key)
+        signed.append(transaction)
+    pool = TransactionPool(max_size=1)
+    assert pool.add_transactions([tx.to_dict() for tx in [signed[0]] + transactions[:3]]) == [True, False, False, False]
+    assert pool.add_transactions([signed[1]]) == [False]  # Pool is full
+    signature_cache.clear()
+
+def test_transaction_encoding():
+    """Test the canonical binary encoding, transaction ids and signing."""
+    wallet = Wallet()
+    pem = wallet.get_public_key()
+    transaction = Transaction(pem, "recipient", 5, timestamp=1700000000.5)
+    
+    # The encoding does not depend on how the amount was written
+    assert transaction.encode() == Transaction(pem, "recipient", 5.0, timestamp=1700000000.5).encode()
+    
+    unsigned_id = transaction.txid
+    transaction.sign(wallet.private_key)
+    assert transaction.txid != unsigned_id  # Cached id is dropped when a field changes
+    assert transaction.verify_signature()
+    
+    decoded = Transaction.decode(transaction.encode())
+    assert decoded.to_dict() == Transaction.from_dict(transaction.to_dict()).to_dict()
+    assert decoded.txid == transaction.txid
+    assert decoded.verify()
+    
+    decoded.amount = 6.0
+    assert not decoded.verify()
+    
+    with pytest.raises(ValueError):
+        Transaction.decode(transaction.encode()[:-1])
+    with pytest.raises(ValueError):
+        Transaction.from_dict({'sender': pem, 'recipient': "recipient", 'amount': 1.0, 'signature': "not hex"})
+
+def test_signature_backends():
+    """Test signing, verification and key round trips for every backend."""
+    from blockchain.crypto.backends import BACKENDS, get_backend
+    
+    message = b"canonical transaction bytes"
+    for backend in BACKENDS.values():
+        private_key = backend.generate_private_key()
+        public_key = backend.import_public_key(backend.export_public_key(backend.public_key(private_key)))
+        signature = backend.sign(private_key, message)
+        
+        assert backend.verify(public_key, message, signature)
+        assert not backend.verify(public_key, message + b"!", signature)
+        assert not backend.verify(public_key, message, b"\x00" * len(signature))
+        
+        restored = backend.import_private_key(backend.export_private_key(private_key))
+        assert backend.verify(public_key, message, backend.sign(restored, message))
+        assert len(backend.address(public_key)) == 64
+    
+    with pytest.raises(ValueError):
+        get_backend('Ed25519').import_public_key(Wallet().get_public_key())
+    with pytest.raises(ValueError):
+        get_backend('DSA')
+    
+    wallet = Wallet()
+    restored = Wallet.from_dict(wallet.to_dict())
+    assert restored.get_public_key() == wallet.get_public_key()
+    assert restored.address == wallet.address
+    
+    # The sender's key type picks the scheme, so every node verifies alike
+    from blockchain.crypto.backends import backend_for_key
+    for name in BACKENDS:
+        backend = get_backend(name)
+        private_key = backend.generate_private_key()
+        pem = backend.export_public_key(backend.public_key(private_key))
+        transaction = Transaction(pem, "recipient", 1.0)
+        transaction.sign(private_key)
+        assert transaction.verify_signature(use_cache=False)
+        assert transaction.verify_signature()
+    assert backend_for_key(get_backend('RSA-PSS').generate_private_key()) is BACKENDS['PKCS1_v1_5']
+    with pytest.raises(ValueError):
+        backend_for_key("not a key")
+
+def test_compact_representation():
+    """Test that transactions and blocks are slotted and share address strings."""
+    pem = Wallet().get_public_key()
+    first = Transaction(pem.encode().decode(), "recipient", 1.0)
+    second = Transaction(pem.encode().decode(), "recipient", 2.0)
+    assert first.sender is second.sender
+    assert not hasattr(first, '__dict__')
+    assert not hasattr(Block(0, [], "0" * 64), '__dict__')
+    
+    first.signature = "ab" * 4
+    assert first.signature == "ab" * 4
+    assert Transaction.from_dict(first.to_dict()).to_dict() == first.to_dict()
+
+def test_fee_prioritized_pool():
+    """Test fee admission, eviction by fee rate and fee-ordered block templates."""
+    from blockchain.config import MINING_REWARD
+    
+    wallet = Wallet()
+    pem = wallet.get_public_key()
+    
+    def signed(amount, fee):
+        transaction = Transaction(pem, "recipient", amount, fee=fee)
+        transaction.sign(wallet.private_key)
+        return transaction
+    
+    pool = TransactionPool(max_size=2)
+    assert not pool.add_transaction(signed(1.0, 0.0))  # Below the minimum fee
+    low, mid, high = signed(1.0, 0.01), signed(2.0, 0.02), signed(3.0, 0.03)
+    assert pool.add_transaction(low)
+    assert pool.add_transaction(mid)
+    assert not pool.add_transaction(signed(4.0, 0.005))  # Full and pays less than every entry
+    assert pool.add_transaction(high)  # Evicts the lowest fee rate
+    assert pool.get_transactions() == [high, mid]
+    assert pool.get_transaction_count() == 2
+    assert pool.get_pending_delta(wallet.get_address()) == pytest.approx(-5.05)
+    
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions(wallet.get_address())
+    assert blockchain.add_transaction(high)
+    assert blockchain.add_transaction(low)
+    template = blockchain.create_block_template("miner")
+    assert template.transactions[1:] == [high, low]
+    assert template.transactions[0].amount == pytest.approx(MINING_REWARD + 0.04)
+    
+    blockchain.mine_pending_transactions("miner")
+    assert blockchain.get_balance(wallet.get_address()) == pytest.approx(MINING_REWARD - 4.04)
+    assert blockchain.get_balance("miner") == pytest.approx(MINING_REWARD + 0.04)
+
+def test_pool_keyed_by_txid(monkeypatch):
+    """Test duplicate rejection and removal of transaction copies by id."""
+    wallet = Wallet()
+    transaction = Transaction(wallet.get_public_key(), "recipient", 1.0, fee=0.01)
+    transaction.sign(wallet.private_key)
+    copy = Transaction.decode(transaction.encode())
+    
+    pool = TransactionPool()
+    assert pool.add_transaction(transaction)
+    assert transaction.txid in pool
+    
+    verified = []
+    original_verify = Transaction.verify
+    monkeypatch.setattr(Transaction, 'verify', lambda tx: verified.append(tx) or original_verify(tx))
+    assert not pool.add_transaction(copy)
+    assert verified == []  # Rejected before the signature check
+    assert pool.add_transactions([copy.to_dict(), copy]) == [False, False]
+    
+    pool.remove_transactions([copy])
+    assert len(pool) == 0
+    assert pool.get_transaction(transaction.txid) is None
+    assert pool.add_transactions([copy, Transaction.decode(copy.encode())]) == [True, False]
+
+def test_confirmed_replay_guard():
+    """Test the confirmed-txid Bloom filter and replay rejection."""
+    import hashlib
+    from blockchain.core.bloom import ScalableBloomFilter, ConfirmedTxFilter
+    
+    digests = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(100)]
+    scalable = ScalableBloomFilter(initial_capacity=10, error_rate=0.01)
+    for digest in digests:
+        scalable.add(digest)
+    assert len(scalable) == 100
+    assert len(scalable.filters) > 1
+    assert all(digest in scalable for digest in digests)
+    restored = ScalableBloomFilter.from_dict(scalable.to_dict())
+    assert all(digest in restored for digest in digests)
+    
+    wallet = Wallet()
+    transaction = Transaction(wallet.get_public_key(), "recipient", 1.0, fee=0.01)
+    transaction.sign(wallet.private_key)
+    
+    blockchain = Blockchain(difficulty=1)
+    blockchain.confirmed_txids = ConfirmedTxFilter(segment_blocks=3)
+    blockchain._rebuild_indexes()
+    blockchain.mine_pending_transactions(wallet.get_address())
+    assert not blockchain.is_confirmed(transaction)
+    assert blockchain.add_transaction(transaction)
+    blockchain.mine_pending_transactions("miner")
+    assert blockchain.is_confirmed(transaction)
+    assert not blockchain.add_transaction(Transaction.decode(transaction.encode()))
+    
+    # Disconnecting the block rebuilds its segment without the transaction
+    for _ in range(2):
+        blockchain.mine_pending_transactions("miner")
+    assert len(blockchain.confirmed_txids.segments) == 2
+    block, kept, removed = blockchain.chain[2:]
+    blockchain._disconnect_tip()
+    assert kept.transactions[0].txid in blockchain.confirmed_txids
+    assert removed.transactions[0].txid not in blockchain.confirmed_txids
+    while len(blockchain.chain) > 2:
+        blockchain._disconnect_tip()
+    assert [start for start, _ in blockchain.confirmed_txids.segments] == [0]
+    assert transaction.txid not in blockchain.confirmed_txids
+    assert blockchain.add_transaction(transaction)  # Pending again once unconfirmed
+    blockchain.transaction_pool.clear_transactions()
+    
+    # A filter false positive falls back to the exact lookup
+    blockchain.confirmed_txids.add_block(block)
+    assert transaction.txid in blockchain.confirmed_txids
+    assert not blockchain.is_confirmed(transaction)
+
+def test_pending_spend_tracking():
+    """Test that the pool rejects transactions overspending confirmed balances."""
+    from blockchain.config import MINING_REWARD
+    
+    wallet = Wallet()
+    address = wallet.get_address()
+    
+    def signed(amount, fee=0.01):
+        transaction = Transaction(wallet.get_public_key(), "recipient", amount, fee=fee)
+        transaction.sign(wallet.private_key)
+        return transaction
+    
+    blockchain = Blockchain(difficulty=1)
+    pool = blockchain.transaction_pool
+    assert not blockchain.add_transaction(signed(1.0))  # Nothing confirmed yet
+    
+    blockchain.mine_pending_transactions(address)
+    first = signed(MINING_REWARD / 2 - 0.01)
+    assert blockchain.add_transaction(first)
+    assert pool.get_pending_outflow(address) == pytest.approx(MINING_REWARD / 2)
+    assert not blockchain.add_transaction(signed(MINING_REWARD / 2))  # Pending spends count too
+    
+    # A batch cannot overspend by admitting several transactions at once
+    second, third = signed(MINING_REWARD / 4 - 0.01), signed(MINING_REWARD / 4)
+    assert blockchain.add_transactions([second, third]) == [True, False]
+    
+    pool.remove_transactions([first])
+    assert pool.get_pending_outflow(address) == pytest.approx(MINING_REWARD / 4)
+    assert blockchain.add_transaction(third)
+    
+    # Mined spends move from the pending outflow to the confirmed balance
+    blockchain.mine_pending_transactions("miner")
+    assert address not in pool.pending_outflows
+    assert blockchain.get_balance(address) == pytest.approx(MINING_REWARD / 2 - 0.01)
+    assert not blockchain.add_transaction(signed(MINING_REWARD / 2))
+    
+    # Negative and non-finite amounts cannot lower the pending outflow
+    outflow = pool.get_pending_outflow(address)
+    for amount, fee in [(-100.0, 0.01), (float('nan'), 0.01), (float('inf'), 0.01), (1.0, float('nan'))]:
+        assert not blockchain.add_transaction(signed(amount, fee))
+    assert pool.get_pending_outflow(address) == outflow
+    
+    # Mining rewards cannot be submitted, however they are signed
+    for signature in (None, "00"):
+        reward = Transaction("system", "attacker", 1e9)
+        reward.signature = signature
+        assert not blockchain.add_transaction(reward)
+    assert not TransactionPool().add_transaction(Transaction("system", "attacker", 1e9))
+    
+    # Pools without a balance lookup do not check balances
+    assert TransactionPool().add_transaction(signed(1000.0))
+
+def test_admission_queue():
+    """Test that a full admission queue refuses transactions until drained."""
+    import threading
+    from blockchain.core.admission import AdmissionQueue
+    
+    class SlowChain:
+        def __init__(self):
+            self.release = threading.Event()
+            self.admitted = []
+        
+        def add_transactions(self, transactions):
+            self.release.wait()
+            self.admitted.extend(transactions)
+            return [True] * len(transactions)
+    
+    chain = SlowChain()
+    admission = AdmissionQueue(chain, workers=1, max_size=2, batch_size=2)
+    transactions = [Transaction("sender", "recipient", float(i)) for i in range(4)]
+    assert admission.submit(transactions[0])
+    while admission.depth:  # The worker holds the first transaction
+        time.sleep(0.01)
+    assert admission.submit(transactions[1])
+    assert admission.submit(transactions[2])
+    assert not admission.submit(transactions[3])  # Full
+    assert admission.stats()['queue_depth'] == 2
+    
+    chain.release.set()
+    admission.join()
+    assert chain.admitted == transactions[:3]
+    stats = admission.stats()
+    assert (stats['submitted'], stats['refused'], stats['accepted']) == (3, 1, 3)
+    assert stats['latency']['samples'] == 3
+    admission.stop()
+
+def test_replace_chain_counts_real_work():
+    """Test that claimed difficulties cannot inflate a candidate chain's work."""
+    blockchain = Blockchain(difficulty=1)
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    for _ in range(5):
+        blockchain.mine_pending_transactions('miner')
+    work = blockchain.get_chain_work()
+    
+    for _ in range(2):
+        peer.mine_pending_transactions('peer_miner')
+    chain = peer.to_dict()['chain']
+    chain[0]['difficulty'] = 20  # Shared genesis, never re-validated
+    
+    assert not blockchain.replace_chain(chain)
+    assert len(blockchain.chain) == 6
+    assert blockchain.get_chain_work() == work
+    
+    # Nor can the claimed difficulty of an unrelated genesis block
+    other = Blockchain(difficulty=1)
+    assert other.chain[0].hash != blockchain.chain[0].hash
+    other.mine_pending_transactions('peer_miner')
+    chain = other.to_dict()['chain']
+    chain[0]['difficulty'] = 20
+    assert not blockchain.replace_chain(chain)
+    assert blockchain.get_chain_work() == work
+
+def test_duplicate_transaction_block():
+    """Test that repeating a block's last transaction does not pass as the same block."""
+    from blockchain.core.validation import check_block
+    
+    wallet = Wallet()
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions(wallet.get_address())
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    
+    for amount in (1.0, 2.0):
+        transaction = Transaction(wallet.get_public_key(), "carol", amount, fee=0.01)
+        transaction.sign(wallet.private_key)
+        assert blockchain.add_transaction(transaction)
+    block = blockchain.mine_pending_transactions("miner")
+    assert len(block.transactions) == 3
+    
+    data = json.loads(json.dumps(block.to_dict()))  # As received from a peer
+    data['transactions'].append(data['transactions'][-1])
+    mutated = Block.from_dict(data)
+    assert mutated.calculate_hash() == block.hash  # Same Merkle root
+    assert check_block(mutated, 1) == "Block contains duplicate transactions"
+    
+    assert not peer.add_block(mutated)
+    assert peer.add_block(Block.from_dict(block.to_dict()))
+    assert peer.get_balance("carol") == pytest.approx(3.0)
+
+def test_malformed_peer_block():
+    """Test that blocks with fields of the wrong type are rejected instead of raising."""
+    from blockchain.core.validation import check_block
+    from blockchain.network.dht_node import DHTNode
+    
+    blockchain = Blockchain(difficulty=1)
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    peer.mine_pending_transactions('peer_miner')
+    good = peer.chain[1].to_dict()
+    
+    for field, value in [('previous_hash', 'not hex'), ('timestamp', 'noon'),
+                         ('difficulty', '1'), ('nonce', '7'), ('index', -1)]:
+        data = dict(good, **{field: value})
+        with pytest.raises(ValueError):
+            Block.from_dict(data)
+        assert not blockchain.replace_chain([blockchain.chain[0].to_dict(), data])
+        
+    
+    # Malformed block encodings from peers are dropped
+    encoded = peer.chain[1].encode().hex()
+    node = DHTNode(node_id="node", host="localhost", port=5000)
+    node.register_blockchain(blockchain)
+    for data in [good, {'block': 'not hex'}, {'block': encoded[:-2]}, {'block': encoded + '00'},
+                 {'block': encoded[:40]}, {'block': None}]:
+        node.handle_message({'type': 'new_block', 'data': data}, "peer")
+    
+    block = Block(1, [], time.time(), 'not hex')
+    block.hash = '0' * 64
+    assert check_block(block, 1).startswith("Malformed block")
+    assert not blockchain.add_block(block)
+    assert len(blockchain.chain) == 1
+    assert blockchain.add_block(Block.from_dict(good))
+
+def test_admission_while_mining():
+    """Test that admission threads and mining can share the pool."""
+    from blockchain.core.admission import AdmissionQueue
+    
+    wallets = [Wallet() for _ in range(3)]
+    blockchain = Blockchain(difficulty=1)
+    for wallet in wallets:
+        blockchain.mine_pending_transactions(wallet.get_address())
+    
+    transactions = []
+    for i in range(60):
+        wallet = wallets[i % len(wallets)]
+        transaction = Transaction(wallet.get_public_key(), "recipient", 0.1, fee=0.01 + i * 0.0001)
+        transaction.sign(wallet.private_key)
+        transactions.append(transaction)
+    
+    admission = AdmissionQueue(blockchain, workers=3, batch_size=4)
+    for transaction in transactions:
+        assert admission.submit(transaction)
+    while admission.depth:
+        blockchain.mine_pending_transactions("miner")
+    admission.join()
+    admission.stop()
+    blockchain.mine_pending_transactions("miner")
+    
+    assert admission.stats()['failed'] == 0
+    assert admission.stats()['accepted'] == len(transactions)
+    assert len(blockchain.transaction_pool) == 0
+    assert blockchain.transaction_pool.pending_outflows == {}
+    confirmed = [tx.txid for block in blockchain.chain for tx in block.transactions]
+    assert len(confirmed) == len(set(confirmed))
+    assert {tx.txid for tx in transactions} <= set(confirmed)
+    assert blockchain.get_balance("recipient") == pytest.approx(6.0)
+
+def test_verification_outside_chain_lock(monkeypatch):
+    """Test that admission verifies signatures without holding the chain lock."""
+    from blockchain.core import transaction_pool
+    
+    wallet = Wallet()
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions(wallet.get_address())
+    
+    held = []
+    verify = transaction_pool.verify_transactions
+    def recording_verify(transactions):
+        held.append(blockchain.lock._is_owned())
+        return verify(transactions)
+    monkeypatch.setattr(transaction_pool, 'verify_transactions', recording_verify)
+    
+    transaction = Transaction(wallet.get_public_key(), "recipient", 1.0, fee=0.01)
+    transaction.sign(wallet.private_key)
+    assert blockchain.add_transactions([transaction]) == [True]
+    assert held == [False]
+    
+    # Transactions of a disconnected block go back without being verified again
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    blockchain.mine_pending_transactions('miner')
+    for _ in range(2):
+        peer.mine_pending_transactions('peer_miner')
+    assert blockchain.replace_chain(peer.to_dict()['chain'])
+    assert transaction.txid in blockchain.transaction_pool
+    assert held == [False]
+
+def test_snapshot_block_lookup(tmp_path, monkeypatch):
+    """Test looking up blocks older than the hash index after a snapshot start."""
+    from blockchain.core.history import AddressHistory
+    from blockchain.utils.snapshot import SnapshotManager, load_snapshot
+    
+    monkeypatch.setattr('blockchain.core.blockchain.MAX_REORG_DEPTH', 2)
+    monkeypatch.setattr('blockchain.core.blockchain.AddressHistory', lambda: AddressHistory(2))
+    store = _MemoryStore()
+    blockchain = Blockchain(difficulty=1, store=store, chain_window=3)
+    for _ in range(6):
+        blockchain.mine_pending_transactions('test_miner')
+    manager = SnapshotManager(blockchain, str(tmp_path / 'snapshot.bin'), interval=0)
+    manager.write()
+    
+    with load_snapshot(manager.path) as snapshot:
+        restarted = Blockchain(difficulty=1, store=store, chain_window=3, snapshot=snapshot)
+    old = blockchain.chain[1]
+    assert old.hash not in restarted.block_heights
+    assert restarted.get_block_by_hash(old.hash).hash == old.hash
+    assert restarted.has_block(old.hash)
+    assert restarted.get_block_by_hash('f' * 64) is None
+    assert not restarted.has_block('f' * 64)
+
+def test_vm_balance():
+    """Test that a chain's VM reads confirmed balances for BALANCE."""
+    pytest.importorskip('pydantic')
+    from blockchain.config import MINING_REWARD
+    
+    blockchain = Blockchain(difficulty=1)
+    blockchain.mine_pending_transactions('miner1')
+    vm = blockchain.create_vm()
+    assert vm.state is blockchain.state
+    
+    vm._handle_balance(['miner1'])
+    assert vm.stack.pop() == MINING_REWARD
+    blockchain.mine_pending_transactions('miner1')
+    vm._handle_balance(['miner1'])
+    assert vm.stack.pop() == 2 * MINING_REWARD
+
+def test_replace_chain_encoded(monkeypatch):
+    """Test that an encoded chain is compared by its headers and only the new blocks are decoded."""
+    blockchain = Blockchain(difficulty=1)
+    for _ in range(3):
+        blockchain.mine_pending_transactions('miner1')
+    peer = Blockchain.from_dict(blockchain.to_dict())
+    for _ in range(2):
+        peer.mine_pending_transactions('miner2')
+    encoded = [block.encode() for block in peer.chain]
+    
+    decoded = []
+    decode = Block.decode
+    monkeypatch.setattr(Block, 'decode', classmethod(lambda cls, data: decoded.append(data) or decode(data)))
+    
+    # A chain with less work is rejected without decoding anything
+    assert not blockchain.replace_chain_encoded(encoded[:3])
+    assert not blockchain.replace_chain_encoded(encoded[:-1] + [b'\x00'])
+    assert decoded == []
+    
+    assert blockchain.replace_chain_encoded(encoded)
+    assert decoded == encoded[4:]
+    assert blockchain.get_latest_block().hash == peer.get_latest_block().hash
@@ -121,7 +121,9 @@ def test_handle_new_block(node, blockchain, transaction_pool):
     # Handle block message
     message = {
         'type': 'new_block',
-        'data': block.to_dict()
+        'data': {
+            'block': block.encode().hex()
+        }
     }
     node.handle_message(message, "peer1")
     
@@ -149,8 +151,7 @@ def test_handle_new_transaction(node, transaction_pool):
     message = {
         'type': 'new_transaction',
         'data': {
-            'transaction': transaction.to_dict(),
-            'signature': transaction.signature
+            'transaction': transaction.encode().hex()
         }
     }
     node.handle_message(message, "peer1")
@@ -227,4 +228,27 @@ def test_node_serialization(node):
     assert new_node.node_id == node.node_id
     assert new_node.host == node.host
     assert new_node.port == node.port
-    assert new_node.peers == node.peers 
\ No newline at end of file
+    assert new_node.peers == node.peers
+
+def test_chain_response_encoding(node, blockchain):
+    """Test that chains are exchanged as binary block encodings."""
+    from blockchain.core.blockchain import Blockchain
+    
+    peer_chain = Blockchain.from_dict(blockchain.to_dict())
+    peer_chain.mine_pending_transactions('miner1')
+    block = peer_chain.chain[1]
+    assert Block.decode(block.encode()).to_dict() == block.to_dict()
+    assert Block.encoded_hash(block.encode()) == block.hash
+    
+    # The peer answers a chain request with hex encoded blocks
+    peer = DHTNode(node_id="peer1", host="localhost", port=5001)
+    peer.register_blockchain(peer_chain)
+    sent = []
+    peer._send_message = lambda peer_id, message: sent.append(message)
+    peer.handle_message({'type': 'request_chain', 'data': {'node_id': node.node_id}}, node.node_id)
+    assert all(isinstance(encoded, str) for encoded in sent[0]['data']['chain'])
+    
+    node.register_blockchain(blockchain)
+    node.handle_message(sent[0], "peer1")
+    assert len(blockchain.chain) == 2
+    assert blockchain.chain[1].hash == block.hash